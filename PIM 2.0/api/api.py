@@ -0,0 +1,445 @@
+# api/api.py
+"""API HTTP/JSON local para clientes web e mobile (asyncio, só biblioteca padrão).
+
+Uso (na pasta do projeto):
+    python -m api.api [--host 127.0.0.1] [--porta 8080]
+
+Rotas (autenticadas com o cabeçalho "Authorization: Bearer <token>" do /login):
+    POST /login                        {"usuario", "senha"} -> {"token"}
+    POST /logout
+    GET  /cursos                       catálogo
+    GET  /cursos/busca?q=termos        cursos e módulos que casam, por relevância
+    GET  /cursos/<id>/modulos          módulos (com "concluido" se autenticado)
+    POST /matriculas                   {"curso"}
+    GET  /progresso                    percentual por curso matriculado
+    POST /progresso                    {"curso", "modulo": id, "concluido": true}
+                                       (com "aula": índice, 0 = primeira, marca só a aula)
+    GET  /certificados                 certificados do usuário
+    POST /certificados                 {"curso"} -> emite o certificado
+    GET  /certificados/<codigo>.pdf    download (dono ou ADM)
+    GET  /certificados/<codigo>        validação pública
+    GET  /saude
+
+Cada conexão é atendida no laço de eventos; tudo que lê ou altera os dados
+roda numa única thread de dados (os armazéns não são thread-safe), com o
+usuário da sessão como `usuario_logado` durante a operação. Assim gravação
+em disco, PDF e relógio de log nunca travam o atendimento dos outros clientes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from metricas.metricas import medir, contar
+
+
+# ========== CONFIGURAÇÕES ==========
+HOST = "127.0.0.1"
+PORTA = 8080
+DURACAO_SESSAO = 8 * 3600  # Segundos sem uso até o token expirar
+INTERVALO_VARREDURA = 300  # Segundos entre as limpezas de sessões expiradas
+TAMANHO_MAXIMO_CORPO = 1 << 20
+TEMPO_OCIOSO = 30  # Segundos que uma conexão keep-alive pode ficar parada
+COR_SUCESSO = "\033[1;32m"
+COR_TITULO = "\033[1;36m"
+RESET_COR = "\033[0m"
+
+
+class ErroHTTP(Exception):
+    def __init__(self, status: int, mensagem: str):
+        self.status = status
+        super().__init__(mensagem)
+
+
+# ========== SESSÕES ==========
+_sessoes: Dict[str, Dict] = {}  # token -> {"nome", "is_admin", "expira"}
+
+def abrir_sessao(nome: str, is_admin: bool) -> str:
+    token = secrets.token_urlsafe(24)
+    _sessoes[token] = {"nome": nome, "is_admin": is_admin, "expira": time.time() + DURACAO_SESSAO}
+    return token
+
+def sessao(cabecalhos: Dict[str, str], obrigatoria: bool = True) -> Optional[Dict]:
+    """Sessão do token Bearer (renova a validade); 401 se obrigatória e ausente"""
+    tipo, _, token = cabecalhos.get("authorization", "").partition(" ")
+    atual = _sessoes.get(token) if tipo.lower() == "bearer" else None
+    if atual and atual["expira"] < time.time():
+        del _sessoes[token]
+        atual = None
+    if atual:
+        atual["expira"] = time.time() + DURACAO_SESSAO
+    elif obrigatoria:
+        raise ErroHTTP(401, "Faça login primeiro")
+    return atual
+
+def varrer_sessoes(agora: Optional[float] = None) -> int:
+    """Descarta os tokens expirados que nunca mais foram usados; devolve quantos"""
+    agora = time.time() if agora is None else agora
+    expirados = [token for token, atual in _sessoes.items() if atual["expira"] < agora]
+    for token in expirados:
+        del _sessoes[token]
+    return len(expirados)
+
+async def _varrer_periodicamente():
+    while True:
+        await asyncio.sleep(INTERVALO_VARREDURA)
+        if removidas := varrer_sessoes():
+            contar("api.sessoes_expiradas", removidas)
+
+
+# ========== THREAD DE DADOS ==========
+_executor_dados = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pim-dados")
+
+async def nos_dados(funcao: Callable, usuario: Optional[Dict] = None, *args):
+    """Roda `funcao(*args)` na thread de dados com `usuario` logado"""
+    def tarefa():
+        import usuarios.usuarios as u
+        from cursos.cursos import sincronizar_cursos
+        u.usuario_logado = {"nome": usuario["nome"], "is_admin": usuario["is_admin"]} if usuario else None
+        try:
+            usuarios = u.obter_usuarios_atualizados()  # Um os.stat se nenhum outro processo gravou
+            sincronizar_cursos()
+            if usuario and usuario["nome"] not in usuarios:
+                raise ErroHTTP(401, "Conta removida; faça login novamente")
+            return funcao(*args)
+        finally:
+            u.usuario_logado = None
+    return await asyncio.get_running_loop().run_in_executor(_executor_dados, tarefa)
+
+
+# ========== OPERAÇÕES (rodam na thread de dados) ==========
+def _login(usuario: str, senha: str) -> Optional[Dict]:
+    from usuarios.usuarios import get_usuarios_cadastrados, registrar_log
+    dados = get_usuarios_cadastrados().get(usuario)
+    if not dados or dados["senha"] != senha:
+        contar("login.falha")
+        return None
+    contar("login.sucesso")
+    registrar_log("Login realizado", f"Usuário: {usuario} | via API")
+    return {"nome": usuario, "is_admin": dados["is_admin"]}
+
+def _logout(nome: str):
+    from usuarios.usuarios import registrar_log
+    registrar_log("Logout", f"Usuário: {nome} | via API")
+
+def _catalogo() -> List[Dict]:
+    from cursos.cursos import cursos_disponiveis
+    return [{"id": id_curso, "nome": curso["nome"], "carga_horaria": curso["carga_horaria"],
+             "modulos": len(curso["modulos"])}
+            for id_curso, curso in cursos_disponiveis.items()]
+
+def _buscar(termos: str) -> List[Dict]:
+    from cursos.cursos import buscar_catalogo
+    return buscar_catalogo(termos)
+
+def _modulos(id_curso: str, nome: Optional[str]) -> List[Dict]:
+    from cursos.cursos import cursos_disponiveis
+    from modulos.progresso import mascara_curso, bits_concluidos, bits_aulas
+    from usuarios.usuarios import get_usuarios_cadastrados
+    if id_curso not in cursos_disponiveis:
+        raise ErroHTTP(404, "Curso não encontrado")
+    mascara_curso(id_curso)  # Garante IDs nos módulos antigos
+    dados = get_usuarios_cadastrados()[nome] if nome else None
+    bits = None
+    if nome:
+        bits = bits_concluidos(dados, id_curso) or 0
+    modulos = []
+    for modulo in cursos_disponiveis[id_curso]["modulos"]:
+        total_aulas = len(modulo.get("aulas", []))
+        item = {"id": modulo["id"], "nome": modulo["nome"], "aulas": total_aulas}
+        if bits is not None:
+            item["concluido"] = bool(bits & (1 << modulo["id"]))
+            aulas = bits_aulas(dados, id_curso, modulo["id"])
+            item["aulas_concluidas"] = [i for i in range(total_aulas) if aulas >> i & 1]
+        modulos.append(item)
+    return modulos
+
+def _matricular(nome: str, id_curso: str) -> bool:
+    from cursos.cursos import cursos_disponiveis, matricular_usuario
+    if id_curso not in cursos_disponiveis:
+        raise ErroHTTP(404, "Curso não encontrado")
+    try:
+        return matricular_usuario(nome, id_curso)
+    except ValueError as e:  # Gravação recusada: outro terminal alterou o aluno
+        raise ErroHTTP(409, str(e)) from None
+
+def _progresso(nome: str) -> List[Dict]:
+    from cursos.cursos import cursos_disponiveis
+    from modulos.progresso import percentual, curso_concluido
+    from usuarios.usuarios import get_usuarios_cadastrados
+    usuarios = get_usuarios_cadastrados()
+    return [{"curso": id_curso, "nome": cursos_disponiveis[id_curso]["nome"],
+             "percentual": round(percentual(nome, id_curso, usuarios), 1),
+             "concluido": curso_concluido(nome, id_curso, usuarios)}
+            for id_curso in usuarios[nome].get("cursos", []) if id_curso in cursos_disponiveis]
+
+def _marcar(nome: str, id_curso: str, id_modulo: int, concluido: bool,
+            aula: Optional[int] = None) -> float:
+    from modulos.progresso import marcar_modulo, marcar_aula, modulo_existe, percentual
+    from usuarios.usuarios import get_usuarios_cadastrados
+    if id_curso not in get_usuarios_cadastrados()[nome].get("cursos", []):
+        raise ErroHTTP(403, "Você não está matriculado neste curso")
+    if not modulo_existe(id_curso, id_modulo):  # Antes de qualquer `1 << id_modulo`
+        raise ErroHTTP(404, "Módulo não encontrado")
+    if aula is None:
+        marcar_modulo(nome, id_curso, id_modulo, concluido)
+    else:
+        try:
+            marcar_aula(nome, id_curso, id_modulo, aula, concluido)
+        except ValueError:
+            raise ErroHTTP(404, "Aula não encontrada") from None
+    return percentual(nome, id_curso)
+
+def _certificados(nome: str) -> List[Dict]:
+    from usuarios.usuarios import get_usuarios_cadastrados
+    return [{k: c[k] for k in ("curso", "codigo", "data")}
+            for c in get_usuarios_cadastrados()[nome].get("certificados", [])]
+
+def _emitir(nome: str, id_curso: str) -> Dict:
+    from certificados.certificados import emitir_certificado
+    emitido = emitir_certificado(nome, id_curso)
+    return {k: emitido[k] for k in ("curso", "codigo", "data")}
+
+def _validar(codigo: str) -> Optional[Dict]:
+    from certificados.validacao import validar_codigo
+    return validar_codigo(codigo)
+
+
+# ========== ROTAS ==========
+_rotas: List[Tuple[str, "re.Pattern", Callable]] = []
+
+def rota(metodo: str, padrao: str):
+    def registrar(funcao):
+        _rotas.append((metodo, re.compile(f"^{padrao}$"), funcao))
+        return funcao
+    return registrar
+
+def _campo(corpo: Dict, nome: str) -> str:
+    valor = corpo.get(nome)
+    if valor in (None, ""):
+        raise ErroHTTP(400, f"Campo obrigatório: {nome}")
+    return str(valor)
+
+@rota("GET", "/saude")
+async def saude(req):
+    return {"ok": True, "sessoes": len(_sessoes)}
+
+@rota("POST", "/login")
+async def login(req):
+    usuario = await nos_dados(_login, None, _campo(req["json"], "usuario"), _campo(req["json"], "senha"))
+    if not usuario:
+        raise ErroHTTP(401, "Credenciais inválidas")
+    return {"token": abrir_sessao(usuario["nome"], usuario["is_admin"]), **usuario}
+
+@rota("POST", "/logout")
+async def logout(req):
+    atual = sessao(req["cabecalhos"])
+    _sessoes.pop(req["cabecalhos"]["authorization"].partition(" ")[2], None)
+    await nos_dados(_logout, atual, atual["nome"])
+    return {"ok": True}
+
+@rota("GET", "/cursos")
+async def cursos(req):
+    return {"cursos": await nos_dados(_catalogo)}
+
+@rota("GET", "/cursos/busca")
+async def busca(req):
+    termos = req["consulta"].get("q", "")
+    return {"q": termos, "resultados": await nos_dados(_buscar, None, termos)}
+
+@rota("GET", r"/cursos/(?P<id_curso>[^/]+)/modulos")
+async def modulos(req, id_curso):
+    atual = sessao(req["cabecalhos"], obrigatoria=False)
+    return {"curso": id_curso,
+            "modulos": await nos_dados(_modulos, atual, id_curso, atual["nome"] if atual else None)}
+
+@rota("POST", "/matriculas")
+async def matriculas(req):
+    atual = sessao(req["cabecalhos"])
+    id_curso = _campo(req["json"], "curso")
+    return {"curso": id_curso, "nova": await nos_dados(_matricular, atual, atual["nome"], id_curso)}
+
+@rota("GET", "/progresso")
+async def progresso(req):
+    atual = sessao(req["cabecalhos"])
+    return {"cursos": await nos_dados(_progresso, atual, atual["nome"])}
+
+@rota("POST", "/progresso")
+async def marcar(req):
+    atual = sessao(req["cabecalhos"])
+    id_curso = _campo(req["json"], "curso")
+    try:
+        id_modulo = int(_campo(req["json"], "modulo"))
+    except ValueError:
+        raise ErroHTTP(400, "modulo deve ser o ID numérico") from None
+    if id_modulo < 0:
+        raise ErroHTTP(404, "Módulo não encontrado")
+    aula = req["json"].get("aula")
+    if aula is not None:
+        try:
+            aula = int(aula)
+        except (TypeError, ValueError):
+            raise ErroHTTP(400, "aula deve ser o índice numérico") from None
+    concluido = bool(req["json"].get("concluido", True))
+    pct = await nos_dados(_marcar, atual, atual["nome"], id_curso, id_modulo, concluido, aula)
+    resposta = {"curso": id_curso, "modulo": id_modulo, "concluido": concluido, "percentual": round(pct, 1)}
+    if aula is not None:
+        resposta["aula"] = aula
+    return resposta
+
+@rota("GET", "/certificados")
+async def certificados(req):
+    atual = sessao(req["cabecalhos"])
+    return {"certificados": await nos_dados(_certificados, atual, atual["nome"])}
+
+@rota("POST", "/certificados")
+async def emitir(req):
+    atual = sessao(req["cabecalhos"])
+    return await nos_dados(_emitir, atual, atual["nome"], _campo(req["json"], "curso"))
+
+@rota("GET", r"/certificados/(?P<codigo>[A-Za-z0-9-]+)\.pdf")
+async def baixar(req, codigo):
+    atual = sessao(req["cabecalhos"])
+    info = await nos_dados(_validar, atual, codigo)
+    if not info:
+        raise ErroHTTP(404, "Certificado não encontrado")
+    if info["aluno"] != atual["nome"] and not atual["is_admin"]:
+        raise ErroHTTP(403, "Certificado de outro usuário")
+    try:  # Leitura do PDF fora do laço e fora da thread de dados
+        with open(info["caminho"], 'rb') as f:
+            conteudo = await asyncio.get_running_loop().run_in_executor(None, f.read)
+    except (OSError, TypeError):
+        raise ErroHTTP(404, "Arquivo do certificado não encontrado") from None
+    return ("application/pdf", conteudo)
+
+@rota("GET", r"/certificados/(?P<codigo>[A-Za-z0-9-]+)")
+async def validar(req, codigo):
+    info = await nos_dados(_validar, None, codigo)
+    if not info:
+        return {"codigo": codigo.upper(), "valido": False}
+    return {"valido": True, **{k: info[k] for k in ("codigo", "aluno", "curso", "data")}}
+
+
+# ========== HTTP ==========
+async def despachar(metodo: str, alvo: str, cabecalhos: Dict[str, str], corpo: bytes) -> Tuple[int, str, bytes]:
+    partes = urlsplit(alvo)
+    caminho = partes.path.rstrip("/") or "/"
+    encontrou_caminho = False
+    for metodo_rota, padrao, funcao in _rotas:
+        combinacao = padrao.match(caminho)
+        if not combinacao:
+            continue
+        encontrou_caminho = True
+        if metodo_rota != metodo:
+            continue
+        try:
+            dados = json.loads(corpo) if corpo else {}
+            if not isinstance(dados, dict):
+                raise ErroHTTP(400, "O corpo deve ser um objeto JSON")
+            with medir(f"api.{funcao.__name__}"):
+                resposta = await funcao({"cabecalhos": cabecalhos, "json": dados,
+                                         "consulta": dict(parse_qsl(partes.query))},
+                                        **combinacao.groupdict())
+        except json.JSONDecodeError:
+            return _json(400, {"erro": "JSON inválido"})
+        except ErroHTTP as e:
+            return _json(e.status, {"erro": str(e)})
+        except ValueError as e:  # Regras de negócio (mesmas mensagens do menu)
+            return _json(422, {"erro": str(e)})
+        except Exception as e:
+            contar("api.erros_internos")
+            return _json(500, {"erro": f"{type(e).__name__}: {e}"})
+        if isinstance(resposta, tuple):
+            return (200, *resposta)
+        return _json(200, resposta)
+    if encontrou_caminho:
+        return _json(405, {"erro": "Método não permitido"})
+    return _json(404, {"erro": "Rota não encontrada"})
+
+def _json(status: int, dados: Dict) -> Tuple[int, str, bytes]:
+    return status, "application/json; charset=utf-8", json.dumps(dados, ensure_ascii=False).encode()
+
+async def atender(leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+    """Uma conexão: várias requisições em sequência (keep-alive do HTTP/1.1)"""
+    try:
+        while True:
+            try:
+                linha = await asyncio.wait_for(leitor.readline(), TEMPO_OCIOSO)
+            except asyncio.TimeoutError:
+                break
+            if not linha.strip():
+                break
+            try:
+                metodo, alvo, versao = linha.decode('latin-1').split()
+            except ValueError:
+                await _responder(escritor, *_json(400, {"erro": "Requisição inválida"}), manter=False)
+                break
+
+            cabecalhos = {}
+            while (linha := await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                chave, _, valor = linha.decode('latin-1').partition(":")
+                cabecalhos[chave.strip().lower()] = valor.strip()
+            tamanho = int(cabecalhos.get("content-length") or 0)
+            if tamanho > TAMANHO_MAXIMO_CORPO:
+                await _responder(escritor, *_json(413, {"erro": "Corpo grande demais"}), manter=False)
+                break
+            corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+            manter = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+            await _responder(escritor, *await despachar(metodo, alvo, cabecalhos, corpo), manter=manter)
+            if not manter:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        escritor.close()
+
+async def _responder(escritor: asyncio.StreamWriter, status: int, tipo: str, corpo: bytes, manter: bool):
+    cabecalho = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                 f"Content-Type: {tipo}\r\n"
+                 f"Content-Length: {len(corpo)}\r\n"
+                 f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+    escritor.write(cabecalho.encode('latin-1') + corpo)
+    await escritor.drain()
+
+
+# ========== SERVIDOR ==========
+def _encerrar_dados():
+    """Grava o que estiver adiado antes de sair (na própria thread de dados)"""
+    from repositorio.armazem_json import gravar_pendentes_todos
+    from registros.registros import descarregar_todos
+    gravar_pendentes_todos()
+    descarregar_todos()
+
+async def servir(host: str = HOST, porta: int = PORTA):
+    servidor = await asyncio.start_server(atender, host, porta, backlog=1024)
+    await nos_dados(lambda: None)  # Carrega usuários e cursos antes da primeira requisição
+    varredura = asyncio.create_task(_varrer_periodicamente())
+    print(f"{COR_SUCESSO}✅ API em http://{host}:{porta} (Ctrl+C encerra){RESET_COR}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        varredura.cancel()
+        await asyncio.get_running_loop().run_in_executor(_executor_dados, _encerrar_dados)
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP/JSON da plataforma")
+    parser.add_argument("--host", default=os.environ.get("PIM_API_HOST", HOST))
+    parser.add_argument("--porta", type=int, default=int(os.environ.get("PIM_API_PORTA", PORTA)))
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        print(f"\n{COR_TITULO}API encerrada{RESET_COR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# benchmark/benchmark.py
+"""Mede os caminhos quentes da plataforma sobre uma base sintética.
+
+Uso (na pasta do projeto):
+    python -m benchmark.benchmark executar --usuarios 20000 --saida base.json
+    python -m benchmark.benchmark comparar base.json novo.json [--limite 0.10] [--minimo-ms 0.05]
+
+`executar` roda as funções reais (com respostas roteirizadas no lugar do
+input()) numa pasta temporária e grava os tempos em JSON. `comparar` aponta
+os testes cujo p50 piorou mais que o limite e sai com código 1 se houver
+regressão.
+"""
+import argparse
+import builtins
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from benchmark.dados_sinteticos import gerar_base, adicionar_argumentos, parametros
+
+
+# ========== CONFIGURAÇÕES ==========
+REPETICOES = 20
+LIMITE_REGRESSAO = 0.10  # p50 até 10% mais lento ainda passa
+MINIMO_MS = 0.05  # Diferenças menores que isso são ruído, mesmo em porcentagem alta
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+COR_TITULO = "\033[1;36m"
+RESET_COR = "\033[0m"
+
+
+# ========== MEDIÇÃO ==========
+@contextmanager
+def entradas_roteirizadas(respostas: Iterable[str]):
+    """Responde os input() com as `respostas` (em ciclo) e descarta o que for impresso"""
+    ciclo = itertools.cycle(respostas)
+    input_original = builtins.input
+    builtins.input = lambda prompt="": next(ciclo)
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as nulo, redirect_stdout(nulo):
+            yield
+    finally:
+        builtins.input = input_original
+
+def medir(funcao: Callable, repeticoes: int = REPETICOES, respostas: Iterable[str] = ("",),
+          preparar: Optional[Callable] = None) -> Dict:
+    """Executa `funcao` várias vezes; `preparar` roda antes de cada uma, fora do tempo"""
+    tempos = []
+    with entradas_roteirizadas(respostas):
+        funcao()  # Aquecimento (imports, caches de primeira chamada)
+        for _ in range(repeticoes):
+            if preparar:
+                preparar()
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return {
+        "media_ms": statistics.mean(tempos) * 1000,
+        "p50_ms": tempos[len(tempos) // 2] * 1000,
+        "p95_ms": tempos[max(int(len(tempos) * 0.95) - 1, 0)] * 1000,
+        "min_ms": tempos[0] * 1000,
+        "repeticoes": repeticoes,
+    }
+
+
+# ========== CASOS ==========
+def casos(repeticoes: int, usuarios: int) -> Dict[str, Callable[[], Dict]]:
+    """Cada caso chama as funções de verdade do projeto (importadas já na pasta da base)"""
+    import usuarios.usuarios as u
+    from cursos.cursos import cursos_disponiveis
+    from modulos.modulos import listar_modulos_por_curso
+    from certificados.certificados import verificar_conclusao
+
+    alvo = f"aluno{usuarios // 2}"
+    pares = [(f"aluno{i % max(usuarios, 1)}", str(1 + i % len(cursos_disponiveis)))
+             for i in range(1000)]
+
+    def carregar_a_frio():
+        u._armazem = u._diario = u._fragmentos = None
+        u.carregar_usuarios()
+
+    def alterar_alvo():
+        dados = u.get_usuarios_cadastrados()[alvo]
+        dados["idade"] = 16 + (dados["idade"] + 1) % 50
+
+    def login():
+        u.fazer_login()
+        u.usuario_logado = None
+
+    novos = itertools.count()
+
+    def cadastro():
+        n = next(novos)
+        u.cadastrar_usuario(f"novo{n}", f"novo{n}@exemplo.com", 20, "Senha@123")
+
+    def como_admin(funcao):
+        def chamada():
+            u.usuario_logado = {"nome": "admin", "is_admin": True}
+            funcao()
+        return chamada
+
+    def salvar_adiado():
+        u.salvar_usuario(alvo)
+        u.gravar_pendentes()
+
+    def conclusoes():
+        for nome, id_curso in pares:
+            verificar_conclusao(nome, id_curso)
+
+    def logs():
+        for i in range(1000):
+            u.registrar_log("Benchmark", f"Entrada {i}")
+        u.get_escritor_log().descarregar()
+
+    def gerar_certificado():
+        from certificados.certificados import Certificado
+        Certificado().gerar(alvo, "Curso Sintético 1", "32h")
+
+    return {
+        "carregar_usuarios": lambda: medir(carregar_a_frio, repeticoes),
+        "salvar_usuarios": lambda: medir(u.salvar_usuarios, repeticoes, preparar=alterar_alvo),
+        "salvar_usuario_adiado": lambda: medir(salvar_adiado, repeticoes, preparar=alterar_alvo),
+        "login": lambda: medir(login, repeticoes, respostas=(alvo, "Senha@123")),
+        "cadastro": lambda: medir(cadastro, repeticoes),
+        "listar_usuarios": lambda: medir(como_admin(u.listar_usuarios), repeticoes),
+        "listar_modulos_por_curso": lambda: medir(listar_modulos_por_curso, repeticoes),
+        "verificar_conclusao_x1000": lambda: medir(conclusoes, repeticoes),
+        "registrar_log_x1000": lambda: medir(logs, repeticoes),
+        "certificado_gerar": lambda: medir(gerar_certificado, repeticoes),
+    }
+
+
+def executar(params: Dict, repeticoes: int = REPETICOES, filtro: Optional[List[str]] = None) -> Dict:
+    """Gera a base numa pasta temporária, roda os casos e devolve o relatório"""
+    pasta = tempfile.mkdtemp(prefix="pim_benchmark_")
+    origem = os.getcwd()
+    resultados = {}
+    try:
+        gerar_base(pasta, **params)
+        os.chdir(pasta)  # Os módulos usam caminhos relativos para os dados
+        for nome, caso in casos(repeticoes, params["usuarios"]).items():
+            if filtro and nome not in filtro:
+                continue
+            print(f"⏱️  {nome}...", end=" ", flush=True)
+            try:
+                resultados[nome] = caso()
+                print(f"{resultados[nome]['p50_ms']:.2f} ms (p50)")
+            except ImportError as e:  # Ex.: fpdf ausente
+                resultados[nome] = {"ignorado": str(e)}
+                print(f"ignorado ({e})")
+            except Exception as e:  # Um caso quebrado não derruba os outros
+                resultados[nome] = {"erro": f"{type(e).__name__}: {e}"}
+                print(f"{COR_ERRO}❌ {resultados[nome]['erro']}{RESET_COR}")
+    finally:
+        if "usuarios.usuarios" in sys.modules:  # Nada adiado pode ser gravado depois de sair da pasta
+            u = sys.modules["usuarios.usuarios"]
+            u.gravar_pendentes()
+            u.get_escritor_log().descarregar()
+        os.chdir(origem)
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    return {
+        "meta": {
+            "data": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "armazenamento": os.environ.get("PIM_ARMAZENAMENTO", "json"),
+            "parametros": params,
+        },
+        "resultados": resultados,
+    }
+
+
+# ========== COMPARAÇÃO ==========
+def comparar(base: Dict, novo: Dict, limite: float = LIMITE_REGRESSAO,
+             minimo_ms: float = MINIMO_MS) -> List[str]:
+    """Imprime a comparação de p50 e devolve os casos que regrediram"""
+    if base["meta"]["parametros"] != novo["meta"]["parametros"]:
+        print(f"{COR_ERRO}⚠️ Bases geradas com parâmetros diferentes; compare com cuidado{RESET_COR}")
+
+    regressoes = []
+    print(f"{COR_TITULO}{'caso':<28}{'base p50':>12}{'novo p50':>12}{'variação':>10}{RESET_COR}")
+    for nome, antes in base["resultados"].items():
+        depois = novo["resultados"].get(nome)
+        if depois and "erro" in depois:  # Caso que passou a falhar conta como regressão
+            regressoes.append(nome)
+            antes_txt = f"{antes['p50_ms']:>12.3f}" if "p50_ms" in antes else f"{'—':>12}"
+            print(f"{nome:<28}{antes_txt}{COR_ERRO}{'erro':>12}{RESET_COR}")
+            continue
+        if not depois or "p50_ms" not in antes or "p50_ms" not in depois:
+            print(f"{nome:<28}{'—':>12}{'—':>12}{'':>10}")
+            continue
+        variacao = depois["p50_ms"] / antes["p50_ms"] - 1 if antes["p50_ms"] else 0.0
+        piorou = variacao > limite and depois["p50_ms"] - antes["p50_ms"] > minimo_ms
+        if piorou:
+            regressoes.append(nome)
+        cor = COR_ERRO if piorou else COR_SUCESSO
+        print(f"{nome:<28}{antes['p50_ms']:>12.3f}{depois['p50_ms']:>12.3f}"
+              f"{cor}{variacao:>+10.1%}{RESET_COR}")
+    return regressoes
+
+
+# ========== LINHA DE COMANDO ==========
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da plataforma")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    cmd_executar = comandos.add_parser("executar", help="roda os benchmarks e grava o JSON")
+    adicionar_argumentos(cmd_executar)
+    cmd_executar.add_argument("--repeticoes", type=int, default=REPETICOES)
+    cmd_executar.add_argument("--casos", help="lista separada por vírgulas (padrão: todos)")
+    cmd_executar.add_argument("--saida", default="benchmark.json")
+
+    cmd_comparar = comandos.add_parser("comparar", help="compara dois JSON de resultados")
+    cmd_comparar.add_argument("base")
+    cmd_comparar.add_argument("novo")
+    cmd_comparar.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                              help="fração de piora tolerada no p50 (padrão 0.10)")
+    cmd_comparar.add_argument("--minimo-ms", type=float, default=MINIMO_MS,
+                              help="piora absoluta mínima para contar como regressão")
+    args = parser.parse_args()
+
+    if args.comando == "executar":
+        filtro = args.casos.split(",") if args.casos else None
+        relatorio = executar(parametros(args), args.repeticoes, filtro)
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=4, ensure_ascii=False)
+        print(f"{COR_SUCESSO}✅ Resultados em {args.saida}{RESET_COR}")
+        falhas = [nome for nome, r in relatorio["resultados"].items() if "erro" in r]
+        if falhas:
+            print(f"{COR_ERRO}❌ Casos com erro: {', '.join(falhas)}{RESET_COR}")
+            sys.exit(1)
+    else:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.novo, encoding='utf-8') as f:
+            novo = json.load(f)
+        regressoes = comparar(base, novo, args.limite, args.minimo_ms)
+        if regressoes:
+            print(f"{COR_ERRO}❌ Regressão em: {', '.join(regressoes)}{RESET_COR}")
+            sys.exit(1)
+        print(f"{COR_SUCESSO}✅ Sem regressões acima de {args.limite:.0%}{RESET_COR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# benchmark/carga.py
+"""Simula muitos alunos usando os menus ao mesmo tempo (roteiros de input()).
+
+Uso (na pasta do projeto):
+    python -m benchmark.carga gravar roteiro.txt
+        Usa o sistema normalmente e grava cada resposta digitada (uma por linha).
+    python -m benchmark.carga executar PASTA --sessoes 500 --processos 16 [--gerar-base]
+        Roda sessões em paralelo sobre os dados de PASTA. Sem --roteiro, cada
+        sessão é gerada (login, cursos, matrícula, progresso, certificados).
+        Com --roteiro, repete o arquivo gravado; "{aluno}" vira o aluno da sessão.
+    python -m benchmark.carga http [URL] --clientes 50 --sessoes 1000 --alunos 1000
+        Mesma sessão típica contra a API (api/api.py) já no ar, com clientes
+        simultâneos em asyncio, cada um numa conexão keep-alive.
+
+O relatório traz sessões/s, latência por operação (p50/p95/p99) e a
+contagem de exceções e mensagens de erro (❌) vistas nas sessões.
+"""
+import argparse
+import asyncio
+import builtins
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmark.dados_sinteticos import gerar_base, adicionar_argumentos, parametros
+from benchmark.dados_sinteticos import SENHA_PADRAO
+from metricas.metricas import Histograma
+
+
+# ========== CONFIGURAÇÕES ==========
+PROCESSOS = os.cpu_count() or 1
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+COR_TITULO = "\033[1;36m"
+RESET_COR = "\033[0m"
+
+# Um passo do roteiro: (resposta ao input(), nome da operação que ela dispara)
+Passo = Tuple[str, Optional[str]]
+
+
+class RoteiroEsgotado(Exception):
+    """O menu pediu mais respostas do que o roteiro tinha"""
+
+
+# ========== ROTEIROS ==========
+def roteiro_aluno(aluno: str, id_curso: str) -> List[Passo]:
+    """Sessão típica de um aluno pelo menu principal (main.py).
+
+    `id_curso` deve ser um curso em que o aluno ainda não está matriculado e
+    com aulas no primeiro módulo, como os da base sintética.
+    """
+    return [
+        ("1", "menu.login_cadastro"),
+        ("1", "login.entrar"),
+        (aluno, "login.usuario"),
+        (SENHA_PADRAO, "login.verificar"),
+        ("0", "login.voltar"),
+        ("2", "menu.cursos"),
+        ("1", "cursos.listar"),
+        ("", "cursos.voltar_lista"),
+        ("4", "cursos.tela_matricula"),
+        (id_curso, "cursos.matricular"),
+        ("5", "cursos.progresso"),
+        (id_curso, "progresso.abrir_curso"),
+        ("1", "progresso.abrir_modulo"),
+        ("1", "progresso.marcar_aula"),
+        ("", "progresso.voltar"),
+        ("0", "cursos.voltar"),
+        ("5", "menu.certificados"),
+        ("2", "certificados.listar"),
+        ("0", "certificados.voltar"),
+        ("6", "menu.sair"),
+    ]
+
+def ler_roteiro(caminho: str) -> List[Passo]:
+    """Roteiro gravado: uma resposta por linha (a operação é o texto da pergunta)"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return [(linha.rstrip("\n"), None) for linha in f]
+
+
+# ========== GRAVAÇÃO ==========
+def gravar(caminho: str):
+    """Roda o sistema de verdade e salva as respostas digitadas"""
+    import main
+    input_original = builtins.input
+    with open(caminho, 'w', encoding='utf-8') as saida:
+        def input_gravado(prompt=""):
+            resposta = input_original(prompt)
+            saida.write(resposta + "\n")
+            saida.flush()
+            return resposta
+        builtins.input = input_gravado
+        try:
+            main.main()
+        finally:
+            builtins.input = input_original
+    print(f"{COR_SUCESSO}✅ Roteiro gravado em {caminho}{RESET_COR}")
+
+
+# ========== SESSÃO (em cada processo) ==========
+def _iniciar_processo(pasta: str):
+    os.chdir(pasta)  # Os módulos usam caminhos relativos para os dados
+
+def _gravar_pendentes():
+    """Processos do Pool saem sem atexit: grava aqui o que estiver adiado"""
+    from repositorio.armazem_json import gravar_pendentes_todos
+    from registros.registros import descarregar_todos
+    gravar_pendentes_todos()
+    descarregar_todos()
+
+def executar_sessao(passos: List[Passo]) -> Dict:
+    """Responde os input() do menu principal com `passos` e cronometra cada operação.
+
+    A latência de uma operação vai da resposta dada até o próximo input()
+    (ou o fim da sessão), ou seja, o processamento que aquela resposta disparou.
+    """
+    import main
+    from usuarios import usuarios
+
+    tempos: List[Tuple[str, float]] = []
+    pendente = {"operacao": None, "inicio": 0.0}
+    fila = iter(passos)
+
+    def fechar_operacao():
+        if pendente["operacao"]:
+            tempos.append((pendente["operacao"], time.perf_counter() - pendente["inicio"]))
+            pendente["operacao"] = None
+
+    def input_roteirizado(prompt=""):
+        fechar_operacao()
+        try:
+            resposta, operacao = next(fila)
+        except StopIteration:
+            raise RoteiroEsgotado(prompt.strip()) from None
+        pendente["operacao"] = operacao or prompt.strip()[:40] or "(enter)"
+        pendente["inicio"] = time.perf_counter()
+        return resposta
+
+    saida = io.StringIO()
+    excecao = None
+    inicio = time.perf_counter()
+    input_original = builtins.input
+    builtins.input = input_roteirizado
+    try:
+        with redirect_stdout(saida):
+            main.main()
+            fechar_operacao()
+    except Exception as e:
+        excecao = type(e).__name__
+    finally:
+        builtins.input = input_original
+        usuarios.usuario_logado = None  # A próxima sessão do processo começa deslogada
+        _gravar_pendentes()
+
+    texto = saida.getvalue()
+    return {
+        "duracao": time.perf_counter() - inicio,
+        "tempos": tempos,
+        "excecao": excecao,
+        "erros": texto.count("❌"),
+    }
+
+
+# ========== EXECUÇÃO ==========
+def executar(pasta: str, sessoes: int, processos: int = PROCESSOS,
+             roteiro: Optional[List[Passo]] = None) -> Dict:
+    with open(os.path.join(pasta, "dados_usuarios.json"), encoding='utf-8') as f:
+        matriculas = {nome: set(dados.get("cursos", [])) for nome, dados in json.load(f).items()
+                      if not dados.get("is_admin")}
+    alunos = list(matriculas)
+    with open(os.path.join(pasta, "cursos.json"), encoding='utf-8') as f:
+        cursos = list(json.load(f))
+    if not alunos or not cursos:
+        raise ValueError("A pasta precisa de alunos e cursos (use --gerar-base)")
+
+    planos = []
+    for i in range(sessoes):
+        aluno = alunos[i % len(alunos)]
+        if roteiro is None:
+            # Um curso novo para o aluno, senão a matrícula só mede o "já matriculado"
+            livres = [c for c in cursos if c not in matriculas[aluno]] or cursos
+            planos.append(roteiro_aluno(aluno, livres[i % len(livres)]))
+        else:
+            planos.append([(r.replace("{aluno}", aluno), op) for r, op in roteiro])
+
+    inicio = time.perf_counter()
+    with Pool(processos, initializer=_iniciar_processo, initargs=(os.path.abspath(pasta),)) as pool:
+        resultados = pool.map(executar_sessao, planos, chunksize=1)
+    return _agregar(resultados, sessoes, processos, time.perf_counter() - inicio)
+
+def _agregar(resultados: List[Dict], sessoes: int, processos: int, duracao: float) -> Dict:
+    operacoes: Dict[str, Histograma] = {}
+    sessao = Histograma()
+    excecoes: Dict[str, int] = {}
+    for r in resultados:
+        sessao.registrar(r["duracao"])
+        for operacao, segundos in r["tempos"]:
+            operacoes.setdefault(operacao, Histograma()).registrar(segundos)
+        if r["excecao"]:
+            excecoes[r["excecao"]] = excecoes.get(r["excecao"], 0) + 1
+
+    return {
+        "sessoes": sessoes,
+        "processos": processos,
+        "duracao_s": round(duracao, 3),
+        "sessoes_por_s": round(sessoes / duracao, 2) if duracao else 0.0,
+        "sessao": sessao.resumo(),
+        "operacoes": {nome: h.resumo() for nome, h in sorted(operacoes.items())},
+        "excecoes": excecoes,
+        "mensagens_erro": sum(r["erros"] for r in resultados),
+    }
+
+# ========== CARGA NA API ==========
+class ClienteHTTP:
+    """Cliente mínimo sobre uma conexão keep-alive (só o que a API usa)"""
+
+    def __init__(self, host: str, porta: int):
+        self.host, self.porta = host, porta
+        self.leitor = self.escritor = None
+        self.token = None
+
+    async def requisitar(self, metodo: str, caminho: str, corpo: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if self.escritor is None:
+            self.leitor, self.escritor = await asyncio.open_connection(self.host, self.porta)
+        dados = json.dumps(corpo).encode() if corpo is not None else b""
+        cabecalho = f"{metodo} {caminho} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(dados)}\r\n"
+        if self.token:
+            cabecalho += f"Authorization: Bearer {self.token}\r\n"
+        self.escritor.write(cabecalho.encode() + b"\r\n" + dados)
+        await self.escritor.drain()
+
+        status = int((await self.leitor.readline()).split()[1])
+        cabecalhos = {}
+        while (linha := await self.leitor.readline()) not in (b"\r\n", b""):
+            chave, _, valor = linha.decode('latin-1').partition(":")
+            cabecalhos[chave.strip().lower()] = valor.strip()
+        resposta = await self.leitor.readexactly(int(cabecalhos.get("content-length", 0)))
+        if cabecalhos.get("connection") == "close":
+            self.fechar()
+        return status, json.loads(resposta) if resposta and "json" in cabecalhos.get("content-type", "") else {}
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+            self.leitor = self.escritor = None
+
+async def _sessao_api(cliente: ClienteHTTP, aluno: str, id_curso: str,
+                      tempos: List[Tuple[str, float]]) -> int:
+    """Sessão típica de um aluno pela API; devolve quantas respostas vieram com erro"""
+    erros = 0
+
+    async def chamar(operacao: str, metodo: str, caminho: str, corpo: Optional[Dict] = None) -> Dict:
+        nonlocal erros
+        inicio = time.perf_counter()
+        status, resposta = await cliente.requisitar(metodo, caminho, corpo)
+        tempos.append((operacao, time.perf_counter() - inicio))
+        if status >= 400:
+            erros += 1
+        return resposta
+
+    cliente.token = (await chamar("api.login", "POST", "/login",
+                                  {"usuario": aluno, "senha": SENHA_PADRAO})).get("token")
+    if not cliente.token:
+        return erros
+    await chamar("api.cursos", "GET", "/cursos")
+    modulos = (await chamar("api.modulos", "GET", f"/cursos/{id_curso}/modulos")).get("modulos", [])
+    await chamar("api.matricular", "POST", "/matriculas", {"curso": id_curso})
+    if modulos:
+        await chamar("api.marcar_modulo", "POST", "/progresso",
+                     {"curso": id_curso, "modulo": modulos[0]["id"]})
+    await chamar("api.progresso", "GET", "/progresso")
+    await chamar("api.certificados", "GET", "/certificados")
+    await chamar("api.logout", "POST", "/logout")
+    cliente.token = None
+    return erros
+
+async def _carga_api(url: str, clientes: int, sessoes: int, alunos: int) -> Dict:
+    partes = urlsplit(url)
+    host, porta = partes.hostname or "127.0.0.1", partes.port or 80
+    catalogo = ClienteHTTP(host, porta)
+    cursos = [c["id"] for c in (await catalogo.requisitar("GET", "/cursos"))[1]["cursos"]]
+    catalogo.fechar()
+    if not cursos:
+        raise ValueError("A API não tem cursos")
+
+    fila: asyncio.Queue = asyncio.Queue()
+    for i in range(sessoes):
+        fila.put_nowait(i)
+    resultados: List[Dict] = []
+
+    async def trabalhador():
+        cliente = ClienteHTTP(host, porta)
+        while True:
+            try:
+                i = fila.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            tempos: List[Tuple[str, float]] = []
+            inicio = time.perf_counter()
+            excecao, erros = None, 0
+            try:
+                erros = await _sessao_api(cliente, f"aluno{i % alunos}", cursos[i % len(cursos)], tempos)
+            except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+                excecao = type(e).__name__
+                cliente.fechar()
+            resultados.append({"duracao": time.perf_counter() - inicio, "tempos": tempos,
+                               "excecao": excecao, "erros": erros})
+        cliente.fechar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(clientes)))
+    return _agregar(resultados, sessoes, clientes, time.perf_counter() - inicio)
+
+def carga_api(url: str, clientes: int = 50, sessoes: int = 500, alunos: int = 1000) -> Dict:
+    return asyncio.run(_carga_api(url, clientes, sessoes, alunos))
+
+
+def imprimir(relatorio: Dict):
+    print(f"\n{COR_TITULO}=== CARGA: {relatorio['sessoes']} sessões em "
+          f"{relatorio['processos']} processos/clientes ==={RESET_COR}")
+    print(f"Duração: {relatorio['duracao_s']:.2f} s  |  {relatorio['sessoes_por_s']:.1f} sessões/s  |  "
+          f"sessão p95: {relatorio['sessao']['p95_ms']:.1f} ms")
+    print(f"\n{'operação':<28}{'qtd':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'máx':>9}  (ms)")
+    for nome, r in relatorio["operacoes"].items():
+        print(f"{nome[:27]:<28}{r['chamadas']:>7}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}")
+    cor = COR_ERRO if relatorio["excecoes"] or relatorio["mensagens_erro"] else COR_SUCESSO
+    print(f"\n{cor}Exceções: {relatorio['excecoes'] or 0}  |  "
+          f"Mensagens de erro (❌): {relatorio['mensagens_erro']}{RESET_COR}")
+
+
+# ========== LINHA DE COMANDO ==========
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga pelos menus")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    cmd_gravar = comandos.add_parser("gravar", help="grava as respostas de uma sessão real")
+    cmd_gravar.add_argument("roteiro")
+
+    cmd_http = comandos.add_parser("http", help="sessões simultâneas contra a API HTTP")
+    cmd_http.add_argument("url", nargs="?", default="http://127.0.0.1:8080")
+    cmd_http.add_argument("--clientes", type=int, default=50, help="conexões simultâneas")
+    cmd_http.add_argument("--sessoes", type=int, default=500)
+    cmd_http.add_argument("--alunos", type=int, default=1000, help="aluno0..alunoN-1 da base sintética")
+    cmd_http.add_argument("--saida", help="grava o relatório em JSON")
+
+    cmd_executar = comandos.add_parser("executar", help="roda sessões em paralelo")
+    cmd_executar.add_argument("pasta", help="pasta compartilhada com os dados")
+    cmd_executar.add_argument("--sessoes", type=int, default=100)
+    cmd_executar.add_argument("--processos", type=int, default=PROCESSOS)
+    cmd_executar.add_argument("--roteiro", help="arquivo gravado (padrão: sessões geradas)")
+    cmd_executar.add_argument("--saida", help="grava o relatório em JSON")
+    cmd_executar.add_argument("--gerar-base", action="store_true",
+                              help="cria uma base sintética na pasta antes de começar")
+    adicionar_argumentos(cmd_executar)
+    args = parser.parse_args()
+
+    if args.comando == "gravar":
+        gravar(args.roteiro)
+        return
+
+    if args.comando == "http":
+        relatorio = carga_api(args.url, args.clientes, args.sessoes, args.alunos)
+    else:
+        if args.gerar_base:
+            gerar_base(args.pasta, **parametros(args))
+        roteiro = ler_roteiro(args.roteiro) if args.roteiro else None
+        relatorio = executar(args.pasta, args.sessoes, args.processos, roteiro)
+    imprimir(relatorio)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=4, ensure_ascii=False)
+    if relatorio["excecoes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmark/dados_sinteticos.py
+"""Gera uma base fictícia (usuários, cursos, módulos, matrículas, certificados e log).
+
+Uso (na pasta do projeto):
+    python -m benchmark.dados_sinteticos PASTA [--usuarios N] [--cursos M] [--modulos K] ...
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Tuple
+
+from registros.registros import formatar_texto
+
+
+# ========== CONFIGURAÇÕES ==========
+SENHA_PADRAO = "Senha@123"  # Todos os alunos fictícios usam a mesma senha (válida)
+SEMENTE = 42  # Mesma semente -> mesma base -> resultados comparáveis
+
+
+def gerar_cursos(cursos: int, modulos: int, aulas: int = 5) -> Dict:
+    inicio = datetime(2024, 1, 1)
+    return {
+        str(id_curso): {
+            "nome": f"Curso Sintético {id_curso}",
+            "carga_horaria": f"{modulos * 4}h",
+            "modulos": [{
+                "id": id_modulo,
+                "nome": f"Módulo {id_modulo + 1}",
+                "criado_por": "admin",
+                "data_criacao": (inicio + timedelta(days=id_modulo)).isoformat(),
+                "aulas": [f"Aula {a + 1}" for a in range(aulas)],
+            } for id_modulo in range(modulos)],
+            "proximo_id_modulo": modulos,
+            "criado_por": "Sistema",
+            "data_criacao": inicio.isoformat(),
+        }
+        for id_curso in range(1, cursos + 1)
+    }
+
+
+def gerar_usuarios(usuarios: int, cursos: int, modulos: int, matriculas: int,
+                   taxa_conclusao: float, rnd: random.Random) -> Dict:
+    """Alunos `aluno0..alunoN-1` + um admin; quem conclui um curso ganha o certificado"""
+    return dict(iterar_usuarios(usuarios, cursos, modulos, matriculas, taxa_conclusao, rnd))
+
+
+def iterar_usuarios(usuarios: int, cursos: int, modulos: int, matriculas: int,
+                    taxa_conclusao: float, rnd: random.Random) -> Iterator[Tuple[str, Dict]]:
+    """Mesmos registros de `gerar_usuarios`, um por vez (bases grandes sem tudo na memória)"""
+    inicio = datetime(2024, 1, 1)
+    todos_modulos = (1 << modulos) - 1
+    yield "admin", {
+        "senha": "Admin@123", "email": "admin@escola.com", "idade": 30,
+        "is_admin": True, "data_cadastro": inicio.isoformat(), "cursos": [],
+    }
+    for i in range(usuarios):
+        nome = f"aluno{i}"
+        cadastro = inicio + timedelta(minutes=i)
+        inscritos = [str(c) for c in rnd.sample(range(1, cursos + 1), min(matriculas, cursos))]
+        progresso, certificados = {}, []
+        for id_curso in inscritos:
+            concluiu = rnd.random() < taxa_conclusao
+            bits = todos_modulos if concluiu else rnd.getrandbits(modulos) & todos_modulos
+            progresso[id_curso] = {"modulos": bits, "aulas": {}}
+            if concluiu:
+                certificados.append({
+                    "curso": id_curso,
+                    "codigo": f"CERT-{i:06d}{int(id_curso):06d}",
+                    "data": (cadastro + timedelta(days=30)).isoformat(),
+                    "caminho": f"certificados/CERT-{i:06d}{int(id_curso):06d}.pdf",
+                })
+        dados = {
+            "senha": SENHA_PADRAO,
+            "email": f"{nome}@exemplo.com",
+            "idade": rnd.randint(16, 70),
+            "is_admin": False,
+            "data_cadastro": cadastro.isoformat(),
+            "cursos": inscritos,
+            "progresso": progresso,
+        }
+        if certificados:
+            dados["certificados"] = certificados
+        yield nome, dados
+
+
+def gerar_log(caminho: str, linhas: int, usuarios: int, rnd: random.Random):
+    inicio = datetime(2024, 1, 1)
+    acoes = ("Login realizado", "Logout", "Módulo concluído", "Certificado gerado")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for i in range(linhas):
+            usuario = f"aluno{rnd.randrange(max(usuarios, 1))}"
+            f.write(formatar_texto({
+                "timestamp": inicio + timedelta(seconds=i * 7),
+                "usuario": usuario,
+                "acao": rnd.choice(acoes),
+                "detalhes": f"Usuário: {usuario}",
+            }))
+
+
+def gerar_base(pasta: str, usuarios: int = 1000, cursos: int = 10, modulos: int = 8,
+               matriculas: int = 3, taxa_conclusao: float = 0.3, linhas_log: int = 10000,
+               semente: int = SEMENTE) -> Dict:
+    """Escreve dados_usuarios.json, cursos.json e registro_logs.log em `pasta`"""
+    rnd = random.Random(semente)
+    os.makedirs(pasta, exist_ok=True)
+    with open(os.path.join(pasta, "cursos.json"), 'w', encoding='utf-8') as f:
+        json.dump(gerar_cursos(cursos, modulos), f, ensure_ascii=False)
+    with open(os.path.join(pasta, "dados_usuarios.json"), 'w', encoding='utf-8') as f:
+        json.dump(gerar_usuarios(usuarios, cursos, modulos, matriculas, taxa_conclusao, rnd),
+                  f, ensure_ascii=False)
+    gerar_log(os.path.join(pasta, "registro_logs.log"), linhas_log, usuarios, rnd)
+    return {"usuarios": usuarios, "cursos": cursos, "modulos": modulos, "matriculas": matriculas,
+            "taxa_conclusao": taxa_conclusao, "linhas_log": linhas_log, "semente": semente}
+
+
+def adicionar_argumentos(parser: argparse.ArgumentParser):
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--cursos", type=int, default=10)
+    parser.add_argument("--modulos", type=int, default=8, help="módulos por curso")
+    parser.add_argument("--matriculas", type=int, default=3, help="cursos por aluno")
+    parser.add_argument("--taxa-conclusao", type=float, default=0.3)
+    parser.add_argument("--linhas-log", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=SEMENTE)
+
+
+def parametros(args: argparse.Namespace) -> Dict:
+    return {"usuarios": args.usuarios, "cursos": args.cursos, "modulos": args.modulos,
+            "matriculas": args.matriculas, "taxa_conclusao": args.taxa_conclusao,
+            "linhas_log": args.linhas_log, "semente": args.semente}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma base sintética da plataforma")
+    parser.add_argument("pasta")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    gerar_base(args.pasta, **parametros(args))
+    print(f"✅ Base sintética gerada em {args.pasta}")
+
+
+if __name__ == "__main__":
+    main()
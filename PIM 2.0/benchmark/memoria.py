@@ -0,0 +1,157 @@
+# benchmark/memoria.py
+"""Memória ocupada por usuários e cursos: dicionários do JSON vs. modelos compactos.
+
+Uso (na pasta do projeto):
+    python -m benchmark.memoria --usuarios 1000000 [--saida memoria.json]
+    (aceita os mesmos parâmetros de base de benchmark.dados_sinteticos)
+
+Cada formato é medido num processo novo, com tracemalloc: os registros da
+base sintética passam por json.dumps/json.loads um a um (textos próprios,
+como ao ler o arquivo; chaves compartilhadas, como faz o json.load do
+arquivo inteiro) e ficam no dicionário final. "dict" guarda o que o json
+devolve; "compacto" converte cada registro com modelos.Usuario/Curso. O
+tempo de leitura/conversão é medido antes, sem tracemalloc, numa amostra.
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict
+
+from benchmark.dados_sinteticos import gerar_cursos, iterar_usuarios, adicionar_argumentos, parametros
+
+
+# ========== CONFIGURAÇÕES ==========
+FORMATOS = ("dict", "compacto")
+AMOSTRA_TEMPO = 20000  # Registros usados para medir o tempo de leitura/conversão
+COR_SUCESSO = "\033[1;32m"
+COR_TITULO = "\033[1;36m"
+RESET_COR = "\033[0m"
+
+
+# ========== MEDIÇÃO (processo filho) ==========
+def _em_uso() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def _ler(texto: str):
+    """json.loads com as chaves compartilhadas entre registros, como num arquivo inteiro"""
+    return json.loads(texto, object_pairs_hook=lambda pares: {sys.intern(k): v for k, v in pares})
+
+def _usuarios(params: Dict):
+    """(nome, texto JSON) de cada usuário da base sintética"""
+    rnd = random.Random(params["semente"])
+    for nome, dados in iterar_usuarios(params["usuarios"], params["cursos"], params["modulos"],
+                                       params["matriculas"], params["taxa_conclusao"], rnd):
+        yield nome, json.dumps(dados)
+
+def _tempos(converter, params: Dict) -> Dict:
+    """µs por usuário para ler o JSON e para converter, sem o custo do tracemalloc"""
+    amostra = [texto for _, texto in itertools.islice(_usuarios(params), AMOSTRA_TEMPO)]
+    inicio = time.perf_counter()
+    lidos = [_ler(texto) for texto in amostra]
+    meio = time.perf_counter()
+    for dados in lidos:
+        converter(dados)
+    fim = time.perf_counter()
+    return {"leitura_us": (meio - inicio) * 1e6 / len(amostra),
+            "conversao_us": (fim - meio) * 1e6 / len(amostra)}
+
+def medir_formato(formato: str, params: Dict) -> Dict:
+    """Monta cursos e usuários no `formato` e devolve os bytes retidos por cada um"""
+    from modelos.modelos import Curso, Usuario
+    converter_curso = Curso.de_json if formato == "compacto" else (lambda d: d)
+    converter_usuario = Usuario.de_json if formato == "compacto" else (lambda d: d)
+    tempos = _tempos(converter_usuario, params)
+
+    tracemalloc.start()
+    inicio = _em_uso()
+    cursos = {id_curso: converter_curso(_ler(json.dumps(curso)))
+              for id_curso, curso in gerar_cursos(params["cursos"], params["modulos"]).items()}
+    depois_cursos = _em_uso()
+    usuarios = {_ler(json.dumps(nome)): converter_usuario(_ler(texto))
+                for nome, texto in _usuarios(params)}
+    depois_usuarios = _em_uso()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "cursos_bytes": depois_cursos - inicio,
+        "usuarios_bytes": depois_usuarios - depois_cursos,
+        "por_usuario_bytes": (depois_usuarios - depois_cursos) / len(usuarios),
+        "pico_bytes": pico - inicio,
+        "registros": len(usuarios) + len(cursos),
+        **tempos,
+    }
+
+def _medir_em_processo(formato: str, params: Dict) -> Dict:
+    """Processo novo por formato: um não herda a memória (nem o lixo) do outro"""
+    saida = subprocess.run(
+        [sys.executable, "-m", "benchmark.memoria", "--formato", formato,
+         "--parametros", json.dumps(params)],
+        stdout=subprocess.PIPE, text=True, check=True)  # Erros do filho aparecem no stderr
+    return json.loads(saida.stdout)
+
+
+# ========== RELATÓRIO ==========
+def executar(params: Dict) -> Dict:
+    resultados = {}
+    for formato in FORMATOS:
+        print(f"📏 {formato}...", end=" ", flush=True)
+        resultados[formato] = _medir_em_processo(formato, params)
+        print(f"{resultados[formato]['usuarios_bytes'] / 2**20:.1f} MB")
+    base, compacto = resultados["dict"], resultados["compacto"]
+    return {
+        "meta": {
+            "data": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "parametros": params,
+        },
+        "resultados": resultados,
+        "reducao_usuarios": base["usuarios_bytes"] / compacto["usuarios_bytes"],
+        "reducao_cursos": base["cursos_bytes"] / max(compacto["cursos_bytes"], 1),
+    }
+
+def imprimir(relatorio: Dict):
+    params = relatorio["meta"]["parametros"]
+    print(f"\n{COR_TITULO}=== MEMÓRIA: {params['usuarios']} usuários, {params['cursos']} cursos ===")
+    print(f"{'formato':<12}{'usuários (MB)':>15}{'B/usuário':>12}{'cursos (KB)':>13}"
+          f"{'pico (MB)':>11}{'leitura µs':>12}{'conversão µs':>14}{RESET_COR}")
+    for formato, r in relatorio["resultados"].items():
+        print(f"{formato:<12}{r['usuarios_bytes'] / 2**20:>15.1f}{r['por_usuario_bytes']:>12.0f}"
+              f"{r['cursos_bytes'] / 1024:>13.1f}{r['pico_bytes'] / 2**20:>11.1f}"
+              f"{r['leitura_us']:>12.1f}{r['conversao_us']:>14.1f}")
+    print(f"{COR_SUCESSO}Redução: usuários {relatorio['reducao_usuarios']:.1f}x | "
+          f"cursos {relatorio['reducao_cursos']:.1f}x{RESET_COR}")
+
+
+# ========== LINHA DE COMANDO ==========
+def main():
+    parser = argparse.ArgumentParser(description="Memória dos usuários/cursos: dict vs. compacto")
+    adicionar_argumentos(parser)
+    parser.set_defaults(usuarios=1000000, linhas_log=0)
+    parser.add_argument("--saida", help="grava o relatório em JSON")
+    parser.add_argument("--formato", choices=FORMATOS, help=argparse.SUPPRESS)  # Processo filho
+    parser.add_argument("--parametros", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.formato:
+        print(json.dumps(medir_formato(args.formato, json.loads(args.parametros))))
+        return
+    relatorio = executar(parametros(args))
+    imprimir(relatorio)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=4, ensure_ascii=False)
+        print(f"{COR_SUCESSO}✅ Resultados em {args.saida}{RESET_COR}")
+
+
+if __name__ == "__main__":
+    main()
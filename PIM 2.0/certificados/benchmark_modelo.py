@@ -0,0 +1,57 @@
+# certificados/benchmark_modelo.py
+"""Compara o custo por certificado com e sem o modelo em cache.
+
+Uso (na pasta do projeto):  python -m certificados.benchmark_modelo [quantidade]
+"""
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import certificados.certificados as certificados
+from certificados.modelo import ModeloCertificado
+import certificados.modelo as modelo
+
+
+def medir(usar_modelo: bool, quantidade: int, pasta: str) -> dict:
+    certificados.USAR_MODELO = usar_modelo
+    certificados.PASTA_CERTIFICADOS = pasta
+    modelo._modelo = ModeloCertificado()  # Cache vazio: a primeira emissão paga a montagem
+
+    tempos = []
+    tracemalloc.start()
+    for i in range(quantidade):
+        inicio = time.perf_counter()
+        certificados.Certificado().gerar(f"Aluno {i}", "Introdução à Programação", "40h",
+                                         codigo=f"CERT-BENCH{i:07d}")
+        tempos.append(time.perf_counter() - inicio)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tempos.sort()
+    return {
+        "media_ms": statistics.mean(tempos) * 1000,
+        "p50_ms": tempos[len(tempos) // 2] * 1000,
+        "p95_ms": tempos[int(len(tempos) * 0.95) - 1] * 1000,
+        "pico_memoria_kb": pico / 1024,
+    }
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as pasta:
+        sem = medir(False, quantidade, pasta)
+        com = medir(True, quantidade, pasta)
+
+    print(f"=== {quantidade} certificados ===")
+    print(f"{'':<18}{'sem modelo':>14}{'com modelo':>14}")
+    for chave, rotulo in (("media_ms", "média (ms)"), ("p50_ms", "p50 (ms)"),
+                          ("p95_ms", "p95 (ms)"), ("pico_memoria_kb", "pico mem. (KB)")):
+        print(f"{rotulo:<18}{sem[chave]:>14.3f}{com[chave]:>14.3f}")
+    if com["media_ms"]:
+        print(f"\nGanho na média: {sem['media_ms'] / com['media_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
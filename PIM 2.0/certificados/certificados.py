@@ -1,8 +1,13 @@
 # certificados.py
-from fpdf import FPDF
 import hashlib
 from datetime import datetime
 import os
+from typing import TYPE_CHECKING
+from usuarios.usuarios import registrar_log as registrar_log_usuarios
+from metricas.metricas import cronometrar
+# fpdf e certificados.modelo são importados só ao gerar um PDF (abrir o menu/validar não precisa)
+if TYPE_CHECKING:
+    from fpdf import FPDF
 
 # ========== CONFIGURAÇÕES DE CORES ==========
 COR_TITULO = "\033[1;35m"  # Roxo
@@ -14,8 +19,8 @@ COR_USUARIO = "\033[1;34m" # Azul
 RESET_COR = "\033[0m"
 
 # ========== CONFIGURAÇÕES DE PASTAS ==========
-PASTA_CERTIFICADOS = "certificados"
-os.makedirs(PASTA_CERTIFICADOS, exist_ok=True)
+PASTA_CERTIFICADOS = "certificados"  # Criada na primeira emissão
+USAR_MODELO = True  # Reaproveita o layout fixo em cache (certificados/modelo.py)
 
 # ========== FUNÇÕES DE ACESSO SEGURO ==========
 def get_usuario_logado():
@@ -24,9 +29,9 @@ def get_usuario_logado():
     return usuario_logado
 
 def get_usuarios_cadastrados():
-    """Obtém os dados ATUALIZADOS dos usuários (agora com reload)"""
-    from usuarios.usuarios import carregar_usuarios  # Importa a função de carregar
-    return carregar_usuarios()  # Retorna dados frescos do JSON
+    """Obtém os dados ATUALIZADOS dos usuários (relê só se o arquivo mudou)"""
+    from usuarios.usuarios import obter_usuarios_atualizados
+    return obter_usuarios_atualizados()
 
 def get_cursos_disponiveis():
     """Obtém os cursos atualizados"""
@@ -35,9 +40,8 @@ def get_cursos_disponiveis():
 
 def registrar_log(acao: str, detalhes: str = ""):
     """Registra log usando a função original"""
-    from usuarios.usuarios import registrar_log as original_registrar_log
     usuario = get_usuario_logado()
-    original_registrar_log(acao, f"{detalhes} | Usuário: {usuario['nome'] if usuario else 'SISTEMA'}")
+    registrar_log_usuarios(acao, f"{detalhes} | Usuário: {usuario['nome'] if usuario else 'SISTEMA'}")
 
 # ========== CLASSE CERTIFICADO ==========
 class Certificado:
@@ -45,11 +49,29 @@ class Certificado:
         self.codigo = None
         self.caminho = None
 
-    def gerar(self, nome_aluno: str, nome_curso: str, carga_horaria: str):
-        """Gera um certificado em PDF"""
-        self._gerar_codigo(nome_aluno, nome_curso)
+    @cronometrar("certificados.gerar")
+    def gerar(self, nome_aluno: str, nome_curso: str, carga_horaria: str, codigo: str = None):
+        """Gera um certificado em PDF (com `codigo`, usa um código já reservado)"""
+        if codigo:
+            self.codigo = codigo
+        else:
+            self._gerar_codigo(nome_aluno, nome_curso)
         self.caminho = f"{PASTA_CERTIFICADOS}/{self.codigo}.pdf"
+        os.makedirs(PASTA_CERTIFICADOS, exist_ok=True)
+
+        if USAR_MODELO:
+            from certificados.modelo import get_modelo
+            pdf = get_modelo().preencher(nome_aluno, nome_curso, carga_horaria, self.codigo)
+        else:
+            pdf = self._montar_pdf(nome_aluno, nome_curso, carga_horaria)
+
+        pdf.output(self.caminho)
+        return self.caminho
 
+    def _montar_pdf(self, nome_aluno: str, nome_curso: str, carga_horaria: str) -> "FPDF":
+        """Monta o documento inteiro do zero (caminho sem modelo)"""
+        from fpdf import FPDF
+        from certificados.modelo import texto_certificado
         pdf = FPDF()
         pdf.add_page()
         
@@ -60,24 +82,23 @@ class Certificado:
         
         pdf.set_font("Arial", size=16)
         pdf.set_text_color(0, 0, 0)
-        pdf.multi_cell(0, 10, 
-            f"Certificamos que {nome_aluno} concluiu com êxito o curso "
-            f"'{nome_curso}' com carga horária de {carga_horaria}.\n\n"
-            f"Data de emissão: {datetime.now().strftime('%d/%m/%Y')}\n\n"
-            f"Código de validação: {self.codigo}",
+        pdf.multi_cell(0, 10, texto_certificado(nome_aluno, nome_curso, carga_horaria, self.codigo),
             align='C')
         
+        pdf.set_auto_page_break(False)  # Senão o rodapé (y+10 no limite da margem) vai para a página 2
         pdf.set_y(-30)
         pdf.set_font("Arial", style='I', size=12)
         pdf.cell(0, 10, txt="Este certificado pode ser validado em nossa plataforma", ln=True, align='C')
-        
-        pdf.output(self.caminho)
-        return self.caminho
+        return pdf
 
     def _gerar_codigo(self, nome_aluno: str, nome_curso: str):
         """Cria um código único baseado em hash"""
+        self.codigo = Certificado.novo_codigo(nome_aluno, nome_curso)
+
+    @staticmethod
+    def novo_codigo(nome_aluno: str, nome_curso: str) -> str:
         base = f"{nome_aluno}{nome_curso}{datetime.now()}"
-        self.codigo = "CERT-" + hashlib.sha256(base.encode()).hexdigest()[:12].upper()
+        return "CERT-" + hashlib.sha256(base.encode()).hexdigest()[:12].upper()
 
 # ========== FUNÇÕES PRINCIPAIS ==========
 def tela_certificados():
@@ -91,6 +112,10 @@ def tela_certificados():
         print(f"\n{COR_TITULO}=== MEUS CERTIFICADOS ===")
         print(f"{COR_MENU}1. 🖨️ Gerar certificado")
         print("2. 📂 Ver meus certificados")
+        print("3. ✅ Validar certificado")
+        if usuario.get('is_admin'):
+            print("4. 📦 Emitir em lote (ADM)")
+            print("5. 📑 Validar arquivo de códigos (ADM)")
         print(f"0. ↩ Voltar{RESET_COR}")
         print("="*40)
         
@@ -100,6 +125,15 @@ def tela_certificados():
             gerar_certificado_menu()
         elif escolha == '2':
             listar_certificados()
+        elif escolha == '3':
+            from certificados.validacao import tela_validar_certificado
+            tela_validar_certificado()
+        elif escolha == '4' and usuario.get('is_admin'):
+            from certificados.lote import tela_emissao_lote
+            tela_emissao_lote()
+        elif escolha == '5' and usuario.get('is_admin'):
+            from certificados.validacao import tela_validar_arquivo
+            tela_validar_arquivo()
         elif escolha == '0':
             break
         else:
@@ -130,43 +164,67 @@ def gerar_certificado_menu():
     
     id_curso = input("\nDigite o ID do curso: ").strip()
     
-    if id_curso not in cursos:
-        print(f"{COR_ERRO}❌ Curso inválido!{RESET_COR}")
-        return
-    
-    if not verificar_conclusao(usuario['nome'], id_curso):
-        print(f"{COR_ERRO}❌ Você não concluiu este curso!{RESET_COR}")
-        return
-    
     try:
-        cert = Certificado()
-        caminho = cert.gerar(
-            nome_aluno=usuario['nome'],
-            nome_curso=cursos[id_curso]['nome'],
-            carga_horaria=cursos[id_curso]['carga_horaria']
-        )
-        
-        if 'certificados' not in usuario_data:
-            usuario_data['certificados'] = []
-            
-        usuario_data['certificados'].append({
-            'curso': id_curso,
-            'codigo': cert.codigo,
-            'data': datetime.now().isoformat(),
-            'caminho': caminho
-        })
-        
-        # Atualiza no arquivo JSON
-        from usuarios.usuarios import salvar_usuarios
-        salvar_usuarios()
-        
-        registrar_log("Certificado emitido", f"Curso: {id_curso}")
+        emitido = emitir_certificado(usuario['nome'], id_curso)
         print(f"\n{COR_SUCESSO}✅ Certificado gerado com sucesso!{RESET_COR}")
-        print(f"{COR_MENU}Caminho: {caminho}{RESET_COR}")
-        
+        print(f"{COR_MENU}Caminho: {emitido['caminho']}{RESET_COR}")
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
     except Exception as e:
         print(f"{COR_ERRO}❌ Erro ao gerar certificado: {e}{RESET_COR}")
 
+def emitir_certificado(nome_aluno: str, id_curso: str) -> dict:
+    """Gera o PDF, grava no aluno e no registro de validação (sem input).
+
+    Levanta ValueError se o curso não existe, não tem módulos, o aluno não
+    está matriculado nele ou ainda não o concluiu (as mesmas regras do menu),
+    ou se a gravação no aluno esbarrou em outro terminal.
+    """
+    cursos = get_cursos_disponiveis()
+    usuarios = get_usuarios_cadastrados()
+    if nome_aluno not in usuarios:
+        raise ValueError("Usuário não encontrado!")
+    if id_curso not in cursos:
+        raise ValueError("Curso inválido!")
+    if id_curso not in usuarios[nome_aluno].get('cursos', []):
+        raise ValueError(f"{nome_aluno} não está matriculado neste curso!")
+    if not cursos[id_curso].get('modulos'):
+        raise ValueError("Este curso ainda não tem módulos para concluir!")
+    if not verificar_conclusao(nome_aluno, id_curso):
+        raise ValueError(f"{nome_aluno} não concluiu este curso!")
+
+    cert = Certificado()
+    caminho = cert.gerar(
+        nome_aluno=nome_aluno,
+        nome_curso=cursos[id_curso]['nome'],
+        carga_horaria=cursos[id_curso]['carga_horaria']
+    )
+    emitido = {
+        'curso': id_curso,
+        'codigo': cert.codigo,
+        'data': datetime.now().isoformat(),
+        'caminho': caminho
+    }
+    registro = usuarios[nome_aluno]
+    registro.setdefault('certificados', []).append(emitido)
+
+    # Grava já (só o registro deste usuário): o código só entra no registro de
+    # validação se estiver gravado no aluno, como em lote.py
+    from usuarios.usuarios import salvar_usuario
+    if not salvar_usuario(nome_aluno, imediato=True):
+        if get_usuarios_cadastrados().get(nome_aluno) is registro:  # Em conflito já é a versão do disco
+            registro['certificados'].remove(emitido)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        registrar_log("Falha na emissão de certificado",
+                      f"Curso: {id_curso} | conflito com outro terminal")
+        raise ValueError("Certificado não gravado: dados alterados em outro terminal!")
+    from certificados.validacao import registrar_emissao
+    registrar_emissao(nome_aluno, [emitido])
+
+    registrar_log("Certificado emitido", f"Curso: {id_curso}")
+    return emitido
+
 def listar_certificados():
     """Lista todos os certificados do usuário"""
     usuario = get_usuario_logado()
@@ -193,14 +251,6 @@ def listar_certificados():
 
 # ========== FUNÇÃO AUXILIAR ==========
 def verificar_conclusao(id_aluno: str, id_curso: str) -> bool:
-    """Verifica se o aluno concluiu o curso (IMPLEMENTE SUA LÓGICA AQUI)"""
-    # Exemplo simplificado - adapte para seu sistema
-    dados = get_usuarios_cadastrados()
-    cursos = get_cursos_disponiveis()
-    
-    if id_aluno not in dados or id_curso not in cursos:
-        return False
-    
-    # Verifica se completou todos os módulos
-    modulos_concluidos = dados[id_aluno].get('modulos_concluidos', {}).get(id_curso, [])
-    return len(modulos_concluidos) == len(cursos[id_curso].get('modulos', []))
\ No newline at end of file
+    """Verifica se o aluno concluiu todos os módulos do curso (modulos/progresso.py)"""
+    from modulos.progresso import curso_concluido
+    return curso_concluido(id_aluno, id_curso, get_usuarios_cadastrados())
\ No newline at end of file
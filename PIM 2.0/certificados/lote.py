@@ -0,0 +1,188 @@
+# certificados/lote.py
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+
+from modulos.progresso import curso_concluido
+from metricas.metricas import cronometrar
+from certificados.certificados import (
+    Certificado, PASTA_CERTIFICADOS,
+    get_usuarios_cadastrados, get_cursos_disponiveis, registrar_log,
+    COR_TITULO, COR_MENU, COR_SUCESSO, COR_ERRO, COR_ALERTA, RESET_COR
+)
+
+
+# ========== CONFIGURAÇÕES ==========
+PROCESSOS = os.cpu_count() or 1
+
+
+def caminho_checkpoint(id_curso: str) -> str:
+    return os.path.join(PASTA_CERTIFICADOS, f"lote_{id_curso}.checkpoint.jsonl")
+
+
+# ========== SELEÇÃO ==========
+def selecionar_aptos(id_curso: str) -> List[str]:
+    """Alunos matriculados que concluíram o curso e ainda não têm certificado dele"""
+    from usuarios.usuarios import get_indices
+    aptos = []
+    usuarios = get_usuarios_cadastrados()
+    for nome in get_indices().alunos_do_curso(id_curso):  # Só a turma, não todos os usuários
+        dados = usuarios.get(nome)
+        if dados is None or dados.get("is_admin"):
+            continue
+        if any(c["curso"] == id_curso for c in dados.get("certificados", [])):
+            continue
+        if curso_concluido(nome, id_curso, usuarios):  # O(1) por aluno
+            aptos.append(nome)
+    return aptos
+
+
+# ========== CHECKPOINT ==========
+def ler_checkpoint(id_curso: str) -> Dict[str, Dict]:
+    """Certificados já renderizados numa execução interrompida, por aluno"""
+    feitos = {}
+    caminho = caminho_checkpoint(id_curso)
+    if os.path.exists(caminho):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # Linha cortada pela interrupção
+                feitos[registro["aluno"]] = registro
+    return feitos
+
+
+# ========== RENDERIZAÇÃO ==========
+def _renderizar(tarefa: Dict) -> Dict:
+    """Roda nos processos filhos: gera um PDF com o código já definido"""
+    cert = Certificado()
+    caminho = cert.gerar(tarefa["aluno"], tarefa["nome_curso"], tarefa["carga_horaria"],
+                         codigo=tarefa["codigo"])
+    return {"aluno": tarefa["aluno"], "curso": tarefa["curso"], "codigo": cert.codigo,
+            "data": datetime.now().isoformat(), "caminho": caminho}
+
+
+@cronometrar("certificados.emitir_lote")
+def emitir_lote(id_curso: str, processos: int = PROCESSOS, mostrar_progresso: bool = True) -> Dict:
+    """Emite os certificados de todos os aptos do curso.
+
+    Cada PDF pronto vai para o checkpoint na hora; se a execução cair, a
+    próxima pula quem já foi renderizado. No final todos os certificados
+    entram nos usuários com uma única gravação do armazenamento; se ela
+    falhar (conflito com outro terminal), nada vai para o registro de
+    validação e o checkpoint fica para a próxima execução gravar os mesmos
+    códigos (`gravado` False no resultado).
+    """
+    curso = get_cursos_disponiveis()[id_curso]
+    feitos = ler_checkpoint(id_curso)
+    pendentes = [nome for nome in selecionar_aptos(id_curso) if nome not in feitos]
+    total = len(feitos) + len(pendentes)
+    falhas = []
+    gravado = True
+
+    if pendentes:
+        tarefas = [{
+            "aluno": nome,
+            "curso": id_curso,
+            "nome_curso": curso["nome"],
+            "carga_horaria": curso["carga_horaria"],
+            "codigo": Certificado.novo_codigo(nome, curso["nome"]),
+        } for nome in pendentes]
+
+        os.makedirs(PASTA_CERTIFICADOS, exist_ok=True)
+        with open(caminho_checkpoint(id_curso), 'a', encoding='utf-8') as checkpoint, \
+                ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = {executor.submit(_renderizar, t): t["aluno"] for t in tarefas}
+            passo = max(1, total // 100)  # Atualiza a barra a cada ~1%
+            for futuro in as_completed(futuros):
+                try:
+                    registro = futuro.result()
+                except Exception as e:
+                    falhas.append({"aluno": futuros[futuro], "erro": str(e)})
+                    continue
+                feitos[registro["aluno"]] = registro
+                checkpoint.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                if mostrar_progresso and (len(feitos) == total or len(feitos) % passo == 0):
+                    pct = len(feitos) * 100 // total
+                    print(f"\r{COR_MENU}🖨️ {len(feitos)}/{total} ({pct}%){RESET_COR}", end="", flush=True)
+        if mostrar_progresso:
+            print()
+
+    if feitos:
+        from usuarios.usuarios import salvar_usuarios_lote
+        from certificados.validacao import get_registro
+        usuarios = get_usuarios_cadastrados()
+        novos, alunos = [], []
+        for registro in feitos.values():
+            if registro["aluno"] not in usuarios:
+                continue
+            alunos.append(registro["aluno"])
+            certificados = usuarios[registro["aluno"]].setdefault("certificados", [])
+            if not any(c["codigo"] == registro["codigo"] for c in certificados):  # Senão já estava lá
+                certificados.append({
+                    "curso": registro["curso"],
+                    "codigo": registro["codigo"],
+                    "data": registro["data"],
+                    "caminho": registro["caminho"],
+                })
+            # Todos do checkpoint (o registro aceita repetidos): uma execução que
+            # parou antes de chegar ao registro é completada por esta
+            novos.append({"codigo": registro["codigo"], "usuario": registro["aluno"],
+                          "id_curso": registro["curso"], "data": registro["data"],
+                          "caminho": registro["caminho"]})
+        gravado = salvar_usuarios_lote(alunos)
+        if gravado:
+            get_registro().registrar_certificados(novos)
+            registrar_log("Certificados emitidos em lote",
+                          f"Curso: {id_curso} | Total: {len(feitos)} | Falhas: {len(falhas)}")
+        else:
+            # Tira da memória o que não chegou ao armazenamento (os conflitantes já foram relidos)
+            codigos = {registro["codigo"] for registro in feitos.values()}
+            usuarios = get_usuarios_cadastrados()
+            for nome in {registro["aluno"] for registro in feitos.values()} & usuarios.keys():
+                dados = usuarios[nome]
+                if any(c["codigo"] in codigos for c in dados.get("certificados", [])):
+                    dados["certificados"] = [c for c in dados["certificados"] if c["codigo"] not in codigos]
+            registrar_log("Falha na emissão em lote",
+                          f"Curso: {id_curso} | {len(feitos)} certificado(s) não gravado(s): "
+                          f"conflito com outro terminal; checkpoint mantido")
+
+    # Os prontos já estão no armazenamento; as falhas voltam a ser aptas na próxima vez
+    if gravado and os.path.exists(caminho_checkpoint(id_curso)):
+        os.remove(caminho_checkpoint(id_curso))
+    return {"emitidos": len(feitos) if gravado else 0, "falhas": falhas, "gravado": gravado,
+            "pendentes": 0 if gravado else len(feitos)}
+
+
+# ========== INTERFACE ==========
+def tela_emissao_lote():
+    """Emissão em lote para um curso inteiro (ADM)"""
+    cursos = get_cursos_disponiveis()
+    print(f"\n{COR_TITULO}=== EMISSÃO EM LOTE ===")
+    for id_curso, curso in cursos.items():
+        print(f"- {id_curso}: {curso['nome']} ({curso['carga_horaria']})")
+
+    id_curso = input("\nDigite o ID do curso: ").strip()
+    if id_curso not in cursos:
+        print(f"{COR_ERRO}❌ Curso inválido!{RESET_COR}")
+        return
+
+    if os.path.exists(caminho_checkpoint(id_curso)):
+        print(f"{COR_ALERTA}⚠️ Retomando emissão interrompida ({len(ler_checkpoint(id_curso))} já prontos){RESET_COR}")
+
+    resultado = emitir_lote(id_curso)
+    if not resultado["gravado"]:
+        print(f"\n{COR_ERRO}❌ {resultado['pendentes']} certificado(s) gerado(s), mas não gravado(s): "
+              f"dados alterados em outro terminal.{RESET_COR}")
+        print(f"{COR_ALERTA}⚠️ O checkpoint foi mantido; rode de novo para gravar os mesmos "
+              f"códigos.{RESET_COR}")
+    else:
+        print(f"\n{COR_SUCESSO}✅ {resultado['emitidos']} certificado(s) emitido(s)!{RESET_COR}")
+    if resultado["falhas"]:
+        print(f"{COR_ERRO}❌ {len(resultado['falhas'])} falha(s); rode de novo para tentar só esses:{RESET_COR}")
+        for falha in resultado["falhas"][:10]:
+            print(f"   - {falha['aluno']}: {falha['erro']}")
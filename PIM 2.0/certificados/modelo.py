@@ -0,0 +1,157 @@
+# certificados/modelo.py
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from fpdf import FPDF
+
+
+# ========== CONFIGURAÇÕES ==========
+VERSAO_MODELO = 2  # Aumente ao mudar o layout fixo para invalidar o cache
+FONTE = "Arial"
+COR_CABECALHO = (10, 50, 150)
+COR_TEXTO = (0, 0, 0)
+ALTURA_CABECALHO = 40  # Mesmas medidas de Certificado._montar_pdf: cell(0, 40), ln(20),
+ESPACO_CABECALHO = 20  # multi_cell(0, 10) no corpo e rodapé com set_y(-30) e cell(0, 10)
+ALTURA_LINHA = 10
+ALTURA_RODAPE = 30
+RODAPE = "Este certificado pode ser validado em nossa plataforma"
+
+
+def texto_certificado(nome_aluno: str, nome_curso: str, carga_horaria: str, codigo: str) -> str:
+    """Texto variável do corpo do certificado"""
+    return (
+        f"Certificamos que {nome_aluno} concluiu com êxito o curso "
+        f"'{nome_curso}' com carga horária de {carga_horaria}.\n\n"
+        f"Data de emissão: {datetime.now().strftime('%d/%m/%Y')}\n\n"
+        f"Código de validação: {codigo}"
+    )
+
+
+# Cada item do layout: (estilo, tamanho, cor, x, y, texto)
+Linha = Tuple[str, int, Tuple[int, int, int], float, float, str]
+Palavra = Tuple[str, float]  # (palavra, largura em mm)
+
+
+class ModeloCertificado:
+    """Layout do certificado calculado uma vez por curso/versão.
+
+    Montar com cell/multi_cell mede e quebra o texto inteiro a cada emissão.
+    Aqui o cabeçalho e o rodapé têm fonte e posição calculadas só na
+    primeira vez, e as palavras fixas do corpo (o curso e a carga horária)
+    já vêm medidas; cada certificado mede só o nome do aluno, quebra o
+    parágrafo como o multi_cell quebraria e escreve as linhas com `text()`.
+    O resultado tem a mesma tipografia de `Certificado._montar_pdf`.
+    """
+
+    def __init__(self, versao: int = VERSAO_MODELO):
+        self.versao = versao
+        self._layouts: Dict[Tuple[str, str, int], Dict] = {}
+        self._trava = threading.Lock()
+
+    # ========== LAYOUT FIXO ==========
+    def _montar_layout(self, nome_curso: str, carga_horaria: str) -> Dict:
+        pdf = FPDF()
+        pdf.add_page()
+        fixas: List[Linha] = []
+
+        def base(topo, altura):
+            """Linha de base do texto numa cell() de `altura` começando em `topo`"""
+            return topo + altura / 2 + 0.3 * pdf.font_size
+
+        def centralizada(texto, topo, altura, tamanho, estilo="", cor=COR_TEXTO):
+            pdf.set_font(FONTE, estilo, tamanho)
+            x = (pdf.w - pdf.get_string_width(texto)) / 2
+            fixas.append((estilo, tamanho, cor, x, base(topo, altura), texto))
+
+        centralizada("CERTIFICADO", pdf.t_margin, ALTURA_CABECALHO, 24, cor=COR_CABECALHO)
+        centralizada(RODAPE, pdf.h - ALTURA_RODAPE, ALTURA_LINHA, 12, estilo="I")
+
+        pdf.set_font(FONTE, "", 16)
+        def medir(texto) -> List[Palavra]:
+            return [(palavra, pdf.get_string_width(palavra)) for palavra in texto.split(" ")]
+
+        return {
+            "fixas": fixas,
+            "antes": medir("Certificamos que"),
+            "depois": medir(f"concluiu com êxito o curso '{nome_curso}' com carga horária de {carga_horaria}."),
+            "espaco": pdf.get_string_width(" "),
+            # Largura em que o multi_cell(0, ...) quebra: a da página menos margens e c_margin
+            "largura_max": pdf.w - pdf.l_margin - pdf.r_margin - 2 * pdf.c_margin,
+            "topo_corpo": pdf.t_margin + ALTURA_CABECALHO + ESPACO_CABECALHO,
+            "base_corpo": base(0, ALTURA_LINHA),
+        }
+
+    def layout(self, nome_curso: str, carga_horaria: str) -> Dict:
+        chave = (nome_curso, carga_horaria, self.versao)
+        with self._trava:
+            if chave not in self._layouts:
+                self._layouts[chave] = self._montar_layout(nome_curso, carga_horaria)
+            return self._layouts[chave]
+
+    # ========== EMISSÃO ==========
+    @staticmethod
+    def _quebrar(palavras: List[Palavra], espaco: float, largura_max: float) -> List[Tuple[str, float]]:
+        """(linha, largura) com a mesma quebra por espaços do multi_cell"""
+        linhas: List[Tuple[str, float]] = []
+        atual: List[str] = []
+        largura = 0.0
+        for palavra, medida in palavras:
+            if atual and largura + espaco + medida > largura_max:
+                linhas.append((" ".join(atual), largura))
+                atual, largura = [], 0.0
+            largura += (espaco if atual else 0.0) + medida
+            atual.append(palavra)
+        return linhas + [(" ".join(atual), largura)]
+
+    def preencher(self, nome_aluno: str, nome_curso: str, carga_horaria: str, codigo: str) -> FPDF:
+        """PDF pronto para salvar: linhas fixas em cache + corpo com o aluno"""
+        layout = self.layout(nome_curso, carga_horaria)
+        pdf = FPDF()
+        pdf.add_page()
+
+        fonte_atual = cor_atual = None
+        for estilo, tamanho, cor, x, y, texto in layout["fixas"]:
+            if (estilo, tamanho) != fonte_atual:
+                pdf.set_font(FONTE, estilo, tamanho)
+                fonte_atual = (estilo, tamanho)
+            if cor != cor_atual:
+                pdf.set_text_color(*cor)
+                cor_atual = cor
+            pdf.text(x, y, texto)
+
+        pdf.set_font(FONTE, "", 16)
+        pdf.set_text_color(*COR_TEXTO)
+        nome = [(palavra, pdf.get_string_width(palavra)) for palavra in nome_aluno.split(" ")]
+        palavras = layout["antes"] + nome + layout["depois"]
+        if any(medida > layout["largura_max"] for _, medida in palavras):
+            # Palavra maior que a linha: o multi_cell a parte no meio; deixa com ele
+            pdf.set_xy(pdf.l_margin, layout["topo_corpo"])
+            pdf.multi_cell(0, ALTURA_LINHA, texto_certificado(nome_aluno, nome_curso, carga_horaria, codigo),
+                           align='C')
+            return pdf
+
+        linhas = self._quebrar(palavras, layout["espaco"], layout["largura_max"])
+        for texto in ("", f"Data de emissão: {datetime.now().strftime('%d/%m/%Y')}",
+                      "", f"Código de validação: {codigo}"):
+            linhas.append((texto, pdf.get_string_width(texto) if texto else 0.0))
+        y = layout["topo_corpo"] + layout["base_corpo"]
+        for texto, largura in linhas:
+            if texto:
+                pdf.text((pdf.w - largura) / 2, y, texto)
+            y += ALTURA_LINHA
+        return pdf
+
+    def limpar_cache(self):
+        with self._trava:
+            self._layouts.clear()
+
+
+# ========== ACESSO GLOBAL ==========
+_modelo = None
+
+def get_modelo() -> ModeloCertificado:
+    global _modelo
+    if _modelo is None:
+        _modelo = ModeloCertificado()
+    return _modelo
@@ -0,0 +1,151 @@
+# certificados/validacao.py
+import csv
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from repositorio.repositorio import ESQUEMA_CERTIFICADOS, RepositorioSQLite, get_repositorio
+from certificados.certificados import (
+    get_usuarios_cadastrados, get_cursos_disponiveis, registrar_log,
+    COR_TITULO, COR_MENU, COR_SUCESSO, COR_ERRO, COR_USUARIO, RESET_COR
+)
+
+
+# ========== CONFIGURAÇÕES ==========
+ARQUIVO_REGISTRO = "registro_certificados.db"
+TAMANHO_LOTE_VALIDACAO = 500
+
+
+# ========== REGISTRO ==========
+_registro = None
+
+def get_registro() -> RepositorioSQLite:
+    """Registro de certificados indexado pelo código CERT-….
+
+    No modo "sqlite" é a própria tabela de certificados do repositório; nos
+    outros modos é um banco à parte (só com essa tabela), preenchido na
+    primeira abertura com os certificados que já estão nos usuários.
+
+    Nos dois casos um código vale enquanto o aluno existir: remover o
+    usuário apaga os certificados dele (`revogar_certificados`).
+    """
+    global _registro
+    if _registro is None:
+        from usuarios.usuarios import MODO_ARMAZENAMENTO
+        if MODO_ARMAZENAMENTO == "sqlite":
+            _registro = get_repositorio()
+        else:
+            _registro = RepositorioSQLite(ARQUIVO_REGISTRO, esquema=ESQUEMA_CERTIFICADOS)
+            if _registro.contar_certificados() == 0:
+                reconstruir_registro(_registro)
+    return _registro
+
+def reconstruir_registro(registro: RepositorioSQLite) -> int:
+    """Copia para o registro todos os certificados gravados nos usuários"""
+    certificados = [
+        {"codigo": c["codigo"], "usuario": nome, "id_curso": c["curso"],
+         "data": c.get("data"), "caminho": c.get("caminho")}
+        for nome, dados in get_usuarios_cadastrados().items()
+        for c in dados.get("certificados", [])
+    ]
+    if certificados:
+        registro.registrar_certificados(certificados)
+    return len(certificados)
+
+def registrar_emissao(usuario: str, certificados: Iterable[Dict]):
+    """Inclui certificados recém-emitidos (formato da lista do usuário) no registro"""
+    get_registro().registrar_certificados([
+        {"codigo": c["codigo"], "usuario": usuario, "id_curso": c["curso"],
+         "data": c.get("data"), "caminho": c.get("caminho")}
+        for c in certificados
+    ])
+
+def revogar_certificados(usuario: str) -> int:
+    """Tira do registro os certificados de um usuário removido (no modo "sqlite"
+    o próprio `remover_usuario` do repositório já apaga)"""
+    if _registro is None and not os.path.exists(ARQUIVO_REGISTRO):
+        return 0  # Ainda não existe: será montado só com os usuários atuais
+    return get_registro().remover_certificados(usuario)
+
+
+# ========== VALIDAÇÃO ==========
+def _descrever(registro: Dict) -> Dict:
+    cursos = get_cursos_disponiveis()
+    curso = cursos[registro["id_curso"]]["nome"] if registro["id_curso"] in cursos else "Curso Removido"
+    return {
+        "codigo": registro["codigo"],
+        "aluno": registro["usuario"],
+        "curso": curso,
+        "data": (registro["data"] or "")[:10],
+        "caminho": registro["caminho"],
+    }
+
+def validar_codigo(codigo: str) -> Optional[Dict]:
+    """Dados do certificado, ou None se o código não existe (consulta pela chave)"""
+    registro = get_registro().buscar_certificado(codigo.strip().upper())
+    return _descrever(registro) if registro else None
+
+def validar_arquivo(entrada: str, saida: str) -> Tuple[int, int]:
+    """Valida um arquivo com um código por linha e grava o resultado em CSV.
+
+    Lê e consulta em lotes, então o arquivo pode ter milhares de códigos
+    sem ser carregado inteiro.
+    """
+    validos = invalidos = 0
+    with open(entrada, 'r', encoding='utf-8') as origem, \
+            open(saida, 'w', encoding='utf-8', newline='') as destino:
+        escritor = csv.writer(destino)
+        escritor.writerow(["codigo", "valido", "aluno", "curso", "data"])
+        lote: List[str] = []
+
+        def processar():
+            nonlocal validos, invalidos
+            encontrados = get_registro().buscar_certificados(lote)
+            for codigo in lote:
+                if codigo in encontrados:
+                    info = _descrever(encontrados[codigo])
+                    escritor.writerow([codigo, "sim", info["aluno"], info["curso"], info["data"]])
+                    validos += 1
+                else:
+                    escritor.writerow([codigo, "nao", "", "", ""])
+                    invalidos += 1
+
+        for linha in origem:
+            codigo = linha.strip().upper()
+            if not codigo:
+                continue
+            lote.append(codigo)
+            if len(lote) >= TAMANHO_LOTE_VALIDACAO:
+                processar()
+                lote = []
+        if lote:
+            processar()
+    return validos, invalidos
+
+
+# ========== INTERFACE ==========
+def tela_validar_certificado():
+    """Consulta de um código de validação"""
+    print(f"\n{COR_TITULO}=== VALIDAR CERTIFICADO ===")
+    codigo = input("Código de validação (CERT-...): ").strip()
+    info = validar_codigo(codigo) if codigo else None
+    if not info:
+        print(f"{COR_ERRO}❌ Certificado não encontrado!{RESET_COR}")
+        return
+    print(f"{COR_SUCESSO}✅ Certificado válido{RESET_COR}")
+    print(f"{COR_USUARIO}   Aluno: {info['aluno']}")
+    print(f"   Curso: {info['curso']}")
+    print(f"   Emissão: {info['data']}{RESET_COR}")
+
+def tela_validar_arquivo():
+    """Validação em massa de um arquivo de códigos (ADM)"""
+    print(f"\n{COR_TITULO}=== VALIDAÇÃO EM MASSA ===")
+    entrada = input("Arquivo com os códigos (um por linha): ").strip()
+    saida = input(f"Arquivo de resultado [{entrada}.resultado.csv]: ").strip() or f"{entrada}.resultado.csv"
+    try:
+        validos, invalidos = validar_arquivo(entrada, saida)
+    except OSError as e:
+        print(f"{COR_ERRO}❌ Erro ao ler/gravar arquivo: {e}{RESET_COR}")
+        return
+    registrar_log("Validação em massa", f"Arquivo: {entrada} | Válidos: {validos} | Inválidos: {invalidos}")
+    print(f"{COR_SUCESSO}✅ {validos} válido(s), {invalidos} inválido(s){RESET_COR}")
+    print(f"{COR_MENU}Resultado: {saida}{RESET_COR}")
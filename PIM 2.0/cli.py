@@ -0,0 +1,327 @@
+# cli.py
+"""Linha de comando sem menus: cada operação vira um subcomando com saída JSON.
+
+Uso (na pasta do projeto):
+    python main.py usuario criar --nome ana_1 --email ana@x.com --idade 20 --senha 'Senha@123'
+    python main.py usuario listar --perfil aluno [--dias 7 | --desde 2025-01-31]
+    python main.py curso criar --nome "Python" --carga 40h
+    python main.py modulo adicionar --curso 3 --nome "Introdução"
+    python main.py matricula --usuario ana_1 --curso 3 [--cancelar]
+    python main.py progresso --usuario ana_1 --curso 3 --modulo 1 [--aula 2] [--desmarcar]
+    python main.py curso alunos --id 3
+    python main.py curso buscar --termos "seguranca redes" [--limite 10]
+    python main.py certificado validar --codigo CERT-...
+
+Com --lote, os parâmetros vêm da entrada padrão, um objeto JSON por linha
+(ex.: {"nome": "ana_1", "email": "...", "idade": 20, "senha": "..."}), e a
+saída é uma linha JSON por entrada. Nenhum input() é chamado; as mensagens
+das funções do sistema vão para stderr, então stdout só tem JSON.
+Código de saída: 0 se tudo deu certo, 1 se alguma operação falhou.
+"""
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+
+# ========== OPERAÇÕES ==========
+def _obrigatorio(p: Dict, *campos: str):
+    faltando = [c for c in campos if p.get(c) in (None, "")]
+    if faltando:
+        raise ValueError(f"Parâmetro obrigatório: {', '.join(faltando)}")
+
+def _indice_modulo(p: Dict) -> int:
+    """--modulo é o número mostrado no menu (1 = primeiro)"""
+    try:
+        return int(p["modulo"]) - 1
+    except (TypeError, ValueError):
+        raise ValueError("Número do módulo inválido") from None
+
+def usuario_criar(p: Dict) -> Dict:
+    from usuarios.usuarios import cadastrar_usuario
+    _obrigatorio(p, "nome", "email", "idade", "senha")
+    dados = cadastrar_usuario(p["nome"], p["email"], p["idade"], p["senha"],
+                              bool(p.get("admin")), imediato=not p["lote"])
+    return {"usuario": p["nome"], "is_admin": dados["is_admin"]}
+
+def usuario_remover(p: Dict) -> Dict:
+    from usuarios.usuarios import excluir_usuario
+    _obrigatorio(p, "nome")
+    excluir_usuario(p["nome"])
+    return {"usuario": p["nome"]}
+
+def _inicio_periodo(p: Dict) -> Optional[datetime]:
+    """--dias N (últimos N dias) ou --desde AAAA-MM-DD[THH:MM]"""
+    if p.get("dias") is not None:
+        return datetime.now() - timedelta(days=int(p["dias"]))
+    if p.get("desde"):
+        try:
+            return datetime.fromisoformat(p["desde"])
+        except ValueError:
+            raise ValueError("Data inválida! Formato: AAAA-MM-DD") from None
+    return None
+
+def usuario_listar(p: Dict) -> Dict:
+    from usuarios.usuarios import get_indices, get_usuarios_cadastrados
+    perfil, inicio = p.get("perfil"), _inicio_periodo(p)
+    if perfil or inicio:  # Filtros respondidos pelos índices, sem percorrer todos os usuários
+        indices = get_indices()
+        nomes = indices.cadastrados_entre(inicio) if inicio else None
+        if perfil:
+            do_perfil = indices.nomes_por_perfil(perfil == "admin")
+            if nomes is not None:
+                do_perfil = set(do_perfil)
+                do_perfil = [nome for nome in nomes if nome in do_perfil]
+            nomes = do_perfil
+        cadastrados = get_usuarios_cadastrados()
+        registros = ((nome, cadastrados.get(nome)) for nome in nomes)
+    else:
+        registros = get_usuarios_cadastrados().items()
+    usuarios = [
+        {"usuario": nome, "email": dados["email"], "idade": dados["idade"],
+         "is_admin": dados["is_admin"], "data_cadastro": dados["data_cadastro"],
+         "cursos": list(dados.get("cursos", []))}
+        for nome, dados in registros if dados is not None
+    ]
+    return {"total": len(usuarios), "usuarios": usuarios}
+
+def curso_criar(p: Dict) -> Dict:
+    from cursos.cursos import cadastrar_curso
+    _obrigatorio(p, "nome", "carga")
+    return {"id": cadastrar_curso(p["nome"], p["carga"])}
+
+def curso_editar(p: Dict) -> Dict:
+    from cursos.cursos import atualizar_curso
+    _obrigatorio(p, "id")
+    curso = atualizar_curso(str(p["id"]), p.get("nome") or "", p.get("carga") or "")
+    return {"id": str(p["id"]), "nome": curso["nome"], "carga_horaria": curso["carga_horaria"]}
+
+def curso_listar(p: Dict) -> Dict:
+    from cursos.cursos import cursos_disponiveis
+    cursos = [
+        {"id": id_curso, "nome": curso["nome"], "carga_horaria": curso["carga_horaria"],
+         "criado_por": curso["criado_por"], "data_criacao": curso["data_criacao"],
+         "modulos": [m["nome"] for m in curso["modulos"]]}
+        for id_curso, curso in cursos_disponiveis.items()
+    ]
+    return {"total": len(cursos), "cursos": cursos}
+
+def modulo_adicionar(p: Dict) -> Dict:
+    from modulos.modulos import incluir_modulo
+    _obrigatorio(p, "curso", "nome")
+    modulo = incluir_modulo(str(p["curso"]), p["nome"])
+    return {"curso": str(p["curso"]), "id": modulo["id"], "nome": modulo["nome"]}
+
+def modulo_editar(p: Dict) -> Dict:
+    from modulos.modulos import renomear_modulo
+    _obrigatorio(p, "curso", "modulo", "nome")
+    modulo = renomear_modulo(str(p["curso"]), _indice_modulo(p), p["nome"])
+    return {"curso": str(p["curso"]), "id": modulo.get("id"), "nome": modulo["nome"]}
+
+def modulo_remover(p: Dict) -> Dict:
+    from modulos.modulos import excluir_modulo
+    _obrigatorio(p, "curso", "modulo")
+    modulo = excluir_modulo(str(p["curso"]), _indice_modulo(p))
+    return {"curso": str(p["curso"]), "id": modulo.get("id"), "nome": modulo["nome"]}
+
+def curso_buscar(p: Dict) -> Dict:
+    from cursos.cursos import buscar_catalogo
+    _obrigatorio(p, "termos")
+    resultados = buscar_catalogo(p["termos"], int(p.get("limite") or 20))
+    return {"total": len(resultados), "resultados": resultados}
+
+def curso_alunos(p: Dict) -> Dict:
+    from cursos.cursos import cursos_disponiveis, alunos_do_curso
+    _obrigatorio(p, "id")
+    id_curso = str(p["id"])
+    if id_curso not in cursos_disponiveis:
+        raise ValueError("Curso não encontrado!")
+    alunos = alunos_do_curso(id_curso)
+    return {"id": id_curso, "total": len(alunos), "alunos": alunos}
+
+def matricula(p: Dict) -> Dict:
+    from usuarios.usuarios import get_usuarios_cadastrados
+    from cursos.cursos import cursos_disponiveis, matricular_usuario, cancelar_matricula
+    _obrigatorio(p, "usuario", "curso")
+    nome, id_curso = p["usuario"], str(p["curso"])
+    if nome not in get_usuarios_cadastrados():
+        raise ValueError("Usuário não encontrado!")
+    if id_curso not in cursos_disponiveis:
+        raise ValueError("Curso não encontrado!")
+    if p.get("cancelar"):
+        return {"usuario": nome, "curso": id_curso, "cancelada": cancelar_matricula(nome, id_curso)}
+    return {"usuario": nome, "curso": id_curso, "nova": matricular_usuario(nome, id_curso)}
+
+def progresso(p: Dict) -> Dict:
+    from usuarios.usuarios import get_usuarios_cadastrados
+    from cursos.cursos import cursos_disponiveis
+    from modulos.progresso import mascara_curso, marcar_modulo, marcar_aula, percentual
+    _obrigatorio(p, "usuario", "curso", "modulo")
+    nome, id_curso = p["usuario"], str(p["curso"])
+    if nome not in get_usuarios_cadastrados():
+        raise ValueError("Usuário não encontrado!")
+    if id_curso not in cursos_disponiveis:
+        raise ValueError("Curso não encontrado!")
+    if id_curso not in get_usuarios_cadastrados()[nome].get("cursos", []):
+        raise ValueError(f"{nome} não está matriculado neste curso!")
+    mascara_curso(id_curso)  # Garante IDs nos módulos antigos
+    modulos = cursos_disponiveis[id_curso]["modulos"]
+    indice = _indice_modulo(p)
+    if not 0 <= indice < len(modulos):
+        raise ValueError("Módulo não encontrado!")
+    modulo, concluido = modulos[indice], not p.get("desmarcar")
+    resultado = {"usuario": nome, "curso": id_curso, "modulo": modulo["nome"]}
+    if p.get("aula") is None:
+        marcar_modulo(nome, id_curso, modulo["id"], concluido)
+        resultado["modulo_concluido"] = concluido
+    else:
+        try:
+            aula = int(p["aula"]) - 1
+        except (TypeError, ValueError):
+            raise ValueError("Número da aula inválido") from None
+        resultado["aula"] = aula + 1
+        resultado["modulo_concluido"] = marcar_aula(nome, id_curso, modulo["id"], aula, concluido)
+    resultado["percentual"] = round(percentual(nome, id_curso), 1)
+    return resultado
+
+def certificado_emitir(p: Dict) -> Dict:
+    from certificados.certificados import emitir_certificado
+    _obrigatorio(p, "usuario", "curso")
+    emitido = emitir_certificado(p["usuario"], str(p["curso"]))
+    return {"usuario": p["usuario"], **emitido}
+
+def certificado_validar(p: Dict) -> Dict:
+    from certificados.validacao import validar_codigo
+    _obrigatorio(p, "codigo")
+    info = validar_codigo(p["codigo"])
+    return {"codigo": p["codigo"].strip().upper(), "valido": info is not None, **(info or {})}
+
+
+# ========== EXECUÇÃO ==========
+def _executar(operacao: Callable[[Dict], Dict], parametros: Dict) -> Dict:
+    """Roda uma operação; qualquer erro vira {"ok": false, "erro": ...}"""
+    try:
+        with redirect_stdout(sys.stderr):  # Avisos das funções do sistema não sujam o JSON
+            return {"ok": True, **operacao(parametros)}
+    except ValueError as e:
+        return {"ok": False, "erro": str(e)}
+    except Exception as e:
+        return {"ok": False, "erro": f"{type(e).__name__}: {e}"}
+
+def _emitir(resultado: Dict):
+    print(json.dumps(resultado, ensure_ascii=False, default=str))
+
+def _finalizar() -> bool:
+    """Grava alterações adiadas e o log antes de sair; False se houve conflito"""
+    from usuarios.usuarios import gravar_pendentes, get_escritor_log
+    from repositorio.armazem_json import gravar_pendentes_todos
+    with redirect_stdout(sys.stderr):
+        ok = gravar_pendentes()
+        gravar_pendentes_todos()
+        get_escritor_log().descarregar()
+    return ok
+
+def executar_lote(operacao: Callable[[Dict], Dict], padrao: Dict, entrada=None) -> bool:
+    """Uma operação por linha JSON de `entrada` (stdin); devolve True se todas deram certo"""
+    sucesso = True
+    for numero, linha in enumerate(entrada or sys.stdin, 1):
+        if not linha.strip():
+            continue
+        try:
+            parametros = {**padrao, **json.loads(linha)}
+            resultado = _executar(operacao, parametros)
+        except (json.JSONDecodeError, TypeError) as e:
+            resultado = {"ok": False, "erro": f"JSON inválido: {e}"}
+        sucesso &= resultado["ok"]
+        _emitir({"linha": numero, **resultado})
+    return sucesso
+
+
+# ========== ARGUMENTOS ==========
+def _subcomando(grupo, nome: str, operacao: Callable, ajuda: str,
+                argumentos: List[tuple] = ()) -> argparse.ArgumentParser:
+    parser = grupo.add_parser(nome, help=ajuda)
+    for nomes, opcoes in argumentos:
+        parser.add_argument(*nomes, **opcoes)
+    parser.add_argument("--lote", action="store_true",
+                        help="lê os parâmetros da entrada padrão (um JSON por linha)")
+    parser.set_defaults(operacao=operacao)
+    return parser
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Operações da plataforma sem menus")
+    parser.add_argument("--operador", default="cli",
+                        help="nome gravado no log e em criado_por (padrão: cli)")
+    entidades = parser.add_subparsers(dest="entidade", required=True)
+
+    usuario = entidades.add_parser("usuario", help="contas").add_subparsers(dest="acao", required=True)
+    _subcomando(usuario, "criar", usuario_criar, "cadastra um usuário", [
+        (("--nome",), {}), (("--email",), {}), (("--idade",), {"type": int}),
+        (("--senha",), {}), (("--admin",), {"action": "store_true"})])
+    _subcomando(usuario, "remover", usuario_remover, "apaga um usuário", [(("--nome",), {})])
+    _subcomando(usuario, "listar", usuario_listar, "lista os usuários", [
+        (("--perfil",), {"choices": ["aluno", "admin"]}),
+        (("--dias",), {"type": int, "help": "só os cadastrados nos últimos N dias"}),
+        (("--desde",), {"help": "só os cadastrados a partir da data (AAAA-MM-DD)"})])
+
+    curso = entidades.add_parser("curso", help="cursos").add_subparsers(dest="acao", required=True)
+    _subcomando(curso, "criar", curso_criar, "cadastra um curso", [
+        (("--nome",), {}), (("--carga",), {"help": "ex.: 40h"})])
+    _subcomando(curso, "editar", curso_editar, "altera nome/carga (omitidos ficam iguais)", [
+        (("--id",), {}), (("--nome",), {}), (("--carga",), {})])
+    _subcomando(curso, "listar", curso_listar, "lista os cursos")
+    _subcomando(curso, "buscar", curso_buscar, "busca cursos e módulos por nome, aula ou autor", [
+        (("--termos",), {}), (("--limite",), {"type": int})])
+    _subcomando(curso, "alunos", curso_alunos, "lista os matriculados num curso", [(("--id",), {})])
+
+    modulo = entidades.add_parser("modulo", help="módulos").add_subparsers(dest="acao", required=True)
+    _subcomando(modulo, "adicionar", modulo_adicionar, "acrescenta um módulo ao curso", [
+        (("--curso",), {}), (("--nome",), {})])
+    _subcomando(modulo, "editar", modulo_editar, "renomeia um módulo", [
+        (("--curso",), {}), (("--modulo",), {"type": int, "help": "número no menu (1 = primeiro)"}),
+        (("--nome",), {})])
+    _subcomando(modulo, "remover", modulo_remover, "remove um módulo", [
+        (("--curso",), {}), (("--modulo",), {"type": int, "help": "número no menu (1 = primeiro)"})])
+
+    _subcomando(entidades, "matricula", matricula, "matricula um usuário num curso", [
+        (("--usuario",), {}), (("--curso",), {}),
+        (("--cancelar",), {"action": "store_true", "help": "tira o usuário do curso"})])
+    _subcomando(entidades, "progresso", progresso, "marca um módulo (ou uma aula) como concluído", [
+        (("--usuario",), {}), (("--curso",), {}),
+        (("--modulo",), {"type": int, "help": "número no menu (1 = primeiro)"}),
+        (("--aula",), {"type": int, "help": "número da aula no módulo (1 = primeira)"}),
+        (("--desmarcar",), {"action": "store_true", "help": "desfaz a conclusão"})])
+
+    certificado = entidades.add_parser("certificado", help="certificados").add_subparsers(
+        dest="acao", required=True)
+    _subcomando(certificado, "emitir", certificado_emitir, "gera o certificado de um curso concluído", [
+        (("--usuario",), {}), (("--curso",), {})])
+    _subcomando(certificado, "validar", certificado_validar, "consulta um código CERT-...", [
+        (("--codigo",), {})])
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+    parametros = {k: v for k, v in vars(args).items() if k not in ("operacao", "entidade", "acao")}
+
+    # Operações do sistema consultam o usuário logado (log, criado_por, permissões)
+    import usuarios.usuarios as u
+    u.usuario_logado = {"nome": args.operador, "is_admin": True}
+
+    if args.lote:
+        sucesso = executar_lote(args.operacao, parametros)
+    else:
+        resultado = _executar(args.operacao, parametros)
+        sucesso = resultado["ok"]
+        _emitir(resultado)
+    if not _finalizar():
+        sucesso = False
+        _emitir({"ok": False, "erro": u.ERRO_CONFLITO})
+    return 0 if sucesso else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
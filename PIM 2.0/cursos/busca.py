@@ -0,0 +1,202 @@
+# cursos/busca.py
+"""Busca no catálogo (cursos, módulos, aulas e autores) por índice invertido.
+
+    termo normalizado -> {documento: peso}     documento = (id_curso, None) ou (id_curso, módulo)
+
+Os textos passam por `tokenizar`: minúsculas, sem acentos ("programação" e
+"Programacao" são o mesmo termo) e sem palavras vazias ("de", "para"...).
+Cada termo da consulta também casa como prefixo ("prog" acha
+"programação"), com peso menor que o termo exato; todos os termos precisam
+aparecer no documento. A pontuação soma, por termo, o peso do campo onde
+ele aparece (nome do curso > nome do módulo > aulas > autor) vezes o quão
+raro ele é no catálogo.
+
+O índice é mantido curso a curso: `atualizar([id_curso])` refaz só os
+documentos daquele curso (o curso e seus módulos), então criar/editar um
+curso ou módulo custa o tamanho do curso, não o do catálogo.
+"""
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# ========== CONFIGURAÇÕES ==========
+PESO_NOME_CURSO = 3.0
+PESO_NOME_MODULO = 2.0
+PESO_AULA = 1.0
+PESO_AUTOR = 0.5
+PESO_CURSO_DO_MODULO = 0.5  # "python introdução" acha o módulo "Introdução" do curso "Python"
+PESO_PREFIXO = 0.5  # Casar só como prefixo vale metade (proporcional ao trecho casado)
+PREFIXO_MINIMO = 2  # Termos de 1 letra só casam exatos
+LIMITE_RESULTADOS = 20
+PALAVRAS_VAZIAS = frozenset("a o as os e de da do das dos em no na nos nas um uma uns umas "
+                            "para pra por com ao aos sem sobre".split())
+
+Documento = Tuple[str, Optional[int]]  # (id_curso, None) é o curso; (id_curso, i) é o módulo i
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos ("Programação" -> "programacao")"""
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos de um texto, sem palavras vazias (se o texto só tiver delas, ficam todas)"""
+    termos = _PALAVRA.findall(normalizar(texto))
+    uteis = [t for t in termos if t not in PALAVRAS_VAZIAS]
+    return uteis or termos
+
+@lru_cache(maxsize=65536)
+def _termos_do_campo(texto: str) -> frozenset:
+    """Termos distintos de um campo; nomes de curso, autores e títulos de aula se repetem muito"""
+    return frozenset(tokenizar(texto))
+
+
+class BuscaCatalogo:
+    """Índice invertido sobre um dicionário {id_curso: curso}; ver o docstring do módulo"""
+
+    def __init__(self, cursos: Dict[str, Dict]):
+        self.cursos = cursos
+        self._postagens: Dict[str, Dict[Documento, float]] = {}
+        self._vocabulario: List[str] = []  # Termos em ordem, para achar prefixos por busca binária
+        self._termos_do_documento: Dict[Documento, Dict[str, float]] = {}
+        self._documentos_do_curso: Dict[str, List[Documento]] = {}
+        self._titulos: Dict[Documento, str] = {}
+        self._trava = threading.Lock()
+        self.reconstruir()
+
+    # ========== MANUTENÇÃO ==========
+    def reconstruir(self):
+        """Refaz o índice com o catálogo inteiro"""
+        cursos = list(self.cursos.items())
+        with self._trava:
+            self._postagens.clear()
+            self._termos_do_documento.clear()
+            self._documentos_do_curso.clear()
+            self._titulos.clear()
+            for id_curso, curso in cursos:
+                self._incluir_curso(id_curso, curso, ordenar=False)
+            self._vocabulario = sorted(self._postagens)
+
+    def atualizar(self, ids_cursos: Iterable[str], origem: Optional[Dict] = None):
+        """Reindexa os cursos criados, alterados ou removidos (com todos os seus módulos).
+
+        `origem` é onde ler os cursos (padrão: o próprio catálogo); os
+        observadores do ArmazemJSON passam o dicionário do arquivo que mudou.
+        """
+        origem = self.cursos if origem is None else origem
+        cursos = [(id_curso, origem.get(id_curso)) for id_curso in ids_cursos]
+        with self._trava:
+            for id_curso, curso in cursos:
+                self._retirar_curso(id_curso)
+                if curso is not None:
+                    self._incluir_curso(id_curso, curso)
+
+    def observar(self, chaves: List[str], dados: Dict):
+        """Observador de ArmazemJSON: cursos trazidos de outros processos"""
+        self.atualizar(chaves, dados)
+
+    def _incluir_curso(self, id_curso: str, curso: Dict, ordenar: bool = True):
+        nome_curso = curso.get("nome", "")
+        documentos = [((id_curso, None), nome_curso,
+                       [(nome_curso, PESO_NOME_CURSO), (curso.get("criado_por", ""), PESO_AUTOR)])]
+        for indice, modulo in enumerate(curso.get("modulos", [])):
+            campos = [(modulo.get("nome", ""), PESO_NOME_MODULO), (nome_curso, PESO_CURSO_DO_MODULO),
+                      (modulo.get("criado_por", ""), PESO_AUTOR)]
+            campos += [(aula, PESO_AULA) for aula in modulo.get("aulas", []) if isinstance(aula, str)]
+            documentos.append(((id_curso, indice), f"{nome_curso} › {modulo.get('nome', '')}", campos))
+
+        for documento, titulo, campos in documentos:
+            termos: Dict[str, float] = {}
+            for texto, peso in campos:
+                for termo in _termos_do_campo(texto or ""):  # Cada campo conta uma vez por termo
+                    termos[termo] = termos.get(termo, 0.0) + peso
+            for termo, peso in termos.items():
+                postagens = self._postagens.get(termo)
+                if postagens is None:
+                    postagens = self._postagens[termo] = {}
+                    if ordenar:
+                        insort(self._vocabulario, termo)
+                postagens[documento] = peso
+            self._termos_do_documento[documento] = termos
+            self._titulos[documento] = titulo
+        self._documentos_do_curso[id_curso] = [documento for documento, _, _ in documentos]
+
+    def _retirar_curso(self, id_curso: str):
+        for documento in self._documentos_do_curso.pop(id_curso, []):
+            for termo in self._termos_do_documento.pop(documento, {}):
+                postagens = self._postagens[termo]
+                del postagens[documento]
+                if not postagens:
+                    del self._postagens[termo]
+                    del self._vocabulario[bisect_left(self._vocabulario, termo)]
+            del self._titulos[documento]
+
+    # ========== CONSULTA ==========
+    def _expandir(self, termo: str) -> List[Tuple[Dict[Documento, float], float]]:
+        """(postagens, fator) de cada termo do índice que casa com `termo` (exato ou prefixo)"""
+        inicio = bisect_left(self._vocabulario, termo)
+        if len(termo) >= PREFIXO_MINIMO:
+            fim = bisect_left(self._vocabulario, termo + "\uffff", inicio)
+        else:
+            fim = inicio + (self._vocabulario[inicio:inicio + 1] == [termo])
+        total = len(self._termos_do_documento)
+        expansao = []
+        for encontrado in self._vocabulario[inicio:fim]:
+            postagens = self._postagens[encontrado]
+            fator = math.log(1 + total / len(postagens))  # Termos raros valem mais
+            if encontrado != termo:
+                fator *= PESO_PREFIXO * len(termo) / len(encontrado)
+            expansao.append((postagens, fator))
+        return expansao
+
+    @staticmethod
+    def _pontos(expansao: List[Tuple[Dict[Documento, float], float]]) -> Dict[Documento, float]:
+        """Melhor pontuação de cada documento entre os termos de uma expansão"""
+        if len(expansao) == 1:
+            (postagens, fator), = expansao
+            return {documento: peso * fator for documento, peso in postagens.items()}
+        pontos: Dict[Documento, float] = {}
+        for postagens, fator in expansao:
+            for documento, peso in postagens.items():
+                if peso * fator > pontos.get(documento, 0.0):
+                    pontos[documento] = peso * fator
+        return pontos
+
+    def buscar(self, consulta: str, limite: int = LIMITE_RESULTADOS) -> List[Dict]:
+        """Os `limite` documentos com todos os termos, dos mais relevantes aos menos"""
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+        with self._trava:
+            # Do termo mais seletivo ao menos: o primeiro define os candidatos e os
+            # outros só são conferidos neles (nada de percorrer as postagens longas)
+            expansoes = sorted((self._expandir(termo) for termo in dict.fromkeys(termos)),
+                               key=lambda expansao: sum(len(p) for p, _ in expansao))
+            pontos = self._pontos(expansoes[0])
+            for expansao in expansoes[1:]:
+                if len(expansao) == 1:  # Termo exato (o caso comum): só consultas ao dicionário
+                    (postagens, fator), = expansao
+                    pontos = {documento: valor + postagens[documento] * fator
+                              for documento, valor in pontos.items() if documento in postagens}
+                    continue
+                proximos = {}
+                for documento, valor in pontos.items():
+                    melhor = max((p[documento] * fator for p, fator in expansao if documento in p),
+                                 default=None)
+                    if melhor is not None:
+                        proximos[documento] = valor + melhor
+                pontos = proximos
+            melhores = heapq.nlargest(limite, pontos.items(), key=itemgetter(1))
+            melhores.sort(key=lambda par: (-par[1], len(self._titulos[par[0]])))  # Empate: título mais curto
+            return [{"tipo": "curso" if modulo is None else "modulo", "curso": id_curso,
+                     "modulo": modulo, "titulo": self._titulos[(id_curso, modulo)],
+                     "pontos": round(valor, 3)}
+                    for (id_curso, modulo), valor in melhores]
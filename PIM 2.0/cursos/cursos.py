@@ -1,26 +1,28 @@
 # cursos/cursos.py
-import json
 import os
+import threading
 from datetime import datetime
 from usuarios.usuarios import eh_admin, registrar_log, get_usuario_logado
+from repositorio.armazem_json import ArmazemJSON, ConflitoVersao
+from modelos.modelos import Curso
+from metricas.metricas import cronometrar, contar
 
 
 # ========== CONFIGURAÇÕES ==========
 ARQUIVO_CURSOS = "cursos.json"
+MODO_ARMAZENAMENTO = os.environ.get("PIM_ARMAZENAMENTO", "json")  # "sqlite" usa o repositório
 COR_SUCESSO = "\033[1;32m"
 COR_ERRO = "\033[1;31m"
 COR_TITULO = "\033[1;36m"
 RESET_COR = "\033[0m"
+ERRO_CONFLITO = "Curso alterado em outro terminal; refaça a operação"
+_trava_matriculas = threading.RLock()  # Registro do aluno e índice curso -> alunos mudam juntos
 
 
 
 # ========== BANCO DE DADOS ==========
-def carregar_cursos() -> dict:
-    """Carrega cursos do JSON ou cria estrutura inicial"""
-    if os.path.exists(ARQUIVO_CURSOS):
-        with open(ARQUIVO_CURSOS, 'r') as f:
-            return json.load(f)
-    
+def cursos_padrao() -> dict:
+    """Estrutura inicial quando ainda não há cursos salvos"""
     return {
         "1": {
             "nome": "Introdução à Programação",
@@ -38,22 +40,92 @@ def carregar_cursos() -> dict:
         }
     }
 
-def salvar_cursos():
-    """Salva os cursos no arquivo JSON"""
-    with open(ARQUIVO_CURSOS, 'w') as f:
-        json.dump(cursos_disponiveis, f, indent=4, ensure_ascii=False)
+def carregar_cursos() -> dict:
+    """Carrega cursos do JSON ou cria estrutura inicial"""
+    if MODO_ARMAZENAMENTO == "sqlite":
+        from repositorio.repositorio import mapa_cursos
+        return mapa_cursos(cursos_padrao)
+    return armazem_cursos.carregar()
+
+@cronometrar("cursos.salvar")
+def salvar_cursos(ids: list = None, imediato: bool = False) -> bool:
+    """Salva no arquivo JSON só os cursos alterados; False se houve conflito.
+
+    `ids` são os cursos alterados por dentro (módulos, nome...); sem eles só
+    vão os criados/removidos em `cursos_disponiveis`. Sem `imediato`, a
+    gravação é adiada e agrupada com as próximas edições.
+    """
+    if MODO_ARMAZENAMENTO == "sqlite":
+        if ids is None:
+            cursos_disponiveis.salvar()
+        for id_curso in ids or []:
+            cursos_disponiveis.salvar_registro(id_curso)
+        return True
+    if conflitos := armazem_cursos.conflitos_pendentes():  # De gravações adiadas anteriores
+        _avisar_conflito(conflitos)
+    if not imediato:
+        armazem_cursos.marcar(ids)
+        return True
+    try:
+        armazem_cursos.salvar(ids)
+    except ConflitoVersao as e:
+        _avisar_conflito(e.chaves)
+        return False
+    return True
+
+def _avisar_conflito(ids: list):
+    print(f"{COR_ERRO}⚠️ Curso(s) {', '.join(ids)} alterado(s) em outro terminal. "
+          f"Os dados foram recarregados; refaça a operação.{RESET_COR}")
+
+def sincronizar_cursos():
+    """Traz os cursos alterados por outros terminais (um os.stat se nada mudou)"""
+    if MODO_ARMAZENAMENTO != "sqlite":
+        armazem_cursos.sincronizar()
+
+_busca = None
+
+def get_busca():
+    """Índice de busca do catálogo (cursos.busca), montado no primeiro uso.
+
+    Nos modos JSON ele observa o armazém de cursos, que o avisa dos cursos
+    trazidos de outros terminais; as alterações deste processo passam por
+    `indexar_curso`.
+    """
+    global _busca
+    if _busca is None:
+        from cursos.busca import BuscaCatalogo
+        _busca = BuscaCatalogo(cursos_disponiveis)
+        if MODO_ARMAZENAMENTO != "sqlite":
+            armazem_cursos.observadores.append(_busca.observar)
+    return _busca
+
+def indexar_curso(id_curso: str):
+    """Reindexa um curso criado/alterado (se a busca já foi montada)"""
+    if _busca is not None:
+        _busca.atualizar([id_curso])
+
+def buscar_catalogo(consulta: str, limite: int = 20) -> list:
+    """Cursos e módulos que casam com a consulta, do mais relevante ao menos"""
+    sincronizar_cursos()
+    return get_busca().buscar(consulta, limite)
 
 # Dados globais
+armazem_cursos = ArmazemJSON(ARQUIVO_CURSOS, cursos_padrao, modelo=Curso)
 cursos_disponiveis = carregar_cursos()
 
 # ========== OPERAÇÕES PRINCIPAIS ==========
 def tela_cursos():
     """Menu principal de cursos"""
     while True:
+        sincronizar_cursos()
         print(f"\n{COR_TITULO}=== GERENCIAMENTO DE CURSOS ===")
         print("1. 📋 Listar cursos")
         print("2. ➕ Criar novo curso (ADM)")
         print("3. ✏️ Editar curso (ADM)")
+        print("4. 📝 Matricular-se em um curso")
+        print("5. 📈 Meu progresso")
+        print("6. 👥 Turmas (ADM)")
+        print("7. 🔍 Buscar no catálogo")
         print("0. ↩ Voltar")
         print("="*40 + RESET_COR)
         
@@ -71,36 +143,82 @@ def tela_cursos():
                 editar_curso()
             else:
                 print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        elif escolha == '4':
+            tela_matricula()
+        elif escolha == '5':
+            from modulos.progresso import tela_progresso
+            tela_progresso()
+        elif escolha == '6':
+            if eh_admin():
+                tela_turmas()
+            else:
+                print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        elif escolha == '7':
+            tela_busca()
         elif escolha == '0':
             break
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
+# ========== OPERAÇÕES (sem input) ==========
+def cadastrar_curso(nome: str, carga_horaria: str, autor: str = None) -> str:
+    """Cria o curso e devolve o ID gerado; levanta ValueError com o motivo"""
+    nome, carga_horaria = nome.strip(), carga_horaria.strip()
+    if not nome or not carga_horaria:
+        raise ValueError("Preencha todos os campos!")
+
+    sincronizar_cursos()
+    novo_id = str(max((int(k) for k in cursos_disponiveis), default=0) + 1)
+    cursos_disponiveis[novo_id] = {
+        "nome": nome,
+        "carga_horaria": carga_horaria,
+        "modulos": [],
+        "criado_por": autor or get_usuario_logado()["nome"],
+        "data_criacao": datetime.now().isoformat()
+    }
+    indexar_curso(novo_id)
+
+    if not salvar_cursos([novo_id], imediato=True):  # O ID novo pode ter sido usado por outro terminal
+        raise ValueError(ERRO_CONFLITO)
+    contar("cursos.criados")
+    registrar_log("Curso criado", f"ID: {novo_id} | Nome: {nome}")
+    return novo_id
+
+def atualizar_curso(id_curso: str, nome: str = "", carga_horaria: str = "",
+                    autor: str = None) -> dict:
+    """Altera nome e/ou carga horária (vazio mantém o valor atual)"""
+    if id_curso not in cursos_disponiveis:
+        raise ValueError("Curso não encontrado!")
+    curso = cursos_disponiveis[id_curso]
+    if nome.strip():
+        curso["nome"] = nome.strip()
+    if carga_horaria.strip():
+        curso["carga_horaria"] = carga_horaria.strip()
+    curso["ultima_edicao"] = {
+        "por": autor or get_usuario_logado()["nome"],
+        "em": datetime.now().isoformat()
+    }
+    indexar_curso(id_curso)
+
+    if not salvar_cursos([id_curso]):
+        raise ValueError(ERRO_CONFLITO)
+    contar("cursos.editados")
+    registrar_log("Curso editado", f"ID: {id_curso}")
+    return curso
+
 # ========== FUNÇÕES DE GERENCIAMENTO ==========
 def criar_curso():
     """Cadastro de novos cursos (apenas ADM)"""
     print(f"\n{COR_TITULO}=== NOVO CURSO ===")
     
-    # Gera ID automático
-    novo_id = str(max(int(k) for k in cursos_disponiveis.keys()) + 1)
-    
     nome = input("Nome do curso: ").strip()
     carga_horaria = input("Carga horária (ex: 40h): ").strip()
     
-    if not nome or not carga_horaria:
-        print(f"{COR_ERRO}❌ Preencha todos os campos!{RESET_COR}")
+    try:
+        cadastrar_curso(nome, carga_horaria)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
         return
-    
-    cursos_disponiveis[novo_id] = {
-        "nome": nome,
-        "carga_horaria": carga_horaria,
-        "modulos": [],
-        "criado_por": get_usuario_logado["nome"],
-        "data_criacao": datetime.now().isoformat()
-    }
-    
-    salvar_cursos()
-    registrar_log("Curso criado", f"ID: {novo_id} | Nome: {nome}")
     print(f"\n{COR_SUCESSO}✅ Curso criado com sucesso!{RESET_COR}")
 
 def editar_curso():
@@ -120,20 +238,140 @@ def editar_curso():
     novo_nome = input(f"Novo nome [{cursos_disponiveis[id_curso]['nome']}]: ").strip()
     nova_carga = input(f"Nova carga horária [{cursos_disponiveis[id_curso]['carga_horaria']}]: ").strip()
     
-    if novo_nome:
-        cursos_disponiveis[id_curso]["nome"] = novo_nome
-    if nova_carga:
-        cursos_disponiveis[id_curso]["carga_horaria"] = nova_carga
-    
-    cursos_disponiveis[id_curso]["ultima_edicao"] = {
-        "por": get_usuario_logado["nome"],
-        "em": datetime.now().isoformat()
-    }
-    
-    salvar_cursos()
-    registrar_log("Curso editado", f"ID: {id_curso}")
+    try:
+        atualizar_curso(id_curso, novo_nome, nova_carga)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        return
     print(f"\n{COR_SUCESSO}✅ Curso atualizado!{RESET_COR}")
 
+@cronometrar("cursos.matricular")
+def matricular_usuario(nome: str, id_curso: str) -> bool:
+    """Matricula o usuário no curso; False se ele já estava matriculado.
+
+    Levanta ValueError se a gravação esbarrou em outro terminal (a matrícula
+    não fica só na memória).
+    """
+    from usuarios.usuarios import get_usuarios_cadastrados, salvar_usuario, atualizar_indices
+    with _trava_matriculas:
+        registro = get_usuarios_cadastrados()[nome]
+        matriculas = registro.setdefault("cursos", [])
+        if id_curso in matriculas:
+            return False
+        matriculas.append(id_curso)
+        atualizar_indices([nome])
+    if not salvar_usuario(nome, imediato=True):
+        _desfazer_matricula(nome, registro, lambda: matriculas.remove(id_curso))
+        raise ValueError("Matrícula não gravada: dados alterados em outro terminal!")
+    registrar_log("Matrícula realizada", f"Usuário: {nome} | Curso: {id_curso}")
+    return True
+
+@cronometrar("cursos.cancelar_matricula")
+def cancelar_matricula(nome: str, id_curso: str) -> bool:
+    """Tira o usuário do curso (o progresso fica guardado); False se ele não estava matriculado.
+
+    Levanta ValueError se a gravação esbarrou em outro terminal.
+    """
+    from usuarios.usuarios import get_usuarios_cadastrados, salvar_usuario, atualizar_indices
+    with _trava_matriculas:
+        registro = get_usuarios_cadastrados()[nome]
+        matriculas = registro.get("cursos", [])
+        if id_curso not in matriculas:
+            return False
+        posicao = matriculas.index(id_curso)
+        del matriculas[posicao]
+        atualizar_indices([nome])
+    if not salvar_usuario(nome, imediato=True):
+        _desfazer_matricula(nome, registro, lambda: matriculas.insert(posicao, id_curso))
+        raise ValueError("Cancelamento não gravado: dados alterados em outro terminal!")
+    registrar_log("Matrícula cancelada", f"Usuário: {nome} | Curso: {id_curso}")
+    return True
+
+def _desfazer_matricula(nome: str, registro, desfazer):
+    """Volta a memória ao estado gravado depois de uma gravação recusada; em
+    conflito o armazém já trocou o registro pela versão do disco"""
+    from usuarios.usuarios import get_usuarios_cadastrados, atualizar_indices
+    with _trava_matriculas:
+        if get_usuarios_cadastrados().get(nome) is registro:
+            desfazer()
+        atualizar_indices([nome])
+
+def alunos_do_curso(id_curso: str) -> list:
+    """Matriculados no curso, pelo índice curso -> alunos (sem percorrer todos os usuários)"""
+    from usuarios.usuarios import get_indices
+    return get_indices().alunos_do_curso(id_curso)
+
+def tela_matricula():
+    """Matrícula do usuário logado em um curso"""
+    print(f"\n{COR_TITULO}=== MATRÍCULA ===")
+    listar_cursos()
+    id_curso = input("\nID do curso: ").strip()
+
+    if id_curso not in cursos_disponiveis:
+        print(f"{COR_ERRO}❌ Curso não encontrado!{RESET_COR}")
+        return
+
+    try:
+        nova = matricular_usuario(get_usuario_logado()["nome"], id_curso)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        return
+    if nova:
+        print(f"\n{COR_SUCESSO}✅ Matrícula realizada!{RESET_COR}")
+    else:
+        print(f"{COR_ERRO}⚠️ Você já está matriculado neste curso!{RESET_COR}")
+
+def tela_turmas():
+    """Quantos alunos há em cada curso e a turma de um deles (ADM)"""
+    from usuarios.usuarios import get_indices
+    from modulos.progresso import resumo_curso, barra
+    print(f"\n{COR_TITULO}=== TURMAS ===")
+    contagem = get_indices().contar_alunos_por_curso()
+    for id_curso, curso in cursos_disponiveis.items():
+        print(f"{id_curso}. {curso['nome']}: {contagem.get(id_curso, 0)} aluno(s)")
+    print("="*40 + RESET_COR)
+
+    id_curso = input("\nID do curso para ver a turma (Enter volta): ").strip()
+    if not id_curso:
+        return
+    if id_curso not in cursos_disponiveis:
+        print(f"{COR_ERRO}❌ Curso não encontrado!{RESET_COR}")
+        return
+    alunos = alunos_do_curso(id_curso)
+    print(f"\n{COR_TITULO}=== TURMA: {cursos_disponiveis[id_curso]['nome']} ({len(alunos)}) ===")
+    for nome, pct in resumo_curso(id_curso, alunos).items():
+        print(f"- {nome:<20} {barra(pct)} {pct:.0f}%")
+    print("="*40 + RESET_COR)
+
+    nome = input("\nCancelar a matrícula de (nome, Enter volta): ").strip()
+    if not nome:
+        return
+    if nome not in alunos:
+        print(f"{COR_ERRO}❌ Aluno não está nesta turma!{RESET_COR}")
+        return
+    try:
+        if cancelar_matricula(nome, id_curso):
+            print(f"{COR_SUCESSO}✅ Matrícula cancelada!{RESET_COR}")
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+
+def tela_busca():
+    """Busca por nome de curso, módulo, aula ou autor (sem listar o catálogo inteiro)"""
+    consulta = input("\nBuscar (ex.: seguranca redes): ").strip()
+    if not consulta:
+        return
+    resultados = buscar_catalogo(consulta)
+    print(f"\n{COR_TITULO}=== RESULTADOS: {consulta} ===")
+    if not resultados:
+        print(f"{COR_ERRO}Nada encontrado.{RESET_COR}")
+    for r in resultados:
+        if r["tipo"] == "curso":
+            curso = cursos_disponiveis[r["curso"]]
+            print(f"📚 {r['curso']}. {curso['nome']} ({curso['carga_horaria']})")
+        else:
+            print(f"   📄 Curso {r['curso']}, módulo {r['modulo'] + 1}: {r['titulo']}")
+    print("="*40 + RESET_COR)
+
 # ========== FUNÇÕES AUXILIARES ==========
 def listar_cursos(completo: bool = False):
     """Lista todos os cursos com detalhes"""
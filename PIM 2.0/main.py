@@ -1,11 +1,44 @@
 import os
-import cursos.cursos
-import modulos.modulos
-import security.security
+import sys
+import time
+
+# ========== PERFIL DE INICIALIZAÇÃO ==========
+# python main.py --startup-profile  -> mede imports e cargas de dados e sai
+PERFIL_INICIALIZACAO = "--startup-profile" in sys.argv
+INICIO = time.perf_counter()
+_imports = []  # [profundidade, módulo, segundos] na ordem em que começaram
+_etapas = []  # (etapa, segundos, posição do primeiro import da etapa)
+
+def _instalar_medidor_imports():
+    """Cronometra cada módulo importado pela 1ª vez (tempo acumulado, como -X importtime)"""
+    import builtins
+    importar_original = builtins.__import__
+    profundidade = 0
+
+    def importar(nome, globals=None, locals=None, fromlist=(), level=0):
+        nonlocal profundidade
+        if level or nome in sys.modules:
+            return importar_original(nome, globals, locals, fromlist, level)
+        registro = [profundidade, nome, 0.0]
+        _imports.append(registro)
+        profundidade += 1
+        inicio = time.perf_counter()
+        try:
+            return importar_original(nome, globals, locals, fromlist, level)
+        finally:
+            registro[2] = time.perf_counter() - inicio
+            profundidade -= 1
+
+    builtins.__import__ = importar
+
+if PERFIL_INICIALIZACAO:
+    _instalar_medidor_imports()
+
+# Só o necessário para o menu; cada subsistema é importado ao abrir sua opção
 from usuarios.usuarios import (
     get_usuario_logado, tela_login_cadastro,
     eh_admin, menu_admin, logout,
-    usuarios_cadastrados, registrar_log
+    registrar_log
 )
 
 
@@ -53,14 +86,16 @@ def main():
         # Opção 2: Cursos
         elif escolha == '2':
             if get_usuario_logado():
-                cursos.cursos.tela_cursos()
+                from cursos.cursos import tela_cursos
+                tela_cursos()
             else:
                 print(f"\n{COR_ALERTA}⚠️ Você precisa fazer login primeiro!{RESET_COR}")
                 input("Pressione Enter para voltar...")
 
         # Opção 3: Segurança
         elif escolha == '3':
-            security.security.tela_seguranca()
+            from security.security import tela_seguranca
+            tela_seguranca()
 
         # Opção 4: Módulos (Versão corrigida)
         elif escolha == '4':
@@ -108,5 +143,40 @@ def main():
             print(f"\n{COR_ERRO}❌ Opção inválida!{RESET_COR}")
             input("Pressione Enter para voltar...")
 
+# ========== RELATÓRIO DO PERFIL ==========
+def _medir_etapa(etapa: str, carregar):
+    posicao = len(_imports)
+    inicio = time.perf_counter()
+    carregar()
+    _etapas.append((etapa, time.perf_counter() - inicio, posicao))
+
+def perfil_inicializacao(minimo_ms: float = 1.0):
+    """Mostra quanto custa chegar ao menu e o primeiro uso de cada opção"""
+    import importlib
+    _etapas.append(("Até o menu principal", time.perf_counter() - INICIO, 0))
+
+    from usuarios.usuarios import get_usuarios_cadastrados
+    _medir_etapa("1. Login (carga dos usuários)", get_usuarios_cadastrados)
+    _medir_etapa("2. Cursos (carga dos cursos)", lambda: importlib.import_module("cursos.cursos"))
+    _medir_etapa("3. Segurança", lambda: importlib.import_module("security.security"))
+    _medir_etapa("4. Módulos", lambda: importlib.import_module("modulos.modulos"))
+    _medir_etapa("5. Certificados (menu)", lambda: importlib.import_module("certificados.certificados"))
+    _medir_etapa("5. Certificados (1º PDF: fpdf)", lambda: importlib.import_module("certificados.modelo"))
+
+    print(f"\n{COR_TITULO}=== PERFIL DE INICIALIZAÇÃO ==={RESET_COR}")
+    for idx, (etapa, segundos, posicao) in enumerate(_etapas):
+        print(f"{COR_MENU}{etapa:<36}{segundos * 1000:>10.1f} ms{RESET_COR}")
+        fim = _etapas[idx + 1][2] if idx + 1 < len(_etapas) else len(_imports)
+        for profundidade, modulo, tempo in _imports[posicao:fim]:
+            if tempo * 1000 >= minimo_ms:
+                print(f"    {'  ' * profundidade}{modulo:<{32 - 2 * profundidade}}{tempo * 1000:>8.1f} ms")
+    print(f"\n(imports abaixo de {minimo_ms} ms omitidos; tempos acumulados incluem sub-imports)")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if PERFIL_INICIALIZACAO:
+        perfil_inicializacao()
+    elif len(sys.argv) > 1:  # python main.py <subcomando> ... -> cli.py, sem menus
+        from cli import main as cli
+        sys.exit(cli(sys.argv[1:]))
+    else:
+        main()
\ No newline at end of file
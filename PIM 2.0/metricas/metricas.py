@@ -0,0 +1,244 @@
+# metricas/metricas.py
+"""Cronômetros, contadores e histogramas de latência dos caminhos quentes.
+
+Ativação (antes de iniciar o programa):
+    PIM_METRICAS=1                    coleta as métricas
+    PIM_METRICAS_ARQUIVO=saida.json   grava o relatório ao sair
+    PIM_CPROFILE=saida.prof           captura cProfile da sessão inteira
+
+Desativado, `cronometrar` devolve a própria função (custo zero) e `medir`/
+`contar` retornam logo na primeira linha.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+
+# ========== CONFIGURAÇÕES ==========
+ATIVO = os.environ.get("PIM_METRICAS", "0") == "1"
+ARQUIVO_METRICAS = os.environ.get("PIM_METRICAS_ARQUIVO", "")
+ARQUIVO_CPROFILE = os.environ.get("PIM_CPROFILE", "")
+SUBDIVISOES = 4  # Baldes por potência de 2: erro máximo de ~19% nos percentis
+COR_TITULO = "\033[1;36m"
+COR_MENU = "\033[1;35m"
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+RESET_COR = "\033[0m"
+
+
+# ========== HISTOGRAMA ==========
+class Histograma:
+    """Latências em baldes logarítmicos: memória fixa, percentis aproximados"""
+
+    def __init__(self):
+        self.chamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.baldes: Dict[int, int] = {}
+
+    def registrar(self, segundos: float):
+        microssegundos = max(segundos * 1e6, 1.0)
+        balde = int(math.log2(microssegundos) * SUBDIVISOES)
+        self.baldes[balde] = self.baldes.get(balde, 0) + 1
+        self.chamadas += 1
+        self.total += segundos
+        self.maximo = max(self.maximo, segundos)
+
+    def percentil(self, p: float) -> float:
+        """Limite superior do balde que contém o percentil `p`, em ms"""
+        if not self.chamadas:
+            return 0.0
+        alvo = self.chamadas * p / 100
+        acumulado = 0
+        for balde in sorted(self.baldes):
+            acumulado += self.baldes[balde]
+            if acumulado >= alvo:
+                return min(2 ** ((balde + 1) / SUBDIVISOES) / 1000, self.maximo * 1000)
+        return self.maximo * 1000
+
+    def resumo(self) -> Dict:
+        return {
+            "chamadas": self.chamadas,
+            "total_ms": round(self.total * 1000, 3),
+            "media_ms": round(self.total * 1000 / self.chamadas, 3) if self.chamadas else 0.0,
+            "p50_ms": round(self.percentil(50), 3),
+            "p95_ms": round(self.percentil(95), 3),
+            "p99_ms": round(self.percentil(99), 3),
+            "max_ms": round(self.maximo * 1000, 3),
+        }
+
+
+# ========== REGISTRO GLOBAL ==========
+_histogramas: Dict[str, Histograma] = {}
+_contadores: Dict[str, int] = {}
+_fontes: Dict[str, Callable[[], Dict]] = {}  # Métricas próprias de outros componentes
+_trava = threading.Lock()
+
+
+def registrar_tempo(nome: str, segundos: float):
+    with _trava:
+        if nome not in _histogramas:
+            _histogramas[nome] = Histograma()
+        _histogramas[nome].registrar(segundos)
+
+def cronometrar(nome: str):
+    """Decorador: mede cada chamada da função no histograma `nome`"""
+    def decorador(funcao):
+        if not ATIVO:
+            return funcao
+
+        @wraps(funcao)
+        def cronometrada(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar_tempo(nome, time.perf_counter() - inicio)
+        return cronometrada
+    return decorador
+
+@contextmanager
+def _medir(nome: str):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_tempo(nome, time.perf_counter() - inicio)
+
+_nulo = nullcontext()
+
+def medir(nome: str):
+    """Context manager: `with medir("usuarios.login"): ...`"""
+    return _medir(nome) if ATIVO else _nulo
+
+def contar(nome: str, quantidade: int = 1):
+    if not ATIVO:
+        return
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+def registrar_fonte(nome: str, obter: Callable[[], Dict]):
+    """Inclui no relatório as métricas que um componente já mantém (cache, log...)"""
+    _fontes[nome] = obter
+
+
+# ========== RELATÓRIO ==========
+def relatorio() -> Dict:
+    with _trava:
+        latencias = {nome: h.resumo() for nome, h in sorted(_histogramas.items())}
+        contadores = dict(sorted(_contadores.items()))
+    fontes = {}
+    for nome, obter in _fontes.items():
+        try:
+            fontes[nome] = obter()
+        except Exception as e:  # Uma fonte com problema não derruba o relatório
+            fontes[nome] = {"erro": str(e)}
+    return {"ativo": ATIVO, "latencias": latencias, "contadores": contadores, "componentes": fontes}
+
+def zerar():
+    with _trava:
+        _histogramas.clear()
+        _contadores.clear()
+
+def imprimir_relatorio(dados: Optional[Dict] = None):
+    dados = dados or relatorio()
+    print(f"\n{COR_TITULO}=== LATÊNCIAS (ms) ===")
+    if not dados["latencias"]:
+        print("(nenhuma medição)" if ATIVO else "Coleta desativada: inicie com PIM_METRICAS=1")
+    else:
+        print(f"{'operação':<30}{'chamadas':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'máx':>9}")
+        for nome, r in dados["latencias"].items():
+            print(f"{nome:<30}{r['chamadas']:>9}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+                  f"{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}")
+    if dados["contadores"]:
+        print("\n=== CONTADORES ===")
+        for nome, valor in dados["contadores"].items():
+            print(f"{nome:<30}{valor:>9}")
+    for nome, valores in dados["componentes"].items():
+        print(f"\n=== {nome.upper()} ===")
+        for chave, valor in valores.items():
+            print(f"{chave:<30}{valor:>12}")
+    print("="*57 + RESET_COR)
+
+def exportar(caminho: str):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(relatorio(), f, indent=4, ensure_ascii=False, default=str)
+
+
+# ========== CPROFILE ==========
+_perfil = None
+
+def iniciar_cprofile():
+    global _perfil
+    import cProfile
+    if _perfil is None:
+        _perfil = cProfile.Profile()
+        _perfil.enable()
+
+def parar_cprofile(caminho: str, linhas: int = 15) -> bool:
+    """Para a captura, grava o .prof (abre com snakeviz/pstats) e mostra o topo"""
+    global _perfil
+    if _perfil is None:
+        return False
+    import pstats
+    _perfil.disable()
+    _perfil.dump_stats(caminho)
+    if linhas:
+        pstats.Stats(_perfil).sort_stats("cumulative").print_stats(linhas)
+    _perfil = None
+    return True
+
+def cprofile_ativo() -> bool:
+    return _perfil is not None
+
+
+# ========== ENCERRAMENTO ==========
+def _ao_sair():
+    if ARQUIVO_CPROFILE:
+        parar_cprofile(ARQUIVO_CPROFILE, linhas=0)
+    if ARQUIVO_METRICAS:
+        exportar(ARQUIVO_METRICAS)
+
+if ARQUIVO_CPROFILE:
+    iniciar_cprofile()
+atexit.register(_ao_sair)
+
+
+# ========== INTERFACE ==========
+def tela_metricas():
+    """Painel de métricas (ADM)"""
+    while True:
+        imprimir_relatorio()
+        print(f"{COR_MENU}1. 🔄 Zerar medições")
+        print(f"2. {'⏹️ Parar' if cprofile_ativo() else '▶️ Iniciar'} captura cProfile")
+        print("3. 💾 Exportar para JSON")
+        print(f"0. ↩ VOLTAR{RESET_COR}")
+        escolha = input("Escolha: ").strip()
+
+        if escolha == '1':
+            zerar()
+        elif escolha == '2':
+            if cprofile_ativo():
+                caminho = input("Arquivo .prof [sessao.prof]: ").strip() or "sessao.prof"
+                parar_cprofile(caminho)
+                print(f"{COR_SUCESSO}✅ Perfil salvo em {caminho}{RESET_COR}")
+            else:
+                iniciar_cprofile()
+                print(f"{COR_SUCESSO}✅ Captura iniciada; use o sistema e volte aqui para parar{RESET_COR}")
+        elif escolha == '3':
+            caminho = input("Arquivo [metricas.json]: ").strip() or "metricas.json"
+            try:
+                exportar(caminho)
+                print(f"{COR_SUCESSO}✅ Métricas salvas em {caminho}{RESET_COR}")
+            except OSError as e:
+                print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        elif escolha == '0':
+            break
+        else:
+            print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
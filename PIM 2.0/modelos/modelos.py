@@ -0,0 +1,483 @@
+# modelos/modelos.py
+"""Registros compactos em memória para usuários e cursos.
+
+Cada registro usa __slots__ (sem dicionário por objeto), mas continua
+respondendo como dicionário (`dados["email"]`, `.get`, `.setdefault`, `in`),
+então o restante do sistema funciona igual com registros lidos do disco
+(compactos) e registros recém-criados (dicionários comuns).
+
+Onde a economia vem:
+    matrículas     array de inteiros (4 bytes por curso) no lugar de lista de textos
+    progresso      ids e máscaras em sequências paralelas; aulas só quando existem
+    datas          microssegundos desde 1970 (int) no lugar do texto ISO
+    textos comuns  ids de curso, autores e cargas horárias passam por sys.intern
+
+`de_json`/`para_json` convertem de/para o formato gravado nos arquivos, que
+continua o mesmo. `para_json` também serve de `default=` para json.dump.
+"""
+import copy
+import re
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# ========== CONVERSÕES ==========
+EPOCA = datetime(1970, 1, 1)
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+def _mesmo(valor):
+    return valor
+
+def _texto_comum(valor):
+    """Interna textos que se repetem em muitos registros (ids, autores, cargas)"""
+    return sys.intern(valor) if type(valor) is str else valor
+
+def _instante(valor):
+    """Data ISO -> microssegundos; textos em outro formato ficam como estão"""
+    if type(valor) is not str:
+        return valor
+    try:
+        data = datetime.fromisoformat(valor)
+    except ValueError:
+        return valor
+    if data.tzinfo is not None or data.isoformat() != valor:
+        return valor  # Converter mudaria o texto gravado
+    return (data - EPOCA) // _MICROSSEGUNDO
+
+def _iso(valor):
+    return (EPOCA + valor * _MICROSSEGUNDO).isoformat() if type(valor) is int else valor
+
+_ID_NUMERICO = re.compile(r"0|[1-9][0-9]{0,8}").fullmatch
+
+def _id_numerico(id_curso) -> bool:
+    """IDs que voltam idênticos depois de int() -> str() e cabem em 4 bytes ("7", mas não "07")"""
+    return type(id_curso) is str and _ID_NUMERICO(id_curso) is not None
+
+def para_json(valor):
+    """Forma gravável de um valor (use como `default=` em json.dump)"""
+    if isinstance(valor, (Registro, Progresso)):
+        return valor.para_json()
+    if isinstance(valor, array):
+        return valor.tolist()
+    if isinstance(valor, list):
+        return [para_json(v) for v in valor]
+    if isinstance(valor, dict):
+        return copy.deepcopy(valor)
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    raise TypeError(f"{type(valor).__name__} não é serializável")
+
+
+# ========== REGISTRO BASE ==========
+class Registro(MutableMapping):
+    """Base dos registros: campos conhecidos em slots, o resto em `_extras`.
+
+    Cada subclasse lista em __slots__ os campos do JSON (mesmo nome) e pode
+    converter valores na entrada (ENTRADA), na leitura (LEITURA) e na
+    gravação (SAIDA). Slot vazio = campo ausente.
+    """
+    __slots__ = ("_extras",)
+    ENTRADA: Dict[str, Callable] = {}
+    LEITURA: Dict[str, Callable] = {}
+    SAIDA: Dict[str, Callable] = {}
+    _campos: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._campos = frozenset(cls.__slots__)
+
+    def __init__(self, dados: Optional[Dict] = None, **campos):
+        self._extras = None
+        for campo, valor in {**(dados or {}), **campos}.items():
+            self[campo] = valor
+
+    @classmethod
+    def de_json(cls, dados: Dict):
+        """Registro compacto a partir do dicionário lido do arquivo"""
+        if type(dados) is cls:
+            return dados
+        registro = cls.__new__(cls)
+        registro._extras = None
+        campos, entrada = cls._campos, cls.ENTRADA
+        for campo, valor in dados.items():  # O mesmo que registro[campo] = valor, sem a chamada extra
+            if campo in campos:
+                converter = entrada.get(campo)
+                setattr(registro, campo, converter(valor) if converter else valor)
+            else:
+                registro[campo] = valor
+        return registro
+
+    def para_json(self) -> Dict:
+        """Dicionário novo no formato do arquivo (nada compartilhado com o registro)"""
+        saida = {}
+        for campo in self.__slots__:
+            try:
+                valor = getattr(self, campo)
+            except AttributeError:
+                continue
+            saida[campo] = self.SAIDA.get(campo, para_json)(valor)
+        if self._extras:
+            saida.update(copy.deepcopy(self._extras))
+        return saida
+
+    # ========== DICIONÁRIO ==========
+    def __getitem__(self, campo):
+        if campo in self._campos:
+            try:
+                valor = getattr(self, campo)
+            except AttributeError:
+                raise KeyError(campo) from None
+            return self.LEITURA.get(campo, _mesmo)(valor)
+        if self._extras and campo in self._extras:
+            return self._extras[campo]
+        raise KeyError(campo)
+
+    def __setitem__(self, campo, valor):
+        if campo in self._campos:
+            setattr(self, campo, self.ENTRADA.get(campo, _mesmo)(valor))
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[sys.intern(campo)] = valor
+
+    def __delitem__(self, campo):
+        if campo in self._campos:
+            try:
+                delattr(self, campo)
+            except AttributeError:
+                raise KeyError(campo) from None
+        elif self._extras and campo in self._extras:
+            del self._extras[campo]
+        else:
+            raise KeyError(campo)
+
+    def __iter__(self) -> Iterator[str]:
+        for campo in self.__slots__:
+            if hasattr(self, campo):
+                yield campo
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def setdefault(self, campo, padrao=None):
+        """Como dict.setdefault, mas devolve o valor já convertido (ex.: a lista de matrículas viva)"""
+        if campo not in self:
+            self[campo] = padrao
+        return self[campo]
+
+    def copy(self):
+        return type(self).de_json(self.para_json())
+
+    def __repr__(self) -> str:
+        # Igual ao repr do dicionário gravado: ArmazemJSON usa repr() como assinatura
+        return repr(self.para_json())
+
+    def __reduce__(self):  # copy.deepcopy e pickle
+        return type(self).de_json, (self.para_json(),)
+
+
+# ========== MATRÍCULAS ==========
+class Matriculas(array):
+    """IDs de curso em um array de inteiros; entram e saem como texto ("3")"""
+    __slots__ = ()
+
+    def __new__(cls, ids=()):
+        return super().__new__(cls, "I", [int(i) for i in ids])
+
+    @classmethod
+    def de_lista(cls, ids):
+        """Matriculas quando todos os IDs são numéricos; senão mantém a lista original"""
+        if isinstance(ids, cls):
+            return ids
+        if type(ids) is list and all(map(_id_numerico, ids)):
+            return cls(ids)
+        return copy.deepcopy(ids)
+
+    @staticmethod
+    def _numero(id_curso) -> int:
+        if not _id_numerico(id_curso):
+            raise ValueError(f"ID de curso inválido: {id_curso!r}")
+        return int(id_curso)
+
+    def __iter__(self):
+        return map(str, array.__iter__(self))
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [str(i) for i in array.__getitem__(self, indice)]
+        return str(array.__getitem__(self, indice))
+
+    def __contains__(self, id_curso) -> bool:
+        return _id_numerico(id_curso) and array.__contains__(self, int(id_curso))
+
+    def append(self, id_curso):
+        array.append(self, self._numero(id_curso))
+
+    def extend(self, ids):
+        array.extend(self, [self._numero(i) for i in ids])
+
+    def insert(self, posicao: int, id_curso):
+        array.insert(self, posicao, self._numero(id_curso))
+
+    def remove(self, id_curso):
+        if id_curso not in self:
+            raise ValueError(f"{id_curso!r} não está nas matrículas")
+        array.remove(self, int(id_curso))
+
+    def index(self, id_curso, *args) -> int:
+        if id_curso not in self:
+            raise ValueError(f"{id_curso!r} não está nas matrículas")
+        return array.index(self, int(id_curso), *args)
+
+    def count(self, id_curso) -> int:
+        return array.count(self, int(id_curso)) if _id_numerico(id_curso) else 0
+
+    def pop(self, indice: int = -1) -> str:
+        return str(array.pop(self, indice))
+
+    def tolist(self) -> List[str]:
+        return [str(i) for i in array.__iter__(self)]
+
+    def __eq__(self, outro) -> bool:
+        return isinstance(outro, (list, array)) and self.tolist() == list(outro)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
+
+    def __reduce__(self):
+        return Matriculas, (self.tolist(),)
+
+    def __copy__(self):
+        return Matriculas(self)
+
+    def __deepcopy__(self, memo):
+        return Matriculas(self)
+
+
+# ========== PROGRESSO ==========
+class ProgressoCurso(MutableMapping):
+    """Visão {"modulos": bits, "aulas": {...}} de um curso dentro de `Progresso`"""
+    __slots__ = ("_progresso", "_id")
+
+    def __init__(self, progresso: "Progresso", id_curso: str):
+        self._progresso = progresso
+        self._id = id_curso
+
+    def __getitem__(self, campo):
+        p = self._progresso
+        if campo == "modulos":
+            return p._dados[p._posicao(self._id)]
+        if campo == "aulas":
+            if p._aulas is None:
+                p._aulas = {}
+            return p._aulas.setdefault(self._id, {})
+        raise KeyError(campo)
+
+    def __setitem__(self, campo, valor):
+        p = self._progresso
+        if campo == "modulos":
+            p._definir_bits(p._posicao(self._id), valor)
+        elif campo == "aulas":
+            p._definir_aulas(self._id, valor)
+        else:
+            raise KeyError(campo)
+
+    def __delitem__(self, campo):
+        raise KeyError(campo)
+
+    def __iter__(self):
+        return iter(("modulos", "aulas"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+_CHAVES_PROGRESSO = {"modulos", "aulas"}
+
+class Progresso(MutableMapping):
+    """{id_curso: {"modulos": bits, "aulas": {id_modulo: bits}}} num único array.
+
+    `_dados` intercala [id, bits, id, bits, ...] em inteiros de 8 bytes (vira
+    lista se um curso passar de 64 módulos). Aulas quase sempre estão vazias,
+    então o dicionário delas só existe para os cursos que marcaram alguma.
+    """
+    __slots__ = ("_dados", "_aulas")
+
+    def __init__(self):
+        self._dados = array("Q")
+        self._aulas: Optional[Dict[str, Dict[str, int]]] = None
+
+    @classmethod
+    def de_json(cls, dados: Dict):
+        """Progresso compacto; formatos inesperados ficam como dicionário comum"""
+        if isinstance(dados, cls):
+            return dados
+        if not isinstance(dados, dict):
+            return copy.deepcopy(dados)
+        progresso = cls()
+        intercalado = []
+        for id_curso, valor in dados.items():
+            bits = valor.get("modulos", 0) if isinstance(valor, dict) else None
+            if not (_id_numerico(id_curso) and valor.keys() <= _CHAVES_PROGRESSO
+                    and type(bits) is int and bits >= 0):
+                return copy.deepcopy(dados)
+            intercalado += (int(id_curso), bits)
+            if valor.get("aulas"):
+                progresso._definir_aulas(id_curso, valor["aulas"])
+        try:
+            progresso._dados = array("Q", intercalado)
+        except OverflowError:
+            progresso._dados = intercalado
+        return progresso
+
+    def para_json(self) -> Dict:
+        aulas = self._aulas or {}
+        return {id_curso: {"modulos": self._dados[posicao], "aulas": dict(aulas.get(id_curso, {}))}
+                for id_curso, posicao in self._posicoes()}
+
+    def _posicoes(self) -> Iterator[Tuple[str, int]]:
+        """(id_curso, posição dos bits) de cada curso"""
+        for i in range(0, len(self._dados), 2):
+            yield str(self._dados[i]), i + 1
+
+    def _posicao(self, id_curso: str) -> int:
+        if _id_numerico(id_curso):
+            numero = int(id_curso)
+            for i in range(0, len(self._dados), 2):
+                if self._dados[i] == numero:
+                    return i + 1
+        raise KeyError(id_curso)
+
+    def _definir_bits(self, posicao: int, bits: int):
+        try:
+            self._dados[posicao] = bits
+        except OverflowError:  # Módulo com id >= 64: inteiros do Python não têm limite
+            self._dados = list(self._dados)
+            self._dados[posicao] = bits
+
+    def _definir_aulas(self, id_curso: str, aulas: Dict):
+        if aulas:
+            if self._aulas is None:
+                self._aulas = {}
+            self._aulas[id_curso] = {sys.intern(str(k)): v for k, v in aulas.items()}
+        elif self._aulas:
+            self._aulas.pop(id_curso, None)
+
+    # ========== DICIONÁRIO ==========
+    def __getitem__(self, id_curso) -> ProgressoCurso:
+        self._posicao(id_curso)
+        return ProgressoCurso(self, id_curso)
+
+    def __setitem__(self, id_curso, valor: Dict):
+        try:
+            posicao = self._posicao(id_curso)
+        except KeyError:
+            self._dados.extend((Matriculas._numero(id_curso), 0))  # ValueError para IDs não numéricos
+            posicao = len(self._dados) - 1
+        self._definir_bits(posicao, valor.get("modulos", 0))
+        self._definir_aulas(id_curso, valor.get("aulas", {}))
+
+    def __delitem__(self, id_curso):
+        posicao = self._posicao(id_curso)
+        del self._dados[posicao - 1:posicao + 1]
+        if self._aulas:
+            self._aulas.pop(id_curso, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([id_curso for id_curso, _ in self._posicoes()])
+
+    def __len__(self) -> int:
+        return len(self._dados) // 2
+
+    def setdefault(self, id_curso, padrao=None) -> ProgressoCurso:
+        if id_curso not in self:
+            self[id_curso] = padrao or {}
+        return self[id_curso]
+
+    def __repr__(self) -> str:
+        return repr(self.para_json())
+
+    def __reduce__(self):
+        return Progresso.de_json, (self.para_json(),)
+
+
+# ========== CERTIFICADOS ==========
+class Certificado(Registro):
+    __slots__ = ("curso", "codigo", "data", "caminho")
+    ENTRADA = {"curso": _texto_comum, "data": _instante}
+    LEITURA = {"data": _iso}
+    SAIDA = {"data": _iso}
+
+
+class Certificados(list):
+    """Lista de `Certificado`; dicionários acrescentados viram registros compactos"""
+    __slots__ = ()
+
+    @classmethod
+    def de_json(cls, certificados):
+        if isinstance(certificados, cls):
+            return certificados
+        if not isinstance(certificados, list) or not all(isinstance(c, dict) for c in certificados):
+            return copy.deepcopy(certificados)
+        return cls(Certificado.de_json(c) for c in certificados)
+
+    def append(self, certificado):
+        super().append(Certificado.de_json(certificado))
+
+    def extend(self, certificados):
+        super().extend(Certificado.de_json(c) for c in certificados)
+
+    def insert(self, posicao: int, certificado):
+        super().insert(posicao, Certificado.de_json(certificado))
+
+    def __reduce__(self):
+        return Certificados.de_json, (para_json(list(self)),)
+
+
+# ========== USUÁRIO ==========
+class Usuario(Registro):
+    """Usuário de dados_usuarios.json (senha, email, idade, is_admin, data_cadastro, cursos...)"""
+    __slots__ = ("senha", "email", "idade", "is_admin", "data_cadastro", "cursos",
+                 "progresso", "certificados", "_versao")
+    ENTRADA = {
+        "data_cadastro": _instante,
+        "cursos": Matriculas.de_lista,
+        "progresso": Progresso.de_json,
+        "certificados": Certificados.de_json,
+    }
+    LEITURA = {"data_cadastro": _iso}
+    SAIDA = {"data_cadastro": _iso}
+
+
+# ========== CURSO ==========
+class Modulo(Registro):
+    __slots__ = ("id", "nome", "criado_por", "data_criacao", "aulas")
+    ENTRADA = {"criado_por": _texto_comum, "data_criacao": _instante}
+    LEITURA = {"data_criacao": _iso}
+    SAIDA = {"data_criacao": _iso}
+
+
+def _modulos(modulos):
+    if not isinstance(modulos, list):
+        return modulos
+    return [Modulo.de_json(m) if isinstance(m, dict) else m for m in modulos]
+
+
+class Curso(Registro):
+    """Curso de cursos.json; os módulos viram `Modulo` (os incluídos na sessão ficam dict)"""
+    __slots__ = ("nome", "carga_horaria", "modulos", "proximo_id_modulo", "criado_por",
+                 "data_criacao", "_versao")
+    ENTRADA = {"carga_horaria": _texto_comum, "modulos": _modulos,
+               "criado_por": _texto_comum, "data_criacao": _instante}
+    LEITURA = {"data_criacao": _iso}
+    SAIDA = {"data_criacao": _iso}
@@ -2,7 +2,9 @@ import json
 import os
 from datetime import datetime
 from usuarios.usuarios import get_usuario_logado, eh_admin, registrar_log
-from cursos.cursos import cursos_disponiveis, salvar_cursos
+from cursos.cursos import cursos_disponiveis, salvar_cursos, alunos_do_curso, indexar_curso, buscar_catalogo
+from modulos.progresso import novo_id_modulo, invalidar_curso
+from metricas.metricas import contar
 
 
 # ========== CONFIGURAÇÕES ==========
@@ -56,6 +58,68 @@ def tela_modulos():
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
             input("Pressione Enter para continuar...")
 
+# ========== OPERAÇÕES (sem input) ==========
+def _modulos_do_curso(id_curso: str) -> list:
+    if id_curso not in cursos_disponiveis:
+        raise ValueError("Curso não encontrado!")
+    return cursos_disponiveis[id_curso]["modulos"]
+
+def _validar_indice(modulos: list, indice: int):
+    if not 0 <= indice < len(modulos):
+        raise ValueError("Módulo não encontrado!")
+
+def incluir_modulo(id_curso: str, nome: str, autor: str = None) -> dict:
+    """Acrescenta um módulo ao curso e devolve o registro criado"""
+    modulos = _modulos_do_curso(id_curso)
+    if not nome.strip():
+        raise ValueError("Nome não pode ser vazio!")
+    novo_modulo = {
+        "id": novo_id_modulo(cursos_disponiveis[id_curso]),
+        "nome": nome.strip(),
+        "criado_por": autor or get_usuario_logado()["nome"],
+        "data_criacao": datetime.now().isoformat(),
+        "aulas": []
+    }
+    modulos.append(novo_modulo)
+    indexar_curso(id_curso)
+    salvar_cursos([id_curso])
+    invalidar_curso(id_curso)
+    contar("modulos.adicionados")
+    registrar_log("Módulo adicionado",
+                 f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {novo_modulo['nome']}")
+    return novo_modulo
+
+def renomear_modulo(id_curso: str, indice: int, nome: str, autor: str = None) -> dict:
+    """Troca o nome do módulo na posição `indice` (0 = primeiro)"""
+    modulos = _modulos_do_curso(id_curso)
+    _validar_indice(modulos, indice)
+    if not nome.strip():
+        raise ValueError("Nome não pode ser vazio!")
+    modulo = modulos[indice]
+    modulo["nome"] = nome.strip()
+    modulo["ultima_edicao"] = {
+        "por": autor or get_usuario_logado()["nome"],
+        "em": datetime.now().isoformat()
+    }
+    indexar_curso(id_curso)
+    salvar_cursos([id_curso])
+    contar("modulos.editados")
+    registrar_log("Módulo editado", f"ID Curso: {id_curso} | Novo nome: {modulo['nome']}")
+    return modulo
+
+def excluir_modulo(id_curso: str, indice: int) -> dict:
+    """Remove o módulo na posição `indice` e devolve o registro removido"""
+    modulos = _modulos_do_curso(id_curso)
+    _validar_indice(modulos, indice)
+    modulo_removido = modulos.pop(indice)
+    indexar_curso(id_curso)
+    salvar_cursos([id_curso])
+    invalidar_curso(id_curso)
+    contar("modulos.removidos")
+    registrar_log("Módulo removido",
+                 f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {modulo_removido['nome']}")
+    return modulo_removido
+
 # ========== OPERAÇÕES DE MÓDULOS ==========
 def adicionar_modulo():
     """Adiciona novo módulo a um curso existente"""
@@ -77,18 +141,7 @@ def adicionar_modulo():
         return
     
     try:
-        novo_modulo = {
-            "nome": nome_modulo,
-            "criado_por": get_usuario_logado["nome"],
-            "data_criacao": datetime.now().isoformat(),
-            "aulas": []
-        }
-        
-        cursos_disponiveis[id_curso]["modulos"].append(novo_modulo)
-        salvar_cursos()
-        
-        registrar_log("Módulo adicionado", 
-                     f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {nome_modulo}")
+        incluir_modulo(id_curso, nome_modulo)
         print(f"\n{COR_SUCESSO}✅ Módulo adicionado com sucesso!{RESET_COR}")
     except Exception as e:
         print(f"{COR_ERRO}❌ Erro ao adicionar módulo: {e}{RESET_COR}")
@@ -111,13 +164,7 @@ def editar_modulo():
         novo_nome = input(f"Novo nome [{modulo['nome']}]: ").strip()
         
         if novo_nome:
-            cursos_disponiveis[id_curso]["modulos"][idx_modulo]["nome"] = novo_nome
-            cursos_disponiveis[id_curso]["modulos"][idx_modulo]["ultima_edicao"] = {
-                "por": get_usuario_logado["nome"],
-                "em": datetime.now().isoformat()
-            }
-            salvar_cursos()
-            registrar_log()("Módulo editado", f"ID Curso: {id_curso} | Novo nome: {novo_nome}")
+            renomear_modulo(id_curso, idx_modulo, novo_nome)
             print(f"\n{COR_SUCESSO}✅ Módulo atualizado!{RESET_COR}")
         else:
             print(f"{COR_ALERTA}⚠️ Nenhuma alteração realizada.{RESET_COR}")
@@ -136,13 +183,13 @@ def remover_modulo():
     
     try:
         modulo = cursos_disponiveis[id_curso]["modulos"][idx_modulo]
+        if matriculados := len(alunos_do_curso(id_curso)):
+            print(f"{COR_ALERTA}⚠️ {matriculados} aluno(s) matriculado(s) neste curso "
+                  f"deixarão de ver este módulo no progresso.{RESET_COR}")
         confirmacao = input(f"\nTem certeza que deseja remover '{modulo['nome']}'? (S/N): ").upper()
         
         if confirmacao == 'S':
-            modulo_removido = cursos_disponiveis[id_curso]["modulos"].pop(idx_modulo)
-            salvar_cursos()
-            registrar_log()("Módulo removido", 
-                         f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {modulo_removido['nome']}")
+            excluir_modulo(id_curso, idx_modulo)
             print(f"\n{COR_SUCESSO}✅ Módulo removido com sucesso!{RESET_COR}")
         else:
             print(f"{COR_ALERTA}❌ Operação cancelada.{RESET_COR}")
@@ -168,13 +215,30 @@ def listar_modulos_por_curso():
     finally:
         input("\nPressione Enter para continuar...")
 
+def _selecionar_da_busca(consulta: str):
+    """Módulos que casam com a consulta, em ordem de relevância; devolve (id_curso, índice)"""
+    achados = [r for r in buscar_catalogo(consulta) if r["tipo"] == "modulo"]
+    if not achados:
+        print(ERRO_MODULO_NAO_ENCONTRADO)
+        return None, None
+    for numero, r in enumerate(achados, 1):
+        print(f"{numero}. {r['titulo']} (curso {r['curso']})")
+    escolha = int(input("\nNúmero do módulo: ")) - 1
+    if not 0 <= escolha < len(achados):
+        raise ValueError("Índice inválido")
+    return achados[escolha]["curso"], achados[escolha]["modulo"]
+
 def selecionar_modulo():
-    """Seleciona um módulo específico com validação reforçada"""
+    """Seleciona um módulo pelo ID do curso ou buscando pelo nome (validação reforçada)"""
     from cursos.cursos import listar_cursos
     
     try:
-        listar_cursos()
-        id_curso = input("\nID do curso: ").strip()
+        id_curso = input("\nID do curso ou busca (Enter lista os cursos): ").strip()
+        if not id_curso:
+            listar_cursos()
+            id_curso = input("\nID do curso: ").strip()
+        elif id_curso not in cursos_disponiveis:
+            return _selecionar_da_busca(id_curso)
         
         if id_curso not in cursos_disponiveis:
             print(ERRO_CURSO_NAO_ENCONTRADO)
@@ -0,0 +1,260 @@
+# modulos/progresso.py
+from typing import Dict, List, Optional, Tuple
+
+from usuarios.usuarios import get_usuario_logado, get_usuarios_cadastrados, salvar_usuario, registrar_log
+from cursos.cursos import cursos_disponiveis, salvar_cursos
+from metricas.metricas import cronometrar
+
+
+# ========== CONFIGURAÇÕES ==========
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+COR_TITULO = "\033[1;36m"
+COR_ALERTA = "\033[1;33m"
+RESET_COR = "\033[0m"
+
+# Máscara de todos os módulos de cada curso: id_curso -> (mascara, total, assinatura do curso)
+_mascaras: Dict[str, Tuple[int, int, Tuple[int, int, int]]] = {}
+
+
+# ========== IDS ESTÁVEIS DOS MÓDULOS ==========
+def novo_id_modulo(curso: Dict) -> int:
+    """Reserva o próximo ID do curso (IDs nunca são reaproveitados)"""
+    garantir_ids(curso)
+    novo_id = curso.get("proximo_id_modulo", 0)
+    curso["proximo_id_modulo"] = novo_id + 1
+    return novo_id
+
+def garantir_ids(curso: Dict) -> bool:
+    """Dá ID aos módulos antigos que ainda não têm; retorna True se mudou algo"""
+    alterado = False
+    proximo = curso.get("proximo_id_modulo",
+                        max((m["id"] for m in curso["modulos"] if "id" in m), default=-1) + 1)
+    for modulo in curso["modulos"]:
+        if "id" not in modulo:
+            modulo["id"] = proximo
+            proximo += 1
+            alterado = True
+    if curso.get("proximo_id_modulo") != proximo:
+        curso["proximo_id_modulo"] = proximo
+        alterado = True
+    return alterado
+
+def invalidar_curso(id_curso: str):
+    """Chamar sempre que módulos forem adicionados/removidos"""
+    _mascaras.pop(id_curso, None)
+
+def _assinatura(curso: Dict) -> Tuple[int, int, int]:
+    """Muda sempre que o conjunto de módulos muda, em qualquer armazenamento: IDs
+    não são reaproveitados, então incluir aumenta o proximo_id_modulo e remover
+    diminui a quantidade. `_versao` (só nos modos JSON) pega as gravações de
+    outros terminais."""
+    return curso.get("_versao", 0), curso.get("proximo_id_modulo", -1), len(curso["modulos"])
+
+def mascara_curso(id_curso: str) -> Tuple[int, int]:
+    """(bits de todos os módulos, quantidade) do curso, recalculado só quando os módulos mudam"""
+    curso = cursos_disponiveis[id_curso]
+    em_cache = _mascaras.get(id_curso)
+    if em_cache is None or em_cache[2] != _assinatura(curso):
+        if garantir_ids(curso):
+            salvar_cursos([id_curso])
+        mascara = 0
+        for modulo in curso["modulos"]:
+            mascara |= 1 << modulo["id"]
+        _mascaras[id_curso] = (mascara, len(curso["modulos"]), _assinatura(curso))
+    return _mascaras[id_curso][:2]
+
+def modulo_existe(id_curso: str, id_modulo: int) -> bool:
+    """O ID é de um módulo atual do curso; testa o bit sem `1 << id_modulo` (um ID
+    enorme vindo de fora alocaria um inteiro do tamanho dele)"""
+    if id_curso not in cursos_disponiveis:
+        return False
+    mascara, _ = mascara_curso(id_curso)  # Garante os IDs e o proximo_id_modulo
+    if not 0 <= id_modulo < cursos_disponiveis[id_curso].get("proximo_id_modulo", 0):
+        return False
+    return bool(mascara >> id_modulo & 1)
+
+def _modulo(id_curso: str, id_modulo: int) -> Dict:
+    if not modulo_existe(id_curso, id_modulo):
+        raise ValueError("Módulo não encontrado!")
+    return next(m for m in cursos_disponiveis[id_curso]["modulos"] if m["id"] == id_modulo)
+
+
+# ========== PROGRESSO DO ALUNO ==========
+def _progresso(dados_usuario: Dict, id_curso: str) -> Dict:
+    return dados_usuario.setdefault("progresso", {}).setdefault(
+        id_curso, {"modulos": 0, "aulas": {}})
+
+@cronometrar("progresso.marcar_modulo")
+def marcar_modulo(nome: str, id_curso: str, id_modulo: int, concluido: bool = True):
+    """Marca/desmarca um módulo como concluído para o aluno"""
+    modulo = _modulo(id_curso, id_modulo)
+    dados = get_usuarios_cadastrados()[nome]
+    progresso = _progresso(dados, id_curso)
+    if concluido:
+        progresso["modulos"] |= 1 << id_modulo
+    else:
+        progresso["modulos"] &= ~(1 << id_modulo)
+    salvar_usuario(nome)
+    registrar_log("Módulo concluído" if concluido else "Módulo desmarcado",
+                  f"Curso: {id_curso} | Módulo: {modulo['nome']}")
+
+@cronometrar("progresso.marcar_aula")
+def marcar_aula(nome: str, id_curso: str, id_modulo: int, indice_aula: int,
+                concluida: bool = True) -> bool:
+    """Marca/desmarca uma aula (0 = primeira). Com todas as aulas feitas o módulo
+    conclui; desmarcar uma aula desfaz a conclusão. Retorna se o módulo está concluído."""
+    modulo = _modulo(id_curso, id_modulo)
+    titulos = modulo.get("aulas", [])
+    if not 0 <= indice_aula < len(titulos):  # Módulo sem aulas não tem o que marcar
+        raise ValueError("Aula não encontrada!")
+    dados = get_usuarios_cadastrados()[nome]
+    progresso = _progresso(dados, id_curso)
+    chave = str(id_modulo)
+    aulas = progresso["aulas"].get(chave, 0)
+    if concluida:
+        aulas |= 1 << indice_aula
+    else:
+        aulas &= ~(1 << indice_aula)
+    if aulas:
+        progresso["aulas"][chave] = aulas
+    else:
+        progresso["aulas"].pop(chave, None)
+    todas = (1 << len(titulos)) - 1  # Bits de aulas que já não existem não contam
+    if aulas & todas == todas:
+        progresso["modulos"] |= 1 << id_modulo
+    elif not concluida:
+        progresso["modulos"] &= ~(1 << id_modulo)
+    salvar_usuario(nome)
+    registrar_log("Aula concluída" if concluida else "Aula desmarcada",
+                  f"Curso: {id_curso} | Módulo: {modulo['nome']} | Aula: {titulos[indice_aula]}")
+    return bool(progresso["modulos"] >> id_modulo & 1)
+
+def bits_aulas(dados_usuario: Dict, id_curso: str, id_modulo: int) -> int:
+    """Bits das aulas concluídas de um módulo (0 se nenhuma)"""
+    progresso = dados_usuario.get("progresso", {}).get(id_curso)
+    return progresso["aulas"].get(str(id_modulo), 0) if progresso else 0
+
+def bits_concluidos(dados_usuario: Dict, id_curso: str) -> Optional[int]:
+    """Bits dos módulos concluídos, ou None se o aluno não tem progresso registrado"""
+    progresso = dados_usuario.get("progresso", {}).get(id_curso)
+    return progresso["modulos"] if progresso else None
+
+@cronometrar("progresso.curso_concluido")
+def curso_concluido(nome: str, id_curso: str, usuarios: Optional[Dict] = None) -> bool:
+    """O(1): compara os bits do aluno com a máscara do curso"""
+    usuarios = usuarios if usuarios is not None else get_usuarios_cadastrados()
+    if nome not in usuarios or id_curso not in cursos_disponiveis:
+        return False
+    mascara, total = mascara_curso(id_curso)
+    if not total:  # Curso sem módulos não tem o que concluir
+        return False
+    bits = bits_concluidos(usuarios[nome], id_curso)
+    if bits is None:
+        # Formato antigo: lista de módulos concluídos
+        concluidos = usuarios[nome].get("modulos_concluidos", {}).get(id_curso, [])
+        return len(concluidos) == total
+    return bits & mascara == mascara
+
+def percentual(nome: str, id_curso: str, usuarios: Optional[Dict] = None) -> float:
+    """Porcentagem de módulos concluídos (0 a 100)"""
+    usuarios = usuarios if usuarios is not None else get_usuarios_cadastrados()
+    mascara, total = mascara_curso(id_curso)
+    if not total:
+        return 100.0
+    bits = bits_concluidos(usuarios[nome], id_curso) or 0
+    return (bits & mascara).bit_count() * 100 / total
+
+def resumo_curso(id_curso: str, nomes: List[str]) -> Dict[str, float]:
+    """Percentual de vários alunos de uma vez (para painéis e emissão em lote)"""
+    usuarios = get_usuarios_cadastrados()
+    return {nome: percentual(nome, id_curso, usuarios) for nome in nomes if nome in usuarios}
+
+
+# ========== INTERFACE ==========
+def barra(pct: float, largura: int = 20) -> str:
+    cheios = int(pct * largura / 100)
+    return "█" * cheios + "░" * (largura - cheios)
+
+def tela_progresso():
+    """Progresso do aluno logado: resumo por curso e marcação de módulos"""
+    usuario = get_usuario_logado()
+    if not usuario:
+        print(f"{COR_ERRO}⚠️ Faça login primeiro!{RESET_COR}")
+        return
+    nome = usuario["nome"]
+
+    while True:
+        matriculas = [c for c in get_usuarios_cadastrados()[nome].get("cursos", [])
+                      if c in cursos_disponiveis]
+        print(f"\n{COR_TITULO}=== MEU PROGRESSO ===")
+        if not matriculas:
+            print(f"{COR_ALERTA}⚠️ Você não está matriculado em nenhum curso!{RESET_COR}")
+            return
+        for id_curso in matriculas:
+            pct = percentual(nome, id_curso)
+            print(f"{id_curso}. {cursos_disponiveis[id_curso]['nome']}  {barra(pct)} {pct:.0f}%")
+        print("="*40 + RESET_COR)
+
+        id_curso = input("\nID do curso para marcar módulos (Enter volta): ").strip()
+        if not id_curso:
+            break
+        if id_curso not in matriculas:
+            print(f"{COR_ERRO}❌ Curso não encontrado nas suas matrículas!{RESET_COR}")
+            continue
+        tela_modulos_do_curso(nome, id_curso)
+
+def tela_modulos_do_curso(nome: str, id_curso: str):
+    curso = cursos_disponiveis[id_curso]
+    mascara_curso(id_curso)  # Garante IDs nos módulos antigos
+    if not curso["modulos"]:
+        print(f"{COR_ALERTA}⚠️ Este curso ainda não tem módulos.{RESET_COR}")
+        return
+
+    bits = bits_concluidos(get_usuarios_cadastrados()[nome], id_curso) or 0
+    print(f"\n{COR_TITULO}=== {curso['nome']} ===")
+    for idx, modulo in enumerate(curso["modulos"], 1):
+        feito = "✅" if bits & (1 << modulo["id"]) else "⬜"
+        print(f"{idx}. {feito} {modulo['nome']}")
+    print("="*40 + RESET_COR)
+
+    try:
+        idx = int(input("Número do módulo para marcar/desmarcar: ")) - 1
+        if not 0 <= idx < len(curso["modulos"]):
+            raise ValueError
+    except ValueError:
+        print(f"{COR_ERRO}❌ Digite um número válido da lista!{RESET_COR}")
+        return
+
+    modulo = curso["modulos"][idx]
+    if modulo.get("aulas"):
+        tela_aulas_do_modulo(nome, id_curso, modulo)
+        return
+    concluido = not bits & (1 << modulo["id"])
+    marcar_modulo(nome, id_curso, modulo["id"], concluido)
+    print(f"{COR_SUCESSO}✅ Progresso atualizado!{RESET_COR}")
+
+def tela_aulas_do_modulo(nome: str, id_curso: str, modulo: Dict):
+    """Marca uma aula do módulo (ou o módulo inteiro)"""
+    aulas = bits_aulas(get_usuarios_cadastrados()[nome], id_curso, modulo["id"])
+    print(f"\n{COR_TITULO}=== {modulo['nome']} ===")
+    for idx, titulo in enumerate(modulo["aulas"], 1):
+        feito = "✅" if aulas >> (idx - 1) & 1 else "⬜"
+        print(f"{idx}. {feito} {titulo}")
+    print("="*40 + RESET_COR)
+
+    escolha = input("Número da aula para marcar/desmarcar (Enter marca o módulo inteiro): ").strip()
+    try:
+        if not escolha:
+            bits = bits_concluidos(get_usuarios_cadastrados()[nome], id_curso) or 0
+            marcar_modulo(nome, id_curso, modulo["id"], not bits >> modulo["id"] & 1)
+        else:
+            idx = int(escolha) - 1
+            if not 0 <= idx < len(modulo["aulas"]):
+                raise ValueError
+            if marcar_aula(nome, id_curso, modulo["id"], idx, not aulas >> idx & 1):
+                print(f"{COR_SUCESSO}🎉 Módulo concluído!{RESET_COR}")
+    except ValueError:
+        print(f"{COR_ERRO}❌ Digite um número válido da lista!{RESET_COR}")
+        return
+    print(f"{COR_SUCESSO}✅ Progresso atualizado!{RESET_COR}")
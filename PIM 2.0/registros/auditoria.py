@@ -0,0 +1,321 @@
+# registros/auditoria.py
+import gzip
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from registros.leitor_legado import tela_log_legado
+from repositorio.armazem_json import trava_arquivo
+
+
+# ========== CONFIGURAÇÕES ==========
+PASTA_AUDITORIA = "auditoria"
+ARQUIVO_ATUAL = "atual.jsonl"
+TAMANHO_MAXIMO_SEGMENTO = 20 * 1024 * 1024  # Rotaciona ao passar disso ou ao virar o dia
+COR_LOG = "\033[0;36m"
+COR_ERRO = "\033[1;33m"
+RESET_COR = "\033[0m"
+
+
+def _indice_vazio() -> Dict:
+    return {"inicio": None, "fim": None, "total": 0, "usuarios": {}, "acoes": {}}
+
+
+def _indexar(indice: Dict, registro: Dict):
+    """Atualiza o índice de um segmento com mais um registro"""
+    if indice["inicio"] is None:
+        indice["inicio"] = registro["ts"]
+    indice["fim"] = registro["ts"]
+    indice["total"] += 1
+    indice["usuarios"][registro["usuario"]] = indice["usuarios"].get(registro["usuario"], 0) + 1
+    indice["acoes"][registro["acao"]] = indice["acoes"].get(registro["acao"], 0) + 1
+
+
+class LogAuditoria:
+    """Log estruturado: um objeto JSON por linha, rotacionado em segmentos .gz.
+
+    Cada segmento fechado tem um índice ao lado (.idx.json) com o intervalo de
+    tempo e as contagens por usuário e por ação, então uma consulta só abre os
+    segmentos que podem ter resultado.
+
+    Vários processos podem usar a mesma pasta: anexar e rotacionar acontecem
+    sob a trava de arquivo de `atual.jsonl`, e antes de usar o índice do
+    segmento atual cada processo o acerta com o disco (`_conferir`), já que
+    outro pode ter anexado registros ou rotacionado o arquivo.
+    """
+
+    def __init__(self, pasta: str = PASTA_AUDITORIA,
+                 tamanho_maximo: int = TAMANHO_MAXIMO_SEGMENTO):
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        self.caminho_atual = os.path.join(pasta, ARQUIVO_ATUAL)
+        os.makedirs(pasta, exist_ok=True)
+        self._trava = threading.RLock()
+        self._esquecer_atual()
+        with self._travado(exclusiva=False):
+            self._conferir()
+
+    @contextmanager
+    def _travado(self, exclusiva: bool = True):
+        """Trava entre threads deste processo e entre processos (arquivo .lock)"""
+        with self._trava, trava_arquivo(self.caminho_atual, exclusiva):
+            yield
+
+    def _esquecer_atual(self):
+        self.indice_atual = _indice_vazio()
+        self.tamanho_atual = 0  # Bytes do atual.jsonl já indexados
+        self._inode = None
+        self._primeira_linha = b""  # Distingue um atual.jsonl novo que reaproveitou o inode
+
+    def _conferir(self):
+        """Acerta o índice do segmento atual com o disco (chamar com a trava)"""
+        try:
+            f = open(self.caminho_atual, 'rb')
+        except FileNotFoundError:  # Rotacionado por outro processo e ainda sem registros
+            self._esquecer_atual()
+            return
+        with f:
+            info = os.fstat(f.fileno())
+            primeira = f.readline()
+            mesmo_arquivo = info.st_ino == self._inode and primeira == self._primeira_linha
+            if mesmo_arquivo and info.st_size == self.tamanho_atual:
+                return  # Ninguém mexeu
+            if not mesmo_arquivo or info.st_size < self.tamanho_atual:
+                self._esquecer_atual()  # Outro arquivo: reindexa do começo
+                self._inode, self._primeira_linha = info.st_ino, primeira
+            f.seek(self.tamanho_atual)
+            novos = f.read()
+        completos = novos[:novos.rfind(b"\n") + 1]  # Uma linha sem fim (queda) fica de fora
+        for linha in completos.splitlines():
+            try:
+                _indexar(self.indice_atual, json.loads(linha))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+        self.tamanho_atual += len(completos)
+
+    # ========== ESCRITA ==========
+    def gravar_lote(self, entradas: List[Dict], fsync: bool = False):
+        """Destino do escritor assíncrono: grava um lote de entradas"""
+        with self._travado():
+            self._conferir()
+            linhas = []
+            for entrada in entradas:
+                registro = {
+                    "ts": entrada["timestamp"].isoformat(timespec="seconds"),
+                    "usuario": entrada["usuario"],
+                    "acao": entrada["acao"],
+                    "detalhes": entrada["detalhes"],
+                }
+                if self._precisa_rotacionar(registro, linhas):
+                    self._anexar(linhas, fsync)
+                    linhas = []
+                    self._rotacionar()
+                _indexar(self.indice_atual, registro)
+                linhas.append(json.dumps(registro, ensure_ascii=False) + "\n")
+            self._anexar(linhas, fsync)
+
+    def _precisa_rotacionar(self, registro: Dict, pendentes: List[str]) -> bool:
+        inicio = self.indice_atual["inicio"]
+        if inicio is None:
+            return False
+        if inicio[:10] != registro["ts"][:10]:
+            return True
+        return self.tamanho_atual + sum(len(l) for l in pendentes) >= self.tamanho_maximo
+
+    def _anexar(self, linhas: List[str], fsync: bool):
+        if not linhas:
+            return
+        dados = "".join(linhas).encode('utf-8')
+        with open(self.caminho_atual, 'ab') as f:
+            f.write(dados)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+            if self._inode is None:  # Arquivo criado agora
+                self._inode = os.fstat(f.fileno()).st_ino
+                self._primeira_linha = dados[:dados.find(b"\n") + 1]
+        self.tamanho_atual += len(dados)
+
+    def rotacionar(self):
+        """Fecha o segmento atual em .jsonl.gz com o índice ao lado"""
+        with self._travado():
+            self._conferir()
+            self._rotacionar()
+
+    def _rotacionar(self):
+        if not os.path.exists(self.caminho_atual) or self.indice_atual["total"] == 0:
+            return
+        base = datetime.fromisoformat(self.indice_atual["inicio"]).strftime("%Y%m%d-%H%M%S")
+        sequencia = 1
+        nome = f"{base}-{sequencia:03d}"
+        while os.path.exists(os.path.join(self.pasta, nome + ".jsonl.gz")):
+            sequencia += 1
+            nome = f"{base}-{sequencia:03d}"
+        destino = os.path.join(self.pasta, nome + ".jsonl.gz")
+        with open(self.caminho_atual, 'rb') as origem, gzip.open(destino + ".tmp", 'wb') as saida:
+            while bloco := origem.read(1024 * 1024):
+                saida.write(bloco)
+        os.replace(destino + ".tmp", destino)
+        with open(os.path.join(self.pasta, nome + ".idx.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.indice_atual, f, ensure_ascii=False)
+        os.remove(self.caminho_atual)
+        self._esquecer_atual()
+
+    # ========== CONSULTA ==========
+    def segmentos(self) -> List[Dict]:
+        """Índices de todos os segmentos (fechados + atual), do mais antigo ao mais novo"""
+        lista = []
+        with self._travado(exclusiva=False):  # Sem uma rotação no meio da listagem
+            self._conferir()
+            for nome in os.listdir(self.pasta):
+                if nome.endswith(".idx.json"):
+                    with open(os.path.join(self.pasta, nome), 'r', encoding='utf-8') as f:
+                        indice = json.load(f)
+                    indice["arquivo"] = os.path.join(self.pasta, nome[:-len(".idx.json")] + ".jsonl.gz")
+                    lista.append(indice)
+            atual = dict(self.indice_atual, usuarios=dict(self.indice_atual["usuarios"]),
+                         acoes=dict(self.indice_atual["acoes"]), arquivo=self.caminho_atual)
+        lista.sort(key=lambda i: (i["inicio"], i["arquivo"]))
+        if atual["total"]:
+            lista.append(atual)
+        return lista
+
+    @staticmethod
+    def _pode_conter(indice: Dict, inicio: Optional[str], fim: Optional[str],
+                     usuario: Optional[str], acao: Optional[str]) -> bool:
+        if inicio and indice["fim"] < inicio:
+            return False
+        if fim and indice["inicio"] > fim:
+            return False
+        if usuario and usuario not in indice["usuarios"]:
+            return False
+        if acao and acao not in indice["acoes"]:
+            return False
+        return True
+
+    @staticmethod
+    def _ler_linhas(caminho: str) -> Iterator[Dict]:
+        abrir = gzip.open if caminho.endswith(".gz") else open
+        try:
+            f = abrir(caminho, 'rt', encoding='utf-8')
+        except FileNotFoundError:  # Ex.: atual.jsonl rotacionado por outro processo agora
+            return
+        with f:
+            for linha in f:
+                try:
+                    yield json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+
+    def consultar(self, inicio: Optional[str] = None, fim: Optional[str] = None,
+                  usuario: Optional[str] = None, acao: Optional[str] = None,
+                  limite: Optional[int] = None) -> List[Dict]:
+        """Registros que batem com os filtros, em ordem cronológica.
+
+        `inicio`/`fim` são datas ISO (prefixos como "2025-05-22" funcionam).
+        Com `limite`, devolve só os N mais recentes lendo os segmentos do
+        mais novo para o mais antigo e parando assim que completar.
+        """
+        if fim and len(fim) == 10:
+            fim += "T23:59:59"
+        resultado: List[Dict] = []
+        for indice in reversed(self.segmentos()):
+            if limite is not None and len(resultado) >= limite:
+                break
+            if not self._pode_conter(indice, inicio, fim, usuario, acao):
+                continue
+            restante = None if limite is None else limite - len(resultado)
+            encontrados = deque(maxlen=restante)
+            for registro in self._ler_linhas(indice["arquivo"]):
+                if inicio and registro["ts"] < inicio:
+                    continue
+                if fim and registro["ts"] > fim:
+                    continue
+                if usuario and registro["usuario"] != usuario:
+                    continue
+                if acao and registro["acao"] != acao:
+                    continue
+                encontrados.append(registro)
+            resultado = list(encontrados) + resultado
+        return resultado
+
+    def ultimos(self, quantidade: int) -> List[Dict]:
+        return self.consultar(limite=quantidade)
+
+    def acoes_conhecidas(self) -> List[str]:
+        acoes = set()
+        for indice in self.segmentos():
+            acoes.update(indice["acoes"])
+        return sorted(acoes)
+
+
+# ========== ACESSO GLOBAL ==========
+_auditoria = None
+
+def get_auditoria() -> LogAuditoria:
+    global _auditoria
+    if _auditoria is None:
+        _auditoria = LogAuditoria()
+    return _auditoria
+
+
+# ========== INTERFACE ==========
+def imprimir_registros(registros: List[Dict]):
+    if not registros:
+        print("Nenhum registro encontrado")
+        return
+    for r in registros:
+        print(f"[{r['ts'].replace('T', ' ')}] Usuário: {r['usuario']}")
+        print(f"Ação: {r['acao']}")
+        print(f"Detalhes: {r['detalhes']}")
+        print("-"*50)
+
+def tela_auditoria(caminho_legado: Optional[str] = None):
+    """Consulta do log estruturado (últimos, período, usuário e ação)"""
+    auditoria = get_auditoria()
+    while True:
+        print(f"\n{COR_LOG}=== REGISTROS DE LOG ===")
+        print("1. 🕒 Últimos registros")
+        print("2. 📅 Por período")
+        print("3. 👤 Por usuário")
+        print("4. ⚙️ Por ação")
+        if caminho_legado and os.path.exists(caminho_legado):
+            print("5. 📜 Log antigo (texto)")
+        print("0. ↩ VOLTAR")
+        print("="*25 + RESET_COR)
+
+        escolha = input("Escolha: ").strip()
+
+        try:
+            if escolha == '1':
+                quantidade = int(input("Quantos registros? [50]: ").strip() or 50)
+                registros = auditoria.ultimos(quantidade)
+            elif escolha == '2':
+                inicio = input("Data inicial (AAAA-MM-DD): ").strip() or None
+                fim = input("Data final (AAAA-MM-DD): ").strip() or None
+                registros = auditoria.consultar(inicio=inicio, fim=fim, limite=500)
+            elif escolha == '3':
+                usuario = input("Usuário: ").strip()
+                registros = auditoria.consultar(usuario=usuario, limite=500)
+            elif escolha == '4':
+                print("Ações registradas: " + ", ".join(auditoria.acoes_conhecidas()))
+                acao = input("Ação: ").strip()
+                registros = auditoria.consultar(acao=acao, limite=500)
+            elif escolha == '5' and caminho_legado and os.path.exists(caminho_legado):
+                tela_log_legado(caminho_legado)
+                continue
+            elif escolha == '0':
+                break
+            else:
+                print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
+                continue
+        except ValueError:
+            print(f"{COR_ERRO}❌ Digite um número válido!{RESET_COR}")
+            continue
+
+        print(f"\n{COR_LOG}=== RESULTADO ({len(registros)}) ===")
+        imprimir_registros(registros)
+        print("="*50 + RESET_COR)
@@ -0,0 +1,160 @@
+# registros/leitor_legado.py
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# ========== CONFIGURAÇÕES ==========
+TAMANHO_BLOCO = 64 * 1024   # Bytes lidos por vez, de trás para frente
+ENTRADAS_POR_PAGINA = 20
+COR_LOG = "\033[0;36m"
+COR_ERRO = "\033[1;33m"
+RESET_COR = "\033[0m"
+
+CABECALHO = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] Usuário: (.*)$')
+SEPARADOR = "-" * 50
+
+
+class LeitorLogLegado:
+    """Lê o registro_logs.log de trás para frente, em memória constante.
+
+    Só os blocos de TAMANHO_BLOCO bytes perto do fim do arquivo são lidos,
+    então abrir a tela de log não depende do tamanho total do arquivo. As
+    páginas são marcadas pelo deslocamento (em bytes) do início da entrada.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+
+    def _linhas_reversas(self, f, fim: int) -> Iterator[Tuple[int, bytes]]:
+        """(deslocamento, linha) do fim até o início do arquivo"""
+        posicao = fim
+        resto = b""
+        while posicao > 0:
+            leitura = min(TAMANHO_BLOCO, posicao)
+            posicao -= leitura
+            f.seek(posicao)
+            linhas = (f.read(leitura) + resto).split(b"\n")
+            resto = linhas[0]
+            inicio = posicao + len(resto) + 1
+            completas = []
+            for linha in linhas[1:]:
+                completas.append((inicio, linha))
+                inicio += len(linha) + 1
+            yield from reversed(completas)
+        if resto:
+            yield 0, resto
+
+    def _entradas_reversas(self, fim: Optional[int] = None) -> Iterator[Tuple[int, Dict]]:
+        """(deslocamento, entrada) da mais nova para a mais antiga"""
+        if not os.path.exists(self.caminho):
+            return
+        with open(self.caminho, 'rb') as f:
+            if fim is None:
+                fim = f.seek(0, os.SEEK_END)
+            pendentes: List[str] = []
+            for deslocamento, linha in self._linhas_reversas(f, fim):
+                texto = linha.rstrip(b"\r").decode("utf-8", errors="replace")
+                if not texto:
+                    continue
+                pendentes.append(texto)
+                if CABECALHO.match(texto):
+                    pendentes.reverse()
+                    yield deslocamento, self._montar(pendentes)
+                    pendentes = []
+
+    @staticmethod
+    def _montar(linhas: List[str]) -> Dict:
+        cabecalho = CABECALHO.match(linhas[0])
+        entrada = {"ts": cabecalho.group(1), "usuario": cabecalho.group(2),
+                   "acao": "", "detalhes": ""}
+        detalhes = []
+        fim = len(linhas)
+        for numero, linha in enumerate(linhas[1:], 1):
+            if linha == SEPARADOR:
+                fim = numero
+                break
+            if linha.startswith("Ação: ") and not detalhes:
+                entrada["acao"] = linha[len("Ação: "):]
+            elif linha.startswith("Detalhes: ") and not detalhes:
+                detalhes.append(linha[len("Detalhes: "):])
+            elif detalhes:
+                detalhes.append(linha)  # Detalhes com quebra de linha
+        entrada["detalhes"] = "\n".join(detalhes)
+        entrada["texto"] = "\n".join(linhas[:fim])
+        return entrada
+
+    def pagina(self, antes_de: Optional[int] = None, quantidade: int = ENTRADAS_POR_PAGINA,
+               filtro: Optional[str] = None) -> Tuple[List[Dict], Optional[int]]:
+        """Até `quantidade` entradas anteriores ao deslocamento `antes_de` (None = fim).
+
+        `filtro` é uma expressão regular (como no grep, sem diferenciar
+        maiúsculas) aplicada ao texto da entrada. Devolve as entradas em ordem
+        cronológica e o cursor para a página anterior (None se acabou).
+        """
+        padrao = re.compile(filtro, re.IGNORECASE) if filtro else None
+        encontradas = []
+        cursor = None
+        for deslocamento, entrada in self._entradas_reversas(antes_de):
+            if padrao and not padrao.search(entrada["texto"]):
+                continue
+            encontradas.append(entrada)
+            cursor = deslocamento
+            if len(encontradas) >= quantidade:
+                break
+        else:
+            cursor = None  # Chegou ao início do arquivo
+        if cursor == 0:
+            cursor = None  # A última lida já é a primeira do arquivo
+        encontradas.reverse()
+        return encontradas, cursor
+
+    def ultimas(self, quantidade: int, filtro: Optional[str] = None) -> List[Dict]:
+        return self.pagina(None, quantidade, filtro)[0]
+
+
+# ========== INTERFACE ==========
+def tela_log_legado(caminho: str):
+    """Navega pelo log em texto: últimas entradas, páginas e filtro"""
+    leitor = LeitorLogLegado(caminho)
+    filtro = None
+    cursores: List[Optional[int]] = []  # Pilha para voltar às páginas mais novas
+    atual = None
+
+    while True:
+        try:
+            entradas, anterior = leitor.pagina(atual, filtro=filtro)
+        except re.error as e:
+            print(f"{COR_ERRO}❌ Filtro inválido: {e}{RESET_COR}")
+            filtro = None
+            continue
+
+        print(f"\n{COR_LOG}=== ÚLTIMOS REGISTROS{f' (filtro: {filtro})' if filtro else ''} ===")
+        if not entradas:
+            print("Nenhum registro encontrado")
+        for entrada in entradas:
+            print(entrada["texto"])
+            print(SEPARADOR)
+        print("="*50 + RESET_COR)
+
+        opcoes = []
+        if anterior is not None:
+            opcoes.append("A. ⏪ Mais antigos")
+        if cursores:
+            opcoes.append("P. ⏩ Mais recentes")
+        opcoes += ["F. 🔍 Filtrar", "0. ↩ VOLTAR"]
+        print(" | ".join(opcoes))
+        escolha = input("Escolha: ").strip().upper()
+
+        if escolha == 'A' and anterior is not None:
+            cursores.append(atual)
+            atual = anterior
+        elif escolha == 'P' and cursores:
+            atual = cursores.pop()
+        elif escolha == 'F':
+            filtro = input("Texto ou expressão (vazio limpa o filtro): ").strip() or None
+            cursores, atual = [], None
+        elif escolha == '0':
+            break
+        else:
+            print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
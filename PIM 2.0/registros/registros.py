@@ -0,0 +1,210 @@
+# registros/registros.py
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from metricas.metricas import cronometrar
+
+
+# ========== CONFIGURAÇÕES ==========
+TAMANHO_FILA = 10000      # Entradas pendentes antes de segurar quem registra
+TAMANHO_LOTE = 200        # Grava assim que juntar isso...
+INTERVALO_GRAVACAO = 0.5  # ...ou depois desse tempo (segundos)
+DURABILIDADE = os.environ.get("PIM_LOG_DURABILIDADE", "nenhuma")  # "fsync" força o disco a cada lote
+ARQUIVO_ERROS = "erros.log"  # Para onde vão os lotes que o destino não conseguiu gravar
+
+_FIM = object()
+_DESCARREGAR = object()  # Grava o lote atual sem esperar o intervalo
+
+
+def formatar_texto(entrada: Dict) -> str:
+    """Formato clássico do registro_logs.log (4 linhas + separador)"""
+    return (
+        f"[{entrada['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}] "
+        f"Usuário: {entrada['usuario']}\n"
+        f"Ação: {entrada['acao']}\n"
+        f"Detalhes: {entrada['detalhes']}\n"
+        f"{'-'*50}\n"
+    )
+
+
+class EscritorLogAssincrono:
+    """Fila limitada + thread que grava os registros em lotes.
+
+    Quem registra só enfileira; a thread abre o arquivo uma vez por lote.
+    Se a fila encher, quem registra espera (backpressure) e isso é contado
+    nas métricas. Com `destino`, o lote é entregue a ele em vez de ir para
+    o arquivo em texto (ex.: log de auditoria em JSONL).
+
+    Um erro ao gravar (disco cheio, sem permissão...) não derruba a thread:
+    o lote vai para `erros.log` junto com o erro e a falha é contada nas
+    métricas; só se nem isso for possível as entradas se perdem.
+    """
+
+    def __init__(self, caminho: str, formatar: Callable[[Dict], str] = formatar_texto,
+                 tamanho_fila: int = TAMANHO_FILA, tamanho_lote: int = TAMANHO_LOTE,
+                 intervalo: float = INTERVALO_GRAVACAO, durabilidade: Optional[str] = None,
+                 destino: Optional[Callable[[List[Dict], bool], None]] = None,
+                 arquivo_erros: str = ARQUIVO_ERROS):
+        self.caminho = caminho
+        self.formatar = formatar
+        self.destino = destino
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.durabilidade = durabilidade or DURABILIDADE
+        self.arquivo_erros = arquivo_erros
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self._thread = None
+        self._trava = threading.Lock()
+        # Métricas
+        self.enfileiradas = 0
+        self.gravadas = 0
+        self.lotes = 0
+        self.esperas_fila_cheia = 0
+        self.tempo_espera = 0.0
+        self.maior_fila = 0
+        self.falhas = 0
+        self.desviadas = 0  # Entradas gravadas em erros.log
+        self.perdidas = 0
+        self.ultimo_erro = ""
+
+    def registrar(self, entrada: Dict):
+        """Enfileira uma entrada; só bloqueia se a fila estiver cheia"""
+        self._iniciar()
+        try:
+            self.fila.put_nowait(entrada)
+        except queue.Full:
+            inicio = time.perf_counter()
+            self.fila.put(entrada)
+            self.esperas_fila_cheia += 1
+            self.tempo_espera += time.perf_counter() - inicio
+        self.enfileiradas += 1
+        self.maior_fila = max(self.maior_fila, self.fila.qsize())
+
+    def _iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._trava:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, daemon=True)
+                self._thread.start()
+
+    def _executar(self):
+        lote: List[Dict] = []
+        prazo = time.monotonic() + self.intervalo
+        while True:
+            try:
+                item = self.fila.get(timeout=max(0.0, prazo - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _FIM or item is _DESCARREGAR:
+                self._gravar(lote)
+                self.fila.task_done()
+                if item is _FIM:
+                    return
+                lote = []
+                prazo = time.monotonic() + self.intervalo
+                continue
+            if item is not None:
+                lote.append(item)
+            if len(lote) >= self.tamanho_lote or time.monotonic() >= prazo:
+                self._gravar(lote)
+                lote = []
+                prazo = time.monotonic() + self.intervalo
+
+    @cronometrar("log.gravar_lote")
+    def _gravar(self, lote: List[Dict]):
+        """Grava o lote; nunca levanta exceção (a thread precisa continuar viva)"""
+        if not lote:
+            return
+        try:
+            if self.destino is not None:
+                self.destino(lote, self.durabilidade == "fsync")
+            else:
+                self._anexar(self.caminho, "".join(self.formatar(entrada) for entrada in lote))
+            self.gravadas += len(lote)
+            self.lotes += 1
+        except Exception as e:
+            self.falhas += 1
+            self.ultimo_erro = f"{type(e).__name__}: {e}"
+            self._desviar(lote, e)
+        finally:
+            for _ in lote:  # Sem isso o descarregar() ficaria esperando para sempre
+                self.fila.task_done()
+
+    def _anexar(self, caminho: str, texto: str):
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write(texto)
+            if self.durabilidade == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _desviar(self, lote: List[Dict], erro: Exception):
+        """Guarda em erros.log o lote que o destino recusou"""
+        cabecalho = (f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Falha ao gravar "
+                     f"{len(lote)} registro(s) em {self.caminho}: {type(erro).__name__}: {erro}\n")
+        try:
+            texto = "".join(formatar_texto(entrada) for entrada in lote)
+            self._anexar(self.arquivo_erros, cabecalho + texto)
+            self.desviadas += len(lote)
+        except Exception:
+            self.perdidas += len(lote)
+
+    def descarregar(self):
+        """Espera tudo o que já foi enfileirado chegar ao arquivo"""
+        if self._thread is not None and self._thread.is_alive():
+            self.fila.put(_DESCARREGAR)
+            self.fila.join()
+
+    def encerrar(self):
+        """Grava o que falta e para a thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self.fila.put(_FIM)
+            self._thread.join()
+
+    def metricas(self) -> Dict:
+        return {
+            "enfileiradas": self.enfileiradas,
+            "gravadas": self.gravadas,
+            "pendentes": self.fila.qsize(),
+            "lotes": self.lotes,
+            "media_por_lote": self.gravadas / self.lotes if self.lotes else 0.0,
+            "maior_fila": self.maior_fila,
+            "esperas_fila_cheia": self.esperas_fila_cheia,
+            "tempo_espera_s": round(self.tempo_espera, 6),
+            "falhas": self.falhas,
+            "desviadas_erros_log": self.desviadas,
+            "perdidas": self.perdidas,
+            "ultimo_erro": self.ultimo_erro,
+            "durabilidade": self.durabilidade,
+        }
+
+
+# ========== ACESSO GLOBAL ==========
+_escritores: Dict[str, EscritorLogAssincrono] = {}
+
+def get_escritor(caminho: str, destino: Optional[Callable] = None,
+                 durabilidade: Optional[str] = None) -> EscritorLogAssincrono:
+    """Um escritor por arquivo de log, compartilhado pelo processo.
+
+    `durabilidade` ("nenhuma" ou "fsync") vale para este escritor; sem ela
+    fica a de PIM_LOG_DURABILIDADE.
+    """
+    if caminho not in _escritores:
+        _escritores[caminho] = EscritorLogAssincrono(caminho, destino=destino, durabilidade=durabilidade)
+    elif durabilidade:
+        _escritores[caminho].durabilidade = durabilidade
+    return _escritores[caminho]
+
+def descarregar_todos():
+    for escritor in list(_escritores.values()):
+        escritor.descarregar()
+
+@atexit.register
+def encerrar_todos():
+    for escritor in list(_escritores.values()):
+        escritor.encerrar()
@@ -0,0 +1,393 @@
+# repositorio/armazem_json.py
+import atexit
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from metricas.metricas import cronometrar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ========== CONFIGURAÇÕES ==========
+CAMPO_VERSAO = "_versao"
+JANELA_GRAVACAO = 0.5  # Segundos juntando alterações antes de gravar
+INDENTACAO = None  # Arquivo compacto; use 4 para inspecionar à mão
+
+
+class ConflitoVersao(Exception):
+    """Outro processo gravou os mesmos registros depois da nossa última leitura"""
+
+    def __init__(self, chaves: Iterable[str]):
+        self.chaves = sorted(chaves)
+        super().__init__(f"Registros alterados por outro processo: {', '.join(self.chaves)}")
+
+
+# ========== TRAVA DE ARQUIVO ==========
+@contextmanager
+def trava_arquivo(caminho: str, exclusiva: bool = True):
+    """Trava entre processos usando o arquivo auxiliar `<caminho>.lock`.
+
+    Leitores pedem trava compartilhada e escritores exclusiva; no Windows
+    (msvcrt) toda trava é exclusiva.
+    """
+    with open(caminho + ".lock", 'a+') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusiva else fcntl.LOCK_SH)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK desiste após ~10 s; continua esperando
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ========== REGISTROS ==========
+class RegistrosRastreados(dict):
+    """dict que anota as chaves criadas, trocadas ou removidas (`sujas`).
+
+    Alterações dentro de um registro (ex.: `dados[nome]["cursos"].append`)
+    não passam por aqui: quem as faz informa a chave em `marcar`/`salvar`.
+    """
+    __slots__ = ("sujas",)
+
+    def __init__(self):
+        super().__init__()
+        self.sujas: Dict[str, None] = {}  # Conjunto em ordem de alteração
+
+    def __setitem__(self, chave, valor):
+        super().__setitem__(chave, valor)
+        self.sujas[chave] = None
+
+    def __delitem__(self, chave):
+        super().__delitem__(chave)
+        self.sujas[chave] = None
+
+    def pop(self, chave, *padrao):
+        if chave in self:
+            self.sujas[chave] = None
+        return super().pop(chave, *padrao)
+
+    def popitem(self):
+        chave, valor = super().popitem()
+        self.sujas[chave] = None
+        return chave, valor
+
+    def setdefault(self, chave, padrao=None):
+        if chave not in self:
+            self[chave] = padrao
+        return self[chave]
+
+    def update(self, *args, **kwargs):
+        for chave, valor in dict(*args, **kwargs).items():
+            self[chave] = valor
+
+    def clear(self):
+        self.sujas.update(dict.fromkeys(self))
+        super().clear()
+
+
+# ========== ARMAZÉM ==========
+class ArmazemJSON:
+    """Arquivo JSON {chave: registro} compartilhado por vários processos.
+
+    Cada registro guarda um número de versão (`_versao`). Ao gravar, só os
+    registros alterados por este processo são mesclados no arquivo atual,
+    sob trava exclusiva; se algum deles mudou no disco desde a nossa leitura,
+    nada é gravado e `ConflitoVersao` é levantada (concorrência otimista).
+
+    `dados` é sempre o mesmo dicionário: as mudanças de outros processos são
+    aplicadas nele registro a registro, então quem guardou uma referência
+    (ex.: `cursos_disponiveis`) continua vendo os dados atuais. Ele anota as
+    chaves atribuídas/removidas (`RegistrosRastreados`); quem altera um
+    registro por dentro passa a chave para `marcar`/`salvar`. Registros novos
+    entram no arquivo na ordem em que foram criados.
+
+    Com `modelo` (ex.: `modelos.Usuario`), os registros lidos viram objetos
+    compactos via `modelo.de_json` e são gravados com `para_json()`;
+    registros criados na sessão como dict comum são gravados como estão.
+
+    `observadores` são chamados como `observador(chaves, dados)` sempre que
+    registros mudam por causa do disco (ex.: índices em memória); rodam com
+    a trava do armazém, então não devem ler outros armazéns.
+    """
+
+    def __init__(self, caminho: str, padrao: Callable[[], Dict], janela: float = JANELA_GRAVACAO,
+                 modelo: Optional[type] = None):
+        self.caminho = caminho
+        self.padrao = padrao
+        self.janela = janela
+        self.modelo = modelo
+        self.dados: RegistrosRastreados = RegistrosRastreados()
+        self.observadores: List[Callable[[List[str], Dict], None]] = []
+        self._base: Dict[str, int] = {}  # chave -> versão lida/gravada
+        self._carimbo = None
+        self._trava = threading.RLock()
+        self._padrao_pendente: Dict[str, None] = {}  # Dados padrão ainda não gravados, em ordem
+
+        # Gravação adiada: chaves sujas esperando o próximo flush()
+        self._pendentes: Dict[str, None] = {}  # Em ordem de marcação
+        self._pendentes_todos = False
+        self._temporizador: Optional[threading.Timer] = None
+        self._trava_pendentes = threading.Lock()
+        self._trava_flush = threading.Lock()  # Um flush por vez (o do temporizador pode estar gravando)
+        self._conflitos: List[str] = []
+        self._metricas = {"marcacoes": 0, "flushes": 0, "gravacoes": 0,
+                          "registros_gravados": 0, "conflitos": 0}
+        _armazens.append(self)
+
+    # ========== LEITURA ==========
+    @staticmethod
+    def versao(registro: Optional[Dict]) -> int:
+        return registro.get(CAMPO_VERSAO, 0) if registro else 0
+
+    def _do_disco(self, registro: Dict) -> Dict:
+        return self.modelo.de_json(registro) if self.modelo else registro
+
+    @staticmethod
+    def _para_disco(registro: Dict) -> Dict:
+        """Cópia gravável: o registro vivo continua sendo o mesmo objeto"""
+        para_json = getattr(registro, "para_json", None)
+        return para_json() if para_json else copy.deepcopy(registro)
+
+    def _carimbo_atual(self) -> Optional[Tuple[int, int]]:
+        try:
+            info = os.stat(self.caminho)
+            return info.st_mtime_ns, info.st_size
+        except FileNotFoundError:
+            return None
+
+    def _ler_disco(self) -> Optional[Dict]:
+        """Conteúdo atual do arquivo (chamar com a trava)"""
+        if not os.path.exists(self.caminho):
+            return None
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def carregar(self) -> Dict:
+        """Primeira leitura; sem arquivo, começa pelos dados padrão (ainda não gravados)"""
+        with self._trava:
+            with trava_arquivo(self.caminho, exclusiva=False):
+                disco = self._ler_disco()
+                self._carimbo = self._carimbo_atual()
+            if disco is None:
+                dict.clear(self.dados)
+                for chave, registro in self.padrao().items():
+                    dict.__setitem__(self.dados, chave, self._do_disco(registro))
+                self.dados.sujas.clear()
+                self._base.clear()
+                self._padrao_pendente = dict.fromkeys(self.dados)  # Vão junto na primeira gravação
+            else:
+                self._mesclar(disco, set())
+            return self.dados
+
+    def sincronizar(self) -> List[str]:
+        """Traz as mudanças de outros processos; retorna as chaves atualizadas.
+
+        Sem mudança no arquivo custa um `os.stat`. Registros com alterações
+        locais ainda não gravadas não são sobrescritos.
+        """
+        if self._carimbo_atual() == self._carimbo:
+            return []
+        with self._trava:
+            with trava_arquivo(self.caminho, exclusiva=False):
+                disco = self._ler_disco()
+                self._carimbo = self._carimbo_atual()
+            if disco is None:
+                return []
+            return self._mesclar(disco, self.alterados())
+
+    def _mesclar(self, disco: Dict, preservar: Set[str]) -> List[str]:
+        """Aplica em `dados` os registros do disco cuja versão mudou (sem sujá-los)"""
+        mudaram = []
+        for chave, registro in disco.items():
+            if chave in preservar:
+                continue
+            versao = self.versao(registro)
+            if self._base.get(chave) != versao or chave not in self.dados:
+                self._base[chave] = versao
+                dict.__setitem__(self.dados, chave, self._do_disco(registro))
+                mudaram.append(chave)
+        for chave in [c for c in self._base if c not in disco and c not in preservar]:
+            del self._base[chave]  # Removido por outro processo
+            if dict.pop(self.dados, chave, None) is not None:
+                mudaram.append(chave)
+        if mudaram:
+            self._avisar(mudaram)
+        return mudaram
+
+    def _avisar(self, chaves: List[str]):
+        for observador in self.observadores:
+            observador(chaves, self.dados)
+
+    def gravado(self, chave: str) -> bool:
+        """A chave existe no arquivo (lida ou gravada por este processo); False para
+        registros criados só em memória"""
+        return chave in self._base
+
+    # ========== ESCRITA ==========
+    def _sujas(self) -> List[str]:
+        """Chaves sujas em ordem, sem as criadas e removidas antes de chegar ao arquivo"""
+        return [c for c in list(self.dados.sujas)  # Cópia: o menu pode alterar enquanto grava
+                if c in self.dados or c in self._base]
+
+    def alterados(self) -> Set[str]:
+        """Chaves criadas, alteradas ou removidas localmente desde a última leitura/gravação
+        (as atribuídas/removidas em `dados` e as informadas em `marcar`)"""
+        return set(self._sujas())
+
+    @cronometrar("armazem_json.salvar")
+    def salvar(self, chaves: Optional[Iterable[str]] = None) -> List[str]:
+        """Grava as chaves indicadas (ou todas as alteradas) e traz as dos outros.
+
+        Em conflito, os registros conflitantes voltam para a versão do disco
+        (a alteração local é descartada) e `ConflitoVersao` é levantada para
+        que a operação seja refeita sobre os dados atuais.
+        """
+        with self._trava, trava_arquivo(self.caminho):
+            disco = self._ler_disco() or {}
+            # Em ordem (dict como conjunto): registros novos entram no arquivo na ordem de criação
+            ordem = dict.fromkeys(c for c in self._padrao_pendente if c not in disco)
+            ordem.update(dict.fromkeys(self._sujas() if chaves is None else chaves))
+            sujas = self.dados.sujas
+            for chave in ordem:  # Uma alteração durante a gravação volta a sujar a chave
+                sujas.pop(chave, None)
+            try:
+                return self._salvar_chaves(disco, ordem)
+            except ConflitoVersao as e:
+                sujas.update(dict.fromkeys(c for c in ordem if c not in e.chaves))
+                raise
+            except BaseException:
+                sujas.update(ordem)
+                raise
+
+    def _salvar_chaves(self, disco: Dict, chaves: Dict[str, None]) -> List[str]:
+        conflitos = {c for c in chaves if self.versao(disco.get(c)) != self._base.get(c, 0)}
+        if conflitos:
+            for chave in conflitos:
+                self._base.pop(chave, None)
+                dict.pop(self.dados, chave, None)
+            self._mesclar(disco, chaves.keys() - conflitos)
+            self._avisar(list(conflitos))  # Inclusive os que o disco não tem mais
+            raise ConflitoVersao(conflitos)
+
+        for chave in chaves:
+            registro = self.dados.get(chave)
+            if registro is not None:
+                registro[CAMPO_VERSAO] = self.versao(disco.get(chave)) + 1
+                disco[chave] = self._para_disco(registro)
+                self._base[chave] = registro[CAMPO_VERSAO]
+            else:
+                disco.pop(chave, None)
+                self._base.pop(chave, None)
+        self._gravar(disco)
+        self._padrao_pendente.clear()
+        self._carimbo = self._carimbo_atual()
+        self._metricas["gravacoes"] += 1
+        self._metricas["registros_gravados"] += len(chaves)
+        return self._mesclar(disco, set(chaves))
+
+    def _gravar(self, disco: Dict):
+        """Temporário + fsync + os.replace: uma queda nunca deixa o arquivo pela metade"""
+        temporario = self.caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(disco, f, indent=INDENTACAO, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho)
+
+    # ========== GRAVAÇÃO ADIADA ==========
+    def marcar(self, chaves: Optional[Iterable[str]] = None):
+        """Marca registros como sujos; a gravação acontece após `janela` segundos.
+
+        Várias marcações dentro da janela viram uma única gravação. Sem
+        `chaves`, entram no próximo flush() as chaves sujas de `dados`.
+        Marcadas, elas também são preservadas por `sincronizar()` até lá.
+        """
+        with self._trava_pendentes:
+            self._metricas["marcacoes"] += 1
+            if chaves is None:
+                self._pendentes_todos = True
+            else:
+                chaves = dict.fromkeys(chaves)
+                self._pendentes.update(chaves)
+                self.dados.sujas.update(chaves)
+            if self._temporizador is None:
+                self._temporizador = threading.Timer(self.janela, self._flush_em_segundo_plano)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+    def flush(self) -> bool:
+        """Grava agora o que estiver pendente; levanta ConflitoVersao como `salvar()`.
+
+        Se o temporizador já estiver gravando, espera ele terminar: quem chama
+        flush() antes de sair conta com tudo no disco ao retornar.
+        """
+        with self._trava_flush:
+            with self._trava_pendentes:
+                if self._temporizador is not None:
+                    self._temporizador.cancel()
+                    self._temporizador = None
+                if not self._pendentes and not self._pendentes_todos:
+                    return False
+                chaves = None if self._pendentes_todos else self._pendentes
+                self._pendentes, self._pendentes_todos = {}, False
+            try:
+                self.salvar(chaves)
+            except ConflitoVersao as e:
+                self._metricas["conflitos"] += 1
+                self._conflitos.extend(e.chaves)
+                raise
+            self._metricas["flushes"] += 1
+            return True
+
+    def _flush_em_segundo_plano(self):
+        try:
+            self.flush()
+        except ConflitoVersao:
+            pass  # Fica em `conflitos_pendentes()` para a interface avisar
+
+    def conflitos_pendentes(self) -> List[str]:
+        """Chaves descartadas por conflito em gravações adiadas (e limpa a lista)"""
+        conflitos, self._conflitos = self._conflitos, []
+        return conflitos
+
+    def metricas(self) -> Dict:
+        """`coalescidas`: marcações que pegaram carona na gravação de outra"""
+        pendente = bool(self._pendentes or self._pendentes_todos)
+        return {
+            **self._metricas,
+            "pendentes": len(self._pendentes),
+            "coalescidas": max(self._metricas["marcacoes"] - self._metricas["flushes"] - pendente, 0),
+        }
+
+
+# ========== ENCERRAMENTO ==========
+_armazens: List[ArmazemJSON] = []
+
+def gravar_pendentes_todos():
+    """Executado na saída do programa: nenhuma alteração adiada se perde"""
+    for armazem in _armazens:
+        try:
+            armazem.flush()
+        except ConflitoVersao as e:
+            print(f"⚠️ {armazem.caminho}: {e}")
+
+atexit.register(gravar_pendentes_todos)
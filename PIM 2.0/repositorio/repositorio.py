@@ -0,0 +1,451 @@
+# repositorio/repositorio.py
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# ========== CONFIGURAÇÕES ==========
+ARQUIVO_BANCO = "plataforma.db"
+ARQUIVO_USUARIOS_JSON = "dados_usuarios.json"
+ARQUIVO_CURSOS_JSON = "cursos.json"
+
+# Campos com coluna própria; o resto do registro vai em "extras" (JSON)
+CAMPOS_USUARIO = ("senha", "email", "idade", "is_admin", "data_cadastro")
+CAMPOS_CURSO = ("nome", "carga_horaria", "criado_por", "data_criacao")
+CAMPOS_MODULO = ("nome", "criado_por", "data_criacao")
+
+ESQUEMA_CADASTROS = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    nome TEXT PRIMARY KEY,
+    senha TEXT NOT NULL,
+    email TEXT,
+    idade INTEGER,
+    is_admin INTEGER NOT NULL DEFAULT 0,
+    data_cadastro TEXT,
+    extras TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios(email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_usuarios_admin ON usuarios(is_admin, nome);
+CREATE INDEX IF NOT EXISTS idx_usuarios_cadastro ON usuarios(data_cadastro);
+
+CREATE TABLE IF NOT EXISTS cursos (
+    id TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    carga_horaria TEXT,
+    criado_por TEXT,
+    data_criacao TEXT,
+    extras TEXT
+);
+
+CREATE TABLE IF NOT EXISTS modulos (
+    id_curso TEXT NOT NULL REFERENCES cursos(id) ON DELETE CASCADE,
+    posicao INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    criado_por TEXT,
+    data_criacao TEXT,
+    extras TEXT,
+    PRIMARY KEY (id_curso, posicao)
+);
+
+CREATE TABLE IF NOT EXISTS matriculas (
+    usuario TEXT NOT NULL REFERENCES usuarios(nome) ON DELETE CASCADE,
+    id_curso TEXT NOT NULL,
+    posicao INTEGER NOT NULL,
+    PRIMARY KEY (usuario, id_curso)
+);
+CREATE INDEX IF NOT EXISTS idx_matriculas_curso ON matriculas(id_curso);
+"""
+
+ESQUEMA_CERTIFICADOS = """
+CREATE TABLE IF NOT EXISTS certificados (
+    codigo TEXT PRIMARY KEY,
+    usuario TEXT NOT NULL,
+    id_curso TEXT NOT NULL,
+    data TEXT,
+    caminho TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_certificados_usuario ON certificados(usuario);
+CREATE INDEX IF NOT EXISTS idx_certificados_curso ON certificados(id_curso);
+"""
+
+ESQUEMA = ESQUEMA_CADASTROS + ESQUEMA_CERTIFICADOS
+
+
+# ========== REPOSITÓRIO ==========
+class RepositorioSQLite:
+    """Usuários, cursos, módulos, matrículas e certificados em SQLite.
+
+    Converte de/para o mesmo formato de dicionário usado nos arquivos JSON,
+    então o resto da plataforma não precisa saber de onde vêm os dados.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_BANCO, esquema: str = ESQUEMA):
+        """`esquema=ESQUEMA_CERTIFICADOS` abre só o registro de certificados"""
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        self._trava = threading.RLock()
+        with self._trava:
+            self.conexao.execute("PRAGMA journal_mode=WAL")
+            self.conexao.execute("PRAGMA synchronous=NORMAL")
+            self.conexao.execute("PRAGMA foreign_keys=ON")
+            self.conexao.executescript(esquema)
+
+    def fechar(self):
+        with self._trava:
+            self.conexao.close()
+
+    # ========== USUÁRIOS ==========
+    def obter_usuario(self, nome: str) -> Optional[Dict]:
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT * FROM usuarios WHERE nome = ?", (nome,)).fetchone()
+            if linha is None:
+                return None
+            return self._montar_usuario(linha)
+
+    def _montar_usuario(self, linha: sqlite3.Row) -> Dict:
+        dados = {campo: linha[campo] for campo in CAMPOS_USUARIO}
+        dados["is_admin"] = bool(dados["is_admin"])
+        dados.update(json.loads(linha["extras"] or "{}"))
+        dados["cursos"] = [r["id_curso"] for r in self.conexao.execute(
+            "SELECT id_curso FROM matriculas WHERE usuario = ? ORDER BY posicao",
+            (linha["nome"],))]
+        certificados = [dict(r) for r in self.conexao.execute(
+            "SELECT id_curso AS curso, codigo, data, caminho FROM certificados "
+            "WHERE usuario = ? ORDER BY data", (linha["nome"],))]
+        if certificados:
+            dados["certificados"] = certificados
+        return dados
+
+    def salvar_usuario(self, nome: str, dados: Dict):
+        with self._trava, self.conexao:
+            self._gravar_usuario(nome, dados)
+
+    def salvar_usuarios_lote(self, usuarios: Dict[str, Dict]):
+        """Grava vários usuários numa única transação"""
+        with self._trava, self.conexao:
+            for nome, dados in usuarios.items():
+                self._gravar_usuario(nome, dados)
+
+    def _gravar_usuario(self, nome: str, dados: Dict):
+        extras = {k: v for k, v in dados.items()
+                  if k not in CAMPOS_USUARIO and k not in ("cursos", "certificados")}
+        self.conexao.execute(
+            "INSERT INTO usuarios (nome, senha, email, idade, is_admin, data_cadastro, extras) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(nome) DO UPDATE SET senha=excluded.senha, email=excluded.email, "
+            "idade=excluded.idade, is_admin=excluded.is_admin, "
+            "data_cadastro=excluded.data_cadastro, extras=excluded.extras",
+            (nome, dados.get("senha"), dados.get("email"), dados.get("idade"),
+             int(bool(dados.get("is_admin"))), dados.get("data_cadastro"),
+             json.dumps(extras, ensure_ascii=False)))
+        self.conexao.execute("DELETE FROM matriculas WHERE usuario = ?", (nome,))
+        self.conexao.executemany(
+            "INSERT OR IGNORE INTO matriculas (usuario, id_curso, posicao) VALUES (?, ?, ?)",
+            [(nome, id_curso, pos) for pos, id_curso in enumerate(dados.get("cursos", []))])
+        self.conexao.execute("DELETE FROM certificados WHERE usuario = ?", (nome,))
+        self.conexao.executemany(
+            "INSERT OR REPLACE INTO certificados (codigo, usuario, id_curso, data, caminho) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(c["codigo"], nome, c["curso"], c.get("data"), c.get("caminho"))
+             for c in dados.get("certificados", [])])
+
+    def remover_usuario(self, nome: str):
+        """Apaga o usuário e os certificados dele (os códigos deixam de ser válidos)"""
+        with self._trava, self.conexao:
+            self.conexao.execute("DELETE FROM certificados WHERE usuario = ?", (nome,))
+            self.conexao.execute("DELETE FROM usuarios WHERE nome = ?", (nome,))
+
+    def nomes_usuarios(self) -> List[str]:
+        with self._trava:
+            return [r[0] for r in self.conexao.execute("SELECT nome FROM usuarios ORDER BY rowid")]
+
+    def contar_usuarios(self) -> int:
+        with self._trava:
+            return self.conexao.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
+
+    def iterar_usuarios(self, lote: int = 500) -> Iterator[Tuple[str, Dict]]:
+        """Percorre todos os usuários em lotes, sem carregar a tabela inteira"""
+        ultimo = 0
+        while True:
+            with self._trava:
+                linhas = self.conexao.execute(
+                    "SELECT rowid, * FROM usuarios WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (ultimo, lote)).fetchall()
+                registros = [(linha["nome"], self._montar_usuario(linha)) for linha in linhas]
+            if not linhas:
+                return
+            ultimo = linhas[-1]["rowid"]
+            yield from registros
+
+    def buscar_por_email(self, email: str) -> Optional[str]:
+        """Nome do usuário dono do email (sem diferenciar maiúsculas)"""
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT nome FROM usuarios WHERE email = ? COLLATE NOCASE", (email,)).fetchone()
+        return linha["nome"] if linha else None
+
+    # Mesmas consultas de usuarios.indices.IndicesUsuarios, respondidas pelos índices do banco
+    def nomes_por_perfil(self, is_admin: bool) -> List[str]:
+        with self._trava:
+            return [r[0] for r in self.conexao.execute(
+                "SELECT nome FROM usuarios WHERE is_admin = ? ORDER BY nome", (int(is_admin),))]
+
+    def contar_por_perfil(self) -> Dict[str, int]:
+        with self._trava:
+            contagem = dict(self.conexao.execute(
+                "SELECT is_admin, COUNT(*) FROM usuarios GROUP BY is_admin").fetchall())
+        return {"admin": contagem.get(1, 0), "aluno": contagem.get(0, 0)}
+
+    def cadastrados_entre(self, inicio: Optional[Union[datetime, str]] = None,
+                          fim: Optional[Union[datetime, str]] = None) -> List[str]:
+        """Nomes cadastrados em [inicio, fim), do mais antigo ao mais novo (datas ISO comparadas como texto)"""
+        condicoes, valores = ["1"], []
+        for limite, operador in ((inicio, ">="), (fim, "<")):
+            if limite:
+                condicoes.append(f"data_cadastro {operador} ?")
+                valores.append(limite.isoformat() if isinstance(limite, datetime) else limite)
+        with self._trava:
+            return [r[0] for r in self.conexao.execute(
+                f"SELECT nome FROM usuarios WHERE {' AND '.join(condicoes)} ORDER BY data_cadastro",
+                valores)]
+
+    def buscar_certificado(self, codigo: str) -> Optional[Dict]:
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT * FROM certificados WHERE codigo = ?", (codigo,)).fetchone()
+        return dict(linha) if linha else None
+
+    def buscar_certificados(self, codigos: List[str], lote: int = 500) -> Dict[str, Dict]:
+        """Vários códigos de uma vez (consultas IN em lotes)"""
+        encontrados = {}
+        with self._trava:
+            for i in range(0, len(codigos), lote):
+                parte = codigos[i:i + lote]
+                marcadores = ",".join("?" * len(parte))
+                for linha in self.conexao.execute(
+                        f"SELECT * FROM certificados WHERE codigo IN ({marcadores})", parte):
+                    encontrados[linha["codigo"]] = dict(linha)
+        return encontrados
+
+    def registrar_certificados(self, certificados: List[Dict]):
+        """Insere/atualiza certificados (dicts com codigo, usuario, id_curso, data, caminho)"""
+        with self._trava, self.conexao:
+            self.conexao.executemany(
+                "INSERT OR REPLACE INTO certificados (codigo, usuario, id_curso, data, caminho) "
+                "VALUES (:codigo, :usuario, :id_curso, :data, :caminho)", certificados)
+
+    def remover_certificados(self, usuario: str) -> int:
+        """Apaga os certificados de um usuário; retorna quantos eram"""
+        with self._trava, self.conexao:
+            return self.conexao.execute(
+                "DELETE FROM certificados WHERE usuario = ?", (usuario,)).rowcount
+
+    def contar_certificados(self) -> int:
+        with self._trava:
+            return self.conexao.execute("SELECT COUNT(*) FROM certificados").fetchone()[0]
+
+    def alunos_do_curso(self, id_curso: str) -> List[str]:
+        """Matriculados no curso, em ordem alfabética (idx_matriculas_curso)"""
+        with self._trava:
+            return [r[0] for r in self.conexao.execute(
+                "SELECT usuario FROM matriculas WHERE id_curso = ? ORDER BY usuario", (id_curso,))]
+
+    def contar_alunos_por_curso(self) -> Dict[str, int]:
+        with self._trava:
+            return dict(self.conexao.execute(
+                "SELECT id_curso, COUNT(*) FROM matriculas GROUP BY id_curso").fetchall())
+
+    # ========== CURSOS E MÓDULOS ==========
+    def obter_curso(self, id_curso: str) -> Optional[Dict]:
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT * FROM cursos WHERE id = ?", (id_curso,)).fetchone()
+            if linha is None:
+                return None
+            return self._montar_curso(linha)
+
+    def _montar_curso(self, linha: sqlite3.Row) -> Dict:
+        dados = {campo: linha[campo] for campo in CAMPOS_CURSO}
+        dados.update(json.loads(linha["extras"] or "{}"))
+        modulos = []
+        for modulo in self.conexao.execute(
+                "SELECT * FROM modulos WHERE id_curso = ? ORDER BY posicao", (linha["id"],)):
+            registro = {campo: modulo[campo] for campo in CAMPOS_MODULO}
+            registro.update(json.loads(modulo["extras"] or "{}"))
+            modulos.append(registro)
+        dados["modulos"] = modulos
+        return dados
+
+    def salvar_curso(self, id_curso: str, dados: Dict):
+        with self._trava, self.conexao:
+            self._gravar_curso(id_curso, dados)
+
+    def _gravar_curso(self, id_curso: str, dados: Dict):
+        extras = {k: v for k, v in dados.items() if k not in CAMPOS_CURSO and k != "modulos"}
+        self.conexao.execute(
+            "INSERT INTO cursos (id, nome, carga_horaria, criado_por, data_criacao, extras) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET nome=excluded.nome, carga_horaria=excluded.carga_horaria, "
+            "criado_por=excluded.criado_por, data_criacao=excluded.data_criacao, extras=excluded.extras",
+            (id_curso, dados.get("nome"), dados.get("carga_horaria"), dados.get("criado_por"),
+             dados.get("data_criacao"), json.dumps(extras, ensure_ascii=False)))
+        self.conexao.execute("DELETE FROM modulos WHERE id_curso = ?", (id_curso,))
+        self.conexao.executemany(
+            "INSERT INTO modulos (id_curso, posicao, nome, criado_por, data_criacao, extras) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(id_curso, pos, m.get("nome"), m.get("criado_por"), m.get("data_criacao"),
+              json.dumps({k: v for k, v in m.items() if k not in CAMPOS_MODULO}, ensure_ascii=False))
+             for pos, m in enumerate(dados.get("modulos", []))])
+
+    def remover_curso(self, id_curso: str):
+        with self._trava, self.conexao:
+            self.conexao.execute("DELETE FROM cursos WHERE id = ?", (id_curso,))
+
+    def contar_cursos(self) -> int:
+        with self._trava:
+            return self.conexao.execute("SELECT COUNT(*) FROM cursos").fetchone()[0]
+
+    def ids_cursos(self) -> List[str]:
+        with self._trava:
+            return [r[0] for r in self.conexao.execute("SELECT id FROM cursos ORDER BY rowid")]
+
+    # ========== MIGRAÇÃO ==========
+    def vazio(self) -> bool:
+        with self._trava:
+            return self.conexao.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM usuarios) AND NOT EXISTS (SELECT 1 FROM cursos)"
+            ).fetchone()[0] == 1
+
+    def migrar_json(self, arquivo_usuarios: str, arquivo_cursos: str) -> Tuple[int, int]:
+        """Importa os arquivos JSON atuais em uma única transação"""
+        usuarios, cursos = {}, {}
+        if os.path.exists(arquivo_usuarios):
+            with open(arquivo_usuarios, 'r', encoding='utf-8') as f:
+                usuarios = json.load(f)
+        if os.path.exists(arquivo_cursos):
+            with open(arquivo_cursos, 'r', encoding='utf-8') as f:
+                cursos = json.load(f)
+        with self._trava, self.conexao:
+            for id_curso, dados in cursos.items():
+                self._gravar_curso(id_curso, dados)
+            for nome, dados in usuarios.items():
+                self._gravar_usuario(nome, dados)
+        return len(usuarios), len(cursos)
+
+
+# ========== MAPA PREGUIÇOSO ==========
+class MapaSQLite(MutableMapping):
+    """Dicionário que busca registros no banco sob demanda.
+
+    Só os registros acessados ficam em memória; alterações ficam no cache até
+    `salvar()`/`salvar_registro()`, e remoções vão direto para o banco.
+    """
+
+    def __init__(self, obter: Callable, gravar: Callable, remover: Callable,
+                 chaves: Callable, iterar: Optional[Callable] = None):
+        self._obter = obter
+        self._gravar = gravar
+        self._remover = remover
+        self._chaves = chaves
+        self._iterar = iterar
+        self._cache = {}
+
+    def __getitem__(self, chave):
+        if chave not in self._cache:
+            dados = self._obter(chave)
+            if dados is None:
+                raise KeyError(chave)
+            self._cache[chave] = dados
+        return self._cache[chave]
+
+    def __setitem__(self, chave, valor):
+        self._cache[chave] = valor
+
+    def __delitem__(self, chave):
+        if chave not in self:
+            raise KeyError(chave)
+        self._cache.pop(chave, None)
+        self._remover(chave)
+
+    def __contains__(self, chave):
+        return chave in self._cache or self._obter(chave) is not None
+
+    def __iter__(self):
+        vistos = set()
+        for chave in self._chaves():
+            vistos.add(chave)
+            yield chave
+        yield from (c for c in list(self._cache) if c not in vistos)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def items(self):
+        """Percorre em lotes sem guardar tudo no cache"""
+        if self._iterar is None:
+            return super().items()
+        return self._itens_em_lotes()
+
+    def _itens_em_lotes(self):
+        vistos = set()
+        for chave, dados in self._iterar():
+            vistos.add(chave)
+            yield chave, self._cache.get(chave, dados)
+        for chave in list(self._cache):
+            if chave not in vistos:
+                yield chave, self._cache[chave]
+
+    def salvar_registro(self, chave):
+        self._gravar(chave, self._cache[chave])
+
+    def salvar(self):
+        """Grava todos os registros em cache (os únicos que podem ter mudado)"""
+        for chave, valor in list(self._cache.items()):
+            self._gravar(chave, valor)
+
+    def limpar_cache(self):
+        self._cache.clear()
+
+
+# ========== ACESSO GLOBAL ==========
+_repositorio = None
+
+def get_repositorio() -> RepositorioSQLite:
+    """Repositório compartilhado; na primeira abertura migra os JSON existentes"""
+    global _repositorio
+    if _repositorio is None:
+        _repositorio = RepositorioSQLite(ARQUIVO_BANCO)
+        if _repositorio.vazio():
+            _repositorio.migrar_json(ARQUIVO_USUARIOS_JSON, ARQUIVO_CURSOS_JSON)
+    return _repositorio
+
+def mapa_usuarios(padrao: Optional[Callable[[], Dict]] = None) -> MapaSQLite:
+    """Usuários sob demanda; `padrao` preenche o cache se o banco estiver vazio"""
+    repo = get_repositorio()
+    mapa = MapaSQLite(repo.obter_usuario, repo.salvar_usuario, repo.remover_usuario,
+                      repo.nomes_usuarios, repo.iterar_usuarios)
+    if padrao and repo.contar_usuarios() == 0:
+        mapa.update(padrao())
+    return mapa
+
+def mapa_cursos(padrao: Optional[Callable[[], Dict]] = None) -> MapaSQLite:
+    """Cursos sob demanda; `padrao` preenche o cache se o banco estiver vazio"""
+    repo = get_repositorio()
+    mapa = MapaSQLite(repo.obter_curso, repo.salvar_curso, repo.remover_curso, repo.ids_cursos)
+    if padrao and repo.contar_cursos() == 0:
+        mapa.update(padrao())
+    return mapa
+
+
+if __name__ == "__main__":
+    import sys
+    destino = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_BANCO
+    total_usuarios, total_cursos = RepositorioSQLite(destino).migrar_json(
+        ARQUIVO_USUARIOS_JSON, ARQUIVO_CURSOS_JSON)
+    print(f"✅ Migrados {total_usuarios} usuários e {total_cursos} cursos para {destino}")
@@ -0,0 +1,50 @@
+# tests/conftest.py
+import importlib
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+# Pacotes do sistema: guardam estado em variáveis globais (usuários carregados,
+# armazéns, índices...) e leem PIM_* na importação
+PACOTES = ("api", "benchmark", "certificados", "cursos", "metricas", "modelos", "modulos",
+           "registros", "repositorio", "security", "usuarios", "cli", "main")
+
+
+def esquecer_modulos():
+    for nome in list(sys.modules):
+        if nome.split(".")[0] in PACOTES:
+            del sys.modules[nome]
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    """Roda o teste numa pasta vazia (os módulos gravam em caminhos relativos)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def sistema(pasta, monkeypatch):
+    """Importa o sistema do zero na pasta vazia: `sistema("sqlite")` -> módulo usuarios.usuarios"""
+    def carregar(modo: str = "json", **ambiente):
+        monkeypatch.setenv("PIM_ARMAZENAMENTO", modo)
+        for chave, valor in ambiente.items():
+            monkeypatch.setenv(chave, valor)
+        esquecer_modulos()
+        return importlib.import_module("usuarios.usuarios")
+
+    yield carregar
+    # Grava o que ficou adiado e para as threads de log antes de sair da pasta
+    if "repositorio.armazem_json" in sys.modules:
+        sys.modules["repositorio.armazem_json"].gravar_pendentes_todos()
+    if "registros.registros" in sys.modules:
+        sys.modules["registros.registros"].encerrar_todos()
+    if "repositorio.repositorio" in sys.modules:
+        repositorio = sys.modules["repositorio.repositorio"]
+        if repositorio._repositorio is not None:
+            repositorio._repositorio.fechar()
+    esquecer_modulos()
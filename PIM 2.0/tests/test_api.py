@@ -0,0 +1,99 @@
+# tests/test_api.py
+import asyncio
+import importlib
+import json
+import time
+
+import pytest
+
+
+@pytest.fixture
+def api(sistema):
+    """API com "ana_1" matriculada num curso de dois módulos"""
+    usuarios = sistema("json")
+    api = importlib.import_module("api.api")
+    cursos = importlib.import_module("cursos.cursos")
+    modulos = importlib.import_module("modulos.modulos")
+    usuarios.cadastrar_usuario("ana_1", "ana@escola.com", 20, "Senha@123")
+    id_curso = cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    for nome in ("Camadas", "Roteamento"):
+        modulos.incluir_modulo(id_curso, nome, autor="admin")
+    cursos.matricular_usuario("ana_1", id_curso)
+    yield api, id_curso
+    api._sessoes.clear()
+
+def chamar(api, metodo, alvo, corpo=None, token=None):
+    cabecalhos = {"authorization": f"Bearer {token}"} if token else {}
+    status, _, resposta = asyncio.run(api.despachar(
+        metodo, alvo, cabecalhos, json.dumps(corpo).encode() if corpo is not None else b""))
+    return status, json.loads(resposta)
+
+def entrar(api):
+    status, resposta = chamar(api, "POST", "/login", {"usuario": "ana_1", "senha": "Senha@123"})
+    assert status == 200
+    return resposta["token"]
+
+
+def test_marcar_modulo(api):
+    api, id_curso = api
+    token = entrar(api)
+    status, resposta = chamar(api, "POST", "/progresso", {"curso": id_curso, "modulo": 1}, token)
+    assert status == 200 and resposta["percentual"] == 50.0
+
+def test_marcar_aula(api):
+    api, id_curso = api
+    cursos = importlib.import_module("cursos.cursos")
+    cursos.cursos_disponiveis[id_curso]["modulos"][0]["aulas"] = ["Física", "Enlace"]
+    cursos.salvar_cursos(imediato=True)
+    token = entrar(api)
+    for aula, percentual in ((0, 0.0), (1, 50.0)):
+        status, resposta = chamar(api, "POST", "/progresso",
+                                  {"curso": id_curso, "modulo": 0, "aula": aula}, token)
+        assert status == 200 and resposta["percentual"] == percentual
+    _, resposta = chamar(api, "GET", f"/cursos/{id_curso}/modulos", token=token)
+    assert resposta["modulos"][0]["aulas_concluidas"] == [0, 1]
+    status, resposta = chamar(api, "POST", "/progresso", {"curso": id_curso, "modulo": 1, "aula": 0}, token)
+    assert status == 404 and resposta["erro"] == "Aula não encontrada"
+
+@pytest.mark.parametrize("modulo", [2, 64, 2_000_000_000, 10**12, -1])
+def test_modulo_inexistente_nao_aloca_nem_derruba(api, modulo):
+    api, id_curso = api
+    token = entrar(api)
+    inicio = time.perf_counter()
+    status, resposta = chamar(api, "POST", "/progresso", {"curso": id_curso, "modulo": modulo}, token)
+    assert status == 404 and resposta["erro"] == "Módulo não encontrado"
+    assert time.perf_counter() - inicio < 1  # 2e9 levava segundos alocando ~250 MB
+
+def test_matricula_registrada_uma_vez_pela_api_e_pela_cli(api, monkeypatch):
+    api, id_curso = api
+    cursos = importlib.import_module("cursos.cursos")
+    cli = importlib.import_module("cli")
+    usuarios = importlib.import_module("usuarios.usuarios")
+    registros = []
+    monkeypatch.setattr(cursos, "registrar_log", lambda acao, detalhes="": registros.append((acao, detalhes)))
+    usuarios.cadastrar_usuario("bia_2", "bia@escola.com", 22, "Senha@123")
+    id_outro = cursos.cadastrar_curso("Python", "10h", autor="admin")
+    registros.clear()
+
+    token = entrar(api)
+    for _ in range(2):  # A segunda é repetida: não registra de novo
+        assert chamar(api, "POST", "/matriculas", {"curso": id_outro}, token)[0] == 200
+        cli.matricula({"usuario": "bia_2", "curso": id_curso})
+    assert registros == [("Matrícula realizada", f"Usuário: ana_1 | Curso: {id_outro}"),
+                         ("Matrícula realizada", f"Usuário: bia_2 | Curso: {id_curso}")]
+
+def test_emitir_exige_matricula(api):
+    api, _ = api
+    token = entrar(api)
+    status, resposta = chamar(api, "POST", "/certificados", {"curso": "1"}, token)
+    assert status == 422 and "não está matriculado" in resposta["erro"]
+
+def test_sessoes_expiradas_sao_varridas(api):
+    api, _ = api
+    ativo = entrar(api)
+    abandonado = entrar(api)
+    api._sessoes[abandonado]["expira"] = time.time() - 1
+    assert api.varrer_sessoes() == 1
+    assert list(api._sessoes) == [ativo]
+    assert chamar(api, "GET", "/progresso", token=abandonado)[0] == 401
+    assert chamar(api, "GET", "/progresso", token=ativo)[0] == 200
@@ -0,0 +1,115 @@
+# tests/test_armazem_json.py
+import json
+
+import pytest
+
+import repositorio.armazem_json as armazem_json
+from repositorio.armazem_json import ArmazemJSON, ConflitoVersao
+
+
+def padrao():
+    return {"1": {"nome": "Um"}, "2": {"nome": "Dois"}}
+
+def no_disco(caminho="dados.json"):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture(autouse=True)
+def sem_sobras():
+    """Marcações pendentes não podem ser gravadas na saída, fora da pasta do teste"""
+    yield
+    for a in armazem_json._armazens:
+        if a._temporizador is not None:
+            a._temporizador.cancel()
+    armazem_json._armazens.clear()
+
+def armazem(janela=60):
+    a = ArmazemJSON("dados.json", padrao, janela=janela)
+    a.carregar()
+    return a
+
+
+def test_registros_novos_entram_na_ordem_de_criacao(pasta):
+    a = armazem()
+    for chave in ("3", "10", "4"):
+        a.dados[chave] = {"nome": chave}
+    a.salvar(["4", "3", "10"])  # Padrão pendente primeiro, depois a ordem pedida
+    assert list(no_disco()) == ["1", "2", "4", "3", "10"]
+    a.dados["5"] = {"nome": "Cinco"}
+    a.marcar()
+    a.flush()
+    assert list(no_disco()) == ["1", "2", "4", "3", "10", "5"]
+
+def test_cursos_padrao_e_novo_em_ordem(sistema):
+    sistema("json")
+    import cursos.cursos as cursos
+    cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    assert list(no_disco("cursos.json")) == ["1", "2", "3"]
+
+def test_sujas_vem_das_atribuicoes_e_das_marcacoes(pasta):
+    a = armazem()
+    a.salvar()
+    assert a.alterados() == set()
+    a.dados["1"]["nome"] = "Alterado por dentro"  # Não visto sem marcar
+    a.dados["3"] = {"nome": "Três"}
+    del a.dados["2"]
+    a.dados["4"] = {"nome": "Efêmero"}
+    a.dados.pop("4")  # Criado e removido antes de gravar: nada a fazer
+    assert a.alterados() == {"2", "3"}
+    a.marcar(["1"])
+    assert a.alterados() == {"1", "2", "3"}
+    a.marcar()  # Sem chaves: todas as sujas
+    a.flush()
+    assert a.alterados() == set()
+    assert no_disco() == {"1": {"nome": "Alterado por dentro", "_versao": 2},
+                          "3": {"nome": "Três", "_versao": 1}}
+
+def test_nao_percorre_registros_para_achar_alterados(pasta):
+    class SemRepr(dict):
+        def __repr__(self):
+            raise AssertionError("repr() de registro")
+    a = armazem()
+    a.dados["3"] = SemRepr(nome="Três")
+    a.salvar()
+    a.dados["3"]["nome"] = "3"
+    a.salvar(["3"])
+    assert a.alterados() == set() and no_disco()["3"]["nome"] == "3"
+
+def test_conflito_nao_grava_nada_e_mantem_as_outras_sujas(pasta):
+    a, b = armazem(), armazem()
+    a.salvar()
+    b.sincronizar()
+    a.dados["1"]["nome"] = "Por A"
+    a.salvar(["1"])
+    b.dados["1"]["nome"] = "Por B"
+    b.dados["3"] = {"nome": "Três"}
+    with pytest.raises(ConflitoVersao) as erro:
+        b.salvar(["1", "3"])
+    assert erro.value.chaves == ["1"]
+    assert b.dados["1"]["nome"] == "Por A"  # Recarregado do disco
+    assert "3" not in no_disco() and b.alterados() == {"3"}
+    b.salvar()
+    assert no_disco()["3"]["nome"] == "Três"
+
+def test_sincronizar_preserva_marcadas(pasta):
+    a, b = armazem(), armazem()
+    a.salvar()
+    b.sincronizar()
+    a.dados["1"]["nome"] = "Por A"
+    a.dados["2"]["nome"] = "Também por A"
+    a.salvar(["1", "2"])
+    b.dados["1"]["nome"] = "Por B"
+    b.marcar(["1"])
+    assert b.sincronizar() == ["2"]
+    assert b.dados["1"]["nome"] == "Por B" and b.dados["2"]["nome"] == "Também por A"
+
+def test_marcacoes_na_janela_viram_uma_gravacao(pasta):
+    a = armazem()
+    for chave in ("3", "4", "5"):
+        a.dados[chave] = {"nome": chave}
+        a.marcar([chave])
+    assert a.flush() is True
+    metricas = a.metricas()
+    assert metricas["flushes"] == 1 and metricas["gravacoes"] == 1 and metricas["coalescidas"] == 2
+    assert list(no_disco()) == ["1", "2", "3", "4", "5"]
+    assert a.flush() is False  # Nada pendente
@@ -0,0 +1,115 @@
+# tests/test_auditoria.py
+import gzip
+import json
+import multiprocessing
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from registros.auditoria import LogAuditoria
+
+INICIO = datetime(2026, 3, 1, 9, 0, 0)
+
+
+def entradas(quantidade, usuario="ana", acao="Login", inicio=INICIO, passo=timedelta(seconds=1)):
+    return [{"timestamp": inicio + passo * i, "usuario": usuario, "acao": acao, "detalhes": f"#{i}"}
+            for i in range(quantidade)]
+
+def usuarios_no_disco(pasta):
+    """Registros por usuário em cada segmento (pelo conteúdo, não pelo índice)"""
+    contagem = {}
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        if nome.endswith(".jsonl.gz"):
+            with gzip.open(caminho, "rt", encoding="utf-8") as f:
+                contagem[nome[:-len(".jsonl.gz")]] = Counter(json.loads(l)["usuario"] for l in f)
+        elif nome == "atual.jsonl":
+            with open(caminho, encoding="utf-8") as f:
+                contagem["atual"] = Counter(json.loads(l)["usuario"] for l in f)
+    return contagem
+
+def conferir_indices(pasta):
+    """Cada .idx.json descreve exatamente o segmento ao lado"""
+    no_disco = usuarios_no_disco(pasta)
+    for nome in os.listdir(pasta):
+        if nome.endswith(".idx.json"):
+            with open(os.path.join(pasta, nome), encoding="utf-8") as f:
+                indice = json.load(f)
+            usuarios = no_disco[nome[:-len(".idx.json")]]
+            assert indice["usuarios"] == usuarios, nome
+            assert indice["total"] == sum(usuarios.values())
+    return {segmento: sum(usuarios.values()) for segmento, usuarios in no_disco.items()}
+
+
+def test_grava_e_consulta_com_filtros(pasta):
+    log = LogAuditoria("auditoria")
+    log.gravar_lote(entradas(3, "ana", "Login") + entradas(2, "bia", "Logout", INICIO + timedelta(hours=1)))
+    assert [r["detalhes"] for r in log.ultimos(2)] == ["#0", "#1"]
+    assert len(log.consultar(usuario="ana")) == 3
+    assert len(log.consultar(acao="Logout")) == 2
+    assert len(log.consultar(inicio="2026-03-01T09:30")) == 2
+    assert log.acoes_conhecidas() == ["Login", "Logout"]
+
+def test_rotaciona_por_tamanho_e_por_dia(pasta):
+    log = LogAuditoria("auditoria", tamanho_maximo=1000)
+    log.gravar_lote(entradas(40))
+    log.gravar_lote(entradas(5, inicio=INICIO + timedelta(days=1)))
+    no_disco = conferir_indices("auditoria")
+    assert sum(no_disco.values()) == 45
+    assert no_disco["atual"] == 5  # O dia novo começou um segmento
+    assert len(log.consultar()) == 45
+    assert len(log.consultar(inicio="2026-03-02")) == 5
+    assert log.segmentos()[-1]["arquivo"].endswith("atual.jsonl")
+
+def test_reabrir_reindexa_o_atual(pasta):
+    LogAuditoria("auditoria").gravar_lote(entradas(7))
+    log = LogAuditoria("auditoria")
+    assert log.indice_atual["total"] == 7
+    assert log.indice_atual["usuarios"] == {"ana": 7}
+
+def test_rotacao_por_outra_instancia_nao_corrompe_indice(pasta):
+    """Dois processos (aqui, duas instâncias) compartilhando a pasta"""
+    a = LogAuditoria("auditoria", tamanho_maximo=10**9)
+    b = LogAuditoria("auditoria", tamanho_maximo=10**9)
+    a.gravar_lote(entradas(3, "ana"))
+    b.gravar_lote(entradas(2, "bia"))
+    a.rotacionar()          # Move o atual.jsonl com os 5 registros
+    b.gravar_lote(entradas(4, "caio"))
+    b.rotacionar()
+    no_disco = conferir_indices("auditoria")
+    assert sorted(v for k, v in no_disco.items() if k != "atual") == [4, 5]
+    assert len(a.consultar()) == 9 and len(b.consultar(usuario="bia")) == 2
+
+def test_atual_novo_com_mesmo_tamanho_e_reindexado(pasta):
+    a = LogAuditoria("auditoria", tamanho_maximo=10**9)
+    b = LogAuditoria("auditoria", tamanho_maximo=10**9)
+    a.gravar_lote(entradas(2, "ana"))
+    b.consultar()
+    a.rotacionar()
+    a.gravar_lote(entradas(2, "bia"))  # Mesmo tamanho (e talvez o mesmo inode) do anterior
+    assert b.segmentos()[-1]["usuarios"] == {"bia": 2}
+
+
+def _escrever_em_processo(pasta, usuario, lotes):
+    os.chdir(pasta)
+    log = LogAuditoria("auditoria", tamanho_maximo=3000)
+    for lote in range(lotes):
+        log.gravar_lote(entradas(5, usuario, inicio=INICIO + timedelta(minutes=lote)))
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="precisa de fork")
+def test_varios_processos_rotacionando(pasta):
+    contexto = multiprocessing.get_context("fork")
+    processos = [contexto.Process(target=_escrever_em_processo, args=(str(pasta), f"u{i}", 40))
+                 for i in range(4)]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join(60)
+        assert processo.exitcode == 0
+    no_disco = conferir_indices("auditoria")
+    assert sum(no_disco.values()) == 4 * 40 * 5  # Nenhum registro perdido ou duplicado
+    assert len(no_disco) > 4  # Houve rotações
+    log = LogAuditoria("auditoria")
+    assert all(len(log.consultar(usuario=f"u{i}")) == 200 for i in range(4))
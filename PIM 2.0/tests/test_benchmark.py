@@ -0,0 +1,44 @@
+# tests/test_benchmark.py
+import importlib
+import os
+
+import pytest
+
+from conftest import esquecer_modulos
+
+PARAMETROS = {"usuarios": 20, "cursos": 3, "modulos": 3, "matriculas": 2,
+              "taxa_conclusao": 0.3, "linhas_log": 50, "semente": 42}
+
+
+@pytest.fixture
+def benchmark(sistema, monkeypatch):
+    """benchmark.benchmark importado do zero (ele mesmo gera a base numa pasta temporária)"""
+    monkeypatch.setenv("PIM_ARMAZENAMENTO", "json")
+    esquecer_modulos()
+    return importlib.import_module("benchmark.benchmark")
+
+
+def test_executar_roda_todos_os_casos(benchmark, pasta):
+    relatorio = benchmark.executar(PARAMETROS, repeticoes=1)
+    resultados = relatorio["resultados"]
+    assert set(resultados) == {
+        "carregar_usuarios", "salvar_usuarios", "salvar_usuario_adiado", "login", "cadastro",
+        "listar_usuarios", "listar_modulos_por_curso", "verificar_conclusao_x1000",
+        "registrar_log_x1000", "certificado_gerar"}
+    assert {nome: r for nome, r in resultados.items() if "erro" in r} == {}
+    assert all("p50_ms" in r or "ignorado" in r for r in resultados.values())
+    assert os.getcwd() == str(pasta) and os.listdir(pasta) == []  # Nada gravado fora da pasta temporária
+
+def test_caso_com_erro_nao_interrompe_os_outros(benchmark, monkeypatch):
+    def quebra():
+        raise ValueError("Email já cadastrado!")
+    monkeypatch.setattr(benchmark, "casos", lambda repeticoes, usuarios: {
+        "quebra": quebra, "ok": lambda: {"p50_ms": 1.0}})
+    resultados = benchmark.executar(PARAMETROS, repeticoes=1)["resultados"]
+    assert resultados == {"quebra": {"erro": "ValueError: Email já cadastrado!"}, "ok": {"p50_ms": 1.0}}
+
+def test_comparar_conta_caso_com_erro_como_regressao(benchmark):
+    meta = {"parametros": PARAMETROS}
+    base = {"meta": meta, "resultados": {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 1.0}}}
+    novo = {"meta": meta, "resultados": {"a": {"p50_ms": 1.05}, "b": {"erro": "ValueError: x"}}}
+    assert benchmark.comparar(base, novo) == ["b"]
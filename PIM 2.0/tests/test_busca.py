@@ -0,0 +1,90 @@
+# tests/test_busca.py
+import random
+
+import pytest
+
+from cursos.busca import BuscaCatalogo, normalizar, tokenizar
+
+
+def curso(nome, *modulos, autor="admin"):
+    return {"nome": nome, "criado_por": autor,
+            "modulos": [{"nome": m, "criado_por": autor, "aulas": aulas} for m, aulas in modulos]}
+
+@pytest.fixture
+def catalogo():
+    return {
+        "1": curso("Programação em Python", ("Introdução", ["Variáveis", "Laços"]),
+                   ("Orientação a objetos", ["Classes"])),
+        "2": curso("Redes de Computadores", ("Camadas", ["Modelo OSI"]), ("Roteamento", ["Protocolos"]),
+                   autor="python"),
+        "3": curso("Banco de Dados", ("SQL", ["Consultas", "Programação procedural"])),
+    }
+
+def documentos(resultados):
+    return [(r["curso"], r["modulo"]) for r in resultados]
+
+def estado(busca):
+    return ({termo: dict(p) for termo, p in busca._postagens.items()}, list(busca._vocabulario),
+            dict(busca._titulos))
+
+
+def test_tokenizar_sem_acentos_e_sem_palavras_vazias():
+    assert normalizar("Programação") == "programacao"
+    assert tokenizar("Introdução à Programação de Computadores") == ["introducao", "programacao", "computadores"]
+    assert tokenizar("de para") == ["de", "para"]  # Só palavras vazias: ficam todas
+
+def test_nome_do_curso_vale_mais_que_o_autor(catalogo):
+    resultados = BuscaCatalogo(catalogo).buscar("python")
+    assert resultados[0] == {"tipo": "curso", "curso": "1", "modulo": None,
+                             "titulo": "Programação em Python", "pontos": resultados[0]["pontos"]}
+    pontos = {(r["curso"], r["modulo"]): r["pontos"] for r in resultados}
+    assert pontos[("2", None)] == pytest.approx(pontos[("1", None)] / 6, abs=1e-3)  # Só pelo autor
+    assert documentos(BuscaCatalogo(catalogo).buscar("classes")) == [("1", 1)]  # Pela aula
+
+def test_todos_os_termos_precisam_aparecer(catalogo):
+    busca = BuscaCatalogo(catalogo)
+    assert documentos(busca.buscar("python introdução")) == [("1", 0)]
+    assert busca.buscar("python sql") == []
+    assert busca.buscar("de") == []  # Só palavra vazia e nenhum documento com ela
+
+def test_prefixo_casa_com_peso_menor(catalogo):
+    busca = BuscaCatalogo(catalogo)
+    prefixo = {(r["curso"], r["modulo"]): r["pontos"] for r in busca.buscar("PROGRAMA")}
+    exato = {(r["curso"], r["modulo"]): r["pontos"] for r in busca.buscar("programacao")}
+    assert set(prefixo) == set(exato) == {("1", None), ("1", 0), ("1", 1), ("3", 0)}
+    assert all(prefixo[d] < exato[d] for d in exato)
+    assert busca.buscar("p", limite=50) == []  # Uma letra só casa exata
+
+def test_limite(catalogo):
+    assert len(BuscaCatalogo(catalogo).buscar("programacao", limite=2)) == 2
+
+def test_atualizar_equivale_a_reconstruir(catalogo):
+    busca = BuscaCatalogo(catalogo)
+    catalogo["1"]["modulos"].append({"nome": "Testes automatizados", "aulas": ["pytest"]})
+    catalogo["4"] = curso("Segurança", ("Criptografia", ["Hashes"]))
+    del catalogo["2"]
+    busca.atualizar(["1", "2", "4"])
+    assert estado(busca) == estado(BuscaCatalogo(catalogo))
+    assert busca.buscar("roteamento") == []
+    assert documentos(busca.buscar("pytest")) == [("1", 2)]
+    assert "roteamento" not in busca._vocabulario
+
+def test_observar_le_da_origem(catalogo):
+    busca = BuscaCatalogo(catalogo)
+    busca.observar(["5"], {"5": curso("Estatística", ("Regressão", []))})
+    assert documentos(busca.buscar("regressao")) == [("5", 0)]
+
+def test_muitas_atualizacoes_aleatorias(catalogo):
+    sorteio = random.Random(7)
+    palavras = ["python", "redes", "dados", "java", "web", "nuvem", "testes", "grafos"]
+    busca = BuscaCatalogo(catalogo)
+    for _ in range(200):
+        id_curso = str(sorteio.randint(1, 8))
+        if sorteio.random() < 0.2:
+            catalogo.pop(id_curso, None)
+        else:
+            catalogo[id_curso] = curso(" ".join(sorteio.sample(palavras, 2)),
+                                       *[(sorteio.choice(palavras), sorteio.sample(palavras, 2))
+                                         for _ in range(sorteio.randint(0, 3))])
+        busca.atualizar([id_curso])
+    assert estado(busca) == estado(BuscaCatalogo(catalogo))
@@ -0,0 +1,46 @@
+# tests/test_carga.py
+import importlib
+import json
+
+import pytest
+
+from benchmark.dados_sinteticos import gerar_base
+
+
+@pytest.fixture
+def carga(sistema):
+    """benchmark.carga sobre uma base sintética pequena na pasta do teste"""
+    gerar_base(".", usuarios=20, cursos=4, modulos=3, matriculas=2, linhas_log=50)
+    sistema("json")
+    return importlib.import_module("benchmark.carga")  # Depois do sistema: o Pool serializa as funções
+
+def curso_livre(aluno):
+    with open("dados_usuarios.json", encoding="utf-8") as f:
+        matriculas = json.load(f)[aluno]["cursos"]
+    return next(c for c in ("1", "2", "3", "4") if c not in matriculas)
+
+
+def test_sessao_gerada_percorre_o_menu_sem_erros(carga):
+    id_curso = curso_livre("aluno0")
+    resultado = carga.executar_sessao(carga.roteiro_aluno("aluno0", id_curso))
+    assert resultado["excecao"] is None and resultado["erros"] == 0
+    assert [operacao for operacao, _ in resultado["tempos"]] == \
+        [operacao for _, operacao in carga.roteiro_aluno("aluno0", id_curso)]
+
+    from usuarios.usuarios import carregar_usuarios
+    aluno = carregar_usuarios()["aluno0"]
+    assert id_curso in aluno["cursos"]
+    assert aluno["progresso"][id_curso]["aulas"]  # A primeira aula do módulo 1 ficou marcada
+
+def test_executar_em_paralelo(carga):
+    relatorio = carga.executar(".", sessoes=6, processos=2)
+    assert relatorio["excecoes"] == {} and relatorio["mensagens_erro"] == 0
+    assert relatorio["operacoes"]["progresso.marcar_aula"]["chamadas"] == 6
+
+def test_executar_roteiro_gravado(carga):
+    with open("roteiro.txt", "w", encoding="utf-8") as f:
+        f.writelines(resposta.replace("aluno0", "{aluno}") + "\n"
+                     for resposta, _ in carga.roteiro_aluno("aluno0", "1"))
+    relatorio = carga.executar(".", sessoes=2, processos=1, roteiro=carga.ler_roteiro("roteiro.txt"))
+    assert relatorio["excecoes"] == {} and relatorio["mensagens_erro"] == 0
+    assert "Escolha uma opção:" in relatorio["operacoes"]  # Sem nome, a operação é a pergunta
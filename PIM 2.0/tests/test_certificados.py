@@ -0,0 +1,147 @@
+# tests/test_certificados.py
+import importlib
+import os
+import sqlite3
+
+import pytest
+
+SENHA = "Senha@123"
+
+
+@pytest.fixture(params=["json", "diario", "sqlite"])
+def escola(request, sistema, monkeypatch):
+    """Curso "3" com dois módulos, "davi" matriculado só nele e PDFs falsos (sem fpdf)"""
+    usuarios = sistema(request.param)
+    cursos = importlib.import_module("cursos.cursos")
+    modulos = importlib.import_module("modulos.modulos")
+    progresso = importlib.import_module("modulos.progresso")
+    certificados = importlib.import_module("certificados.certificados")
+
+    def gerar(self, nome_aluno, nome_curso, carga_horaria, codigo=None):
+        self.codigo = codigo or certificados.Certificado.novo_codigo(nome_aluno, nome_curso)
+        self.caminho = f"{certificados.PASTA_CERTIFICADOS}/{self.codigo}.pdf"
+        return self.caminho
+    monkeypatch.setattr(certificados.Certificado, "gerar", gerar)
+
+    usuarios.cadastrar_usuario("davi", "davi@escola.com", 20, SENHA)
+    id_curso = cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    for nome in ("Camadas", "Roteamento"):
+        modulos.incluir_modulo(id_curso, nome, autor="admin")
+    cursos.matricular_usuario("davi", id_curso)
+    return usuarios, cursos, progresso, certificados, id_curso
+
+def concluir(progresso, cursos, nome, id_curso):
+    for modulo in cursos.cursos_disponiveis[id_curso]["modulos"]:
+        progresso.marcar_modulo(nome, id_curso, modulo["id"])
+
+
+def test_emite_para_aluno_matriculado_que_concluiu(escola):
+    usuarios, cursos, progresso, certificados, id_curso = escola
+    concluir(progresso, cursos, "davi", id_curso)
+    emitido = certificados.emitir_certificado("davi", id_curso)
+    assert emitido["codigo"].startswith("CERT-")
+    assert usuarios.get_usuarios_cadastrados()["davi"]["certificados"][-1]["codigo"] == emitido["codigo"]
+
+def test_recusa_curso_nao_concluido(escola):
+    _, _, _, certificados, id_curso = escola
+    with pytest.raises(ValueError, match="não concluiu"):
+        certificados.emitir_certificado("davi", id_curso)
+
+def test_recusa_curso_em_que_o_aluno_nao_esta_matriculado(escola):
+    _, cursos, progresso, certificados, id_curso = escola
+    outro = cursos.cadastrar_curso("Banco de Dados", "10h", autor="admin")
+    importlib.import_module("modulos.modulos").incluir_modulo(outro, "SQL", autor="admin")
+    concluir(progresso, cursos, "davi", outro)  # Progresso sem matrícula não basta
+    with pytest.raises(ValueError, match="não está matriculado"):
+        certificados.emitir_certificado("davi", outro)
+
+def test_recusa_curso_sem_modulos(escola):
+    _, cursos, progresso, certificados, _ = escola
+    cursos.matricular_usuario("davi", "1")  # Curso padrão, sem módulos
+    assert not progresso.curso_concluido("davi", "1")
+    with pytest.raises(ValueError, match="não tem módulos"):
+        certificados.emitir_certificado("davi", "1")
+
+def test_recusa_usuario_e_curso_inexistentes(escola):
+    _, _, _, certificados, id_curso = escola
+    with pytest.raises(ValueError, match="Usuário não encontrado"):
+        certificados.emitir_certificado("ninguem", id_curso)
+    with pytest.raises(ValueError, match="Curso inválido"):
+        certificados.emitir_certificado("davi", "99")
+
+def test_codigo_deixa_de_valer_quando_o_aluno_e_removido(escola):
+    """Mesma regra no modo "sqlite" (tabela do repositório) e nos outros (banco à parte)"""
+    usuarios, cursos, progresso, certificados, id_curso = escola
+    validacao = importlib.import_module("certificados.validacao")
+    concluir(progresso, cursos, "davi", id_curso)
+    codigo = certificados.emitir_certificado("davi", id_curso)["codigo"]
+    assert validacao.validar_codigo(codigo)["aluno"] == "davi"
+    usuarios.excluir_usuario("davi")
+    assert validacao.validar_codigo(codigo) is None
+
+def test_registro_a_parte_so_tem_certificados(escola):
+    usuarios, cursos, progresso, certificados, id_curso = escola
+    validacao = importlib.import_module("certificados.validacao")
+    if usuarios.MODO_ARMAZENAMENTO == "sqlite":
+        pytest.skip("no modo sqlite o registro é o próprio repositório")
+    validacao.get_registro()
+    with sqlite3.connect(validacao.ARQUIVO_REGISTRO) as conexao:
+        tabelas = [t for t, in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    assert tabelas == ["certificados"]
+
+def test_remover_sem_registro_nao_cria_o_banco(escola):
+    usuarios, _, _, _, _ = escola
+    if usuarios.MODO_ARMAZENAMENTO == "sqlite":
+        pytest.skip("no modo sqlite o registro é o próprio repositório")
+    usuarios.excluir_usuario("davi")
+    assert not os.path.exists(importlib.import_module("certificados.validacao").ARQUIVO_REGISTRO)
+
+def anotar_codigos(certificados, monkeypatch, durante=None):
+    """Códigos gerados, em ordem; `durante` roda no meio da primeira emissão"""
+    codigos = []
+    gerar = certificados.Certificado.gerar
+    def gerar_e_anotar(self, *args, **kwargs):
+        caminho = gerar(self, *args, **kwargs)
+        codigos.append(self.codigo)
+        if durante and len(codigos) == 1:
+            durante()
+        return caminho
+    monkeypatch.setattr(certificados.Certificado, "gerar", gerar_e_anotar)
+    return codigos
+
+def test_emissao_nao_gravada_nao_entra_no_registro(escola, monkeypatch):
+    usuarios, cursos, progresso, certificados, id_curso = escola
+    validacao = importlib.import_module("certificados.validacao")
+    concluir(progresso, cursos, "davi", id_curso)
+    codigos = anotar_codigos(certificados, monkeypatch)
+    with monkeypatch.context() as m:
+        m.setattr(usuarios, "salvar_usuario", lambda nome, imediato=False: False)
+        with pytest.raises(ValueError, match="não gravado"):
+            certificados.emitir_certificado("davi", id_curso)
+    assert validacao.validar_codigo(codigos[0]) is None
+    assert not usuarios.get_usuarios_cadastrados()["davi"].get("certificados")
+
+def test_emissao_em_conflito_com_outro_terminal(escola, monkeypatch):
+    usuarios, cursos, progresso, certificados, id_curso = escola
+    if usuarios.MODO_ARMAZENAMENTO != "json":
+        pytest.skip("conflito de versão só no modo JSON")
+    from repositorio.armazem_json import ArmazemJSON
+    validacao = importlib.import_module("certificados.validacao")
+    concluir(progresso, cursos, "davi", id_curso)
+    usuarios.gravar_pendentes()
+
+    def outro_terminal_altera():  # Enquanto o PDF é gerado
+        outro = ArmazemJSON("dados_usuarios.json", dict)
+        outro.carregar()
+        outro.dados["davi"]["idade"] = 33
+        outro.salvar(["davi"])
+    codigos = anotar_codigos(certificados, monkeypatch, durante=outro_terminal_altera)
+    with pytest.raises(ValueError, match="não gravado"):
+        certificados.emitir_certificado("davi", id_curso)
+    assert validacao.validar_codigo(codigos[0]) is None
+    davi = usuarios.get_usuarios_cadastrados()["davi"]
+    assert davi["idade"] == 33 and not davi.get("certificados")  # A versão do outro terminal
+
+    emitido = certificados.emitir_certificado("davi", id_curso)  # Refeita sobre os dados atuais
+    assert validacao.validar_codigo(emitido["codigo"]) is not None
+    assert ArmazemJSON("dados_usuarios.json", dict).carregar()["davi"]["certificados"][0]["codigo"] == emitido["codigo"]
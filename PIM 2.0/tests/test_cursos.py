@@ -0,0 +1,73 @@
+# tests/test_cursos.py
+import importlib
+
+import pytest
+
+from repositorio.armazem_json import ArmazemJSON
+
+
+@pytest.fixture
+def escola(sistema, monkeypatch):
+    """Modo JSON com "ana_1" gravada, um curso e os registros do log capturados"""
+    usuarios = sistema("json")
+    cursos = importlib.import_module("cursos.cursos")
+    usuarios.cadastrar_usuario("ana_1", "ana@escola.com", 20, "Senha@123")
+    id_curso = cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    registros = []
+    monkeypatch.setattr(cursos, "registrar_log", lambda acao, detalhes="": registros.append(acao))
+    return usuarios, cursos, id_curso, registros
+
+def outro_terminal_altera(nome):
+    """Outro processo grava o usuário depois da nossa última leitura"""
+    outro = ArmazemJSON("dados_usuarios.json", dict)
+    outro.carregar()
+    outro.dados[nome]["idade"] = 33
+    outro.salvar([nome])
+
+
+def test_matricula_e_cancelamento_gravados_na_hora(escola):
+    usuarios, cursos, id_curso, registros = escola
+    assert cursos.matricular_usuario("ana_1", id_curso) is True
+    assert ArmazemJSON("dados_usuarios.json", dict).carregar()["ana_1"]["cursos"] == [id_curso]
+    assert cursos.cancelar_matricula("ana_1", id_curso) is True
+    assert ArmazemJSON("dados_usuarios.json", dict).carregar()["ana_1"]["cursos"] == []
+    assert registros == ["Matrícula realizada", "Matrícula cancelada"]
+
+def test_matricula_recusada_nao_fica_na_memoria(escola):
+    usuarios, cursos, id_curso, registros = escola
+    outro_terminal_altera("ana_1")
+    with pytest.raises(ValueError, match="não gravada"):
+        cursos.matricular_usuario("ana_1", id_curso)
+    aluno = usuarios.get_usuarios_cadastrados()["ana_1"]
+    assert aluno["idade"] == 33 and id_curso not in aluno.get("cursos", [])  # A versão do disco
+    assert cursos.alunos_do_curso(id_curso) == []
+    assert registros == []
+
+    assert cursos.matricular_usuario("ana_1", id_curso) is True  # Refeita sobre os dados atuais
+
+def test_cancelamento_recusado_mantem_a_matricula(escola):
+    usuarios, cursos, id_curso, registros = escola
+    cursos.matricular_usuario("ana_1", id_curso)
+    outro_terminal_altera("ana_1")
+    with pytest.raises(ValueError, match="não gravado"):
+        cursos.cancelar_matricula("ana_1", id_curso)
+    assert usuarios.get_usuarios_cadastrados()["ana_1"]["cursos"] == [id_curso]
+    assert cursos.alunos_do_curso(id_curso) == ["ana_1"]
+    assert registros == ["Matrícula realizada"]
+
+def test_desfaz_na_memoria_quando_o_registro_nao_foi_trocado(escola, monkeypatch):
+    usuarios, cursos, id_curso, registros = escola
+    cursos.matricular_usuario("ana_1", id_curso)
+    monkeypatch.setattr(usuarios, "salvar_usuario", lambda nome, imediato=False: False)
+    with pytest.raises(ValueError):
+        cursos.cancelar_matricula("ana_1", id_curso)
+    assert usuarios.get_usuarios_cadastrados()["ana_1"]["cursos"] == [id_curso]
+    assert cursos.alunos_do_curso(id_curso) == ["ana_1"]
+
+def test_cli_relata_o_cancelamento_recusado(escola):
+    usuarios, cursos, id_curso, _ = escola
+    cli = importlib.import_module("cli")
+    cursos.matricular_usuario("ana_1", id_curso)
+    outro_terminal_altera("ana_1")
+    resultado = cli._executar(cli.matricula, {"usuario": "ana_1", "curso": id_curso, "cancelar": True})
+    assert resultado["ok"] is False and "não gravado" in resultado["erro"]
@@ -0,0 +1,115 @@
+# tests/test_diario.py
+import json
+import os
+
+import pytest
+
+from usuarios.diario import DiarioUsuarios
+
+SNAPSHOT, DIARIO = "usuarios.json", "usuarios.diario"
+
+
+def padrao():
+    return {"admin": {"email": "admin@escola.com"}}
+
+def abrir(limite=1000):
+    return DiarioUsuarios(SNAPSHOT, DIARIO, padrao, limite)
+
+def anexar_linhas(caminho, *entradas):
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in entradas)
+
+@pytest.fixture
+def diario(pasta):
+    diario = abrir()
+    yield diario
+    diario.aguardar_compactacao()
+
+
+def test_sem_arquivos_carrega_o_padrao(diario):
+    assert diario.carregar() == padrao()
+    assert diario.entradas == 0
+
+def test_reaplica_o_diario_sobre_o_snapshot(diario):
+    diario.salvar_snapshot({"ana": {"idade": 20}, "bia": {"idade": 30}})
+    diario.registrar("ana", {"idade": 21})
+    diario.remover("bia")
+    diario.registrar_lote({"caio": {"idade": 40}, "davi": {"idade": 50}})
+    diario.remover("inexistente")
+
+    outro = abrir()
+    assert outro.carregar() == {"ana": {"idade": 21}, "caio": {"idade": 40}, "davi": {"idade": 50}}
+    assert outro.entradas == 5
+
+def test_linha_truncada_no_fim_e_ignorada(diario):
+    diario.registrar("ana", {"idade": 20})
+    with open(DIARIO, "a", encoding="utf-8") as f:
+        f.write('{"op": "set", "nome": "bia", "da')  # Queda no meio da escrita
+    assert abrir().carregar() == {**padrao(), "ana": {"idade": 20}}
+
+def test_gravacoes_depois_de_cauda_rasgada_sobrevivem(diario):
+    diario.registrar("ana", {"idade": 20})
+    with open(DIARIO, "a", encoding="utf-8") as f:
+        f.write('{"op": "set", "nome": "bia", "da')
+    depois = abrir()
+    assert depois.carregar() == {**padrao(), "ana": {"idade": 20}}
+    assert depois.descartadas == 1
+    depois.registrar("caio", {"idade": 30})
+    depois.remover("ana")
+    depois.registrar("davi", {"idade": 40})
+
+    relido = abrir()
+    assert relido.carregar() == {**padrao(), "caio": {"idade": 30}, "davi": {"idade": 40}}
+    assert relido.entradas == 4 and relido.descartadas == 0
+
+def test_ultima_entrada_sem_quebra_de_linha_e_mantida(diario):
+    anexar_linhas(DIARIO, {"op": "set", "nome": "ana", "dados": {"idade": 20}})
+    with open(DIARIO, "rb+") as f:
+        f.truncate(os.path.getsize(DIARIO) - 1)  # Caiu antes de escrever só o "\n"
+    depois = abrir()
+    depois.carregar()
+    depois.registrar("bia", {"idade": 30})
+    assert abrir().carregar() == {**padrao(), "ana": {"idade": 20}, "bia": {"idade": 30}}
+
+def test_linha_ilegivel_no_meio_nao_interrompe_a_releitura(diario):
+    diario.registrar("ana", {"idade": 20})
+    with open(DIARIO, "a", encoding="utf-8") as f:
+        f.write('{"op": "set", "nome": "bia"\n')
+    diario.registrar("caio", {"idade": 30})
+    relido = abrir()
+    assert relido.carregar() == {**padrao(), "ana": {"idade": 20}, "caio": {"idade": 30}}
+    assert relido.descartadas == 1
+
+def test_salvar_snapshot_zera_o_diario(diario):
+    diario.registrar("ana", {"idade": 20})
+    diario.salvar_snapshot({"bia": {"idade": 30}})
+    assert not os.path.exists(DIARIO) and diario.entradas == 0
+    assert abrir().carregar() == {"bia": {"idade": 30}}
+
+def test_compacta_ao_atingir_o_limite(pasta):
+    diario = abrir(limite=3)
+    for i in range(3):
+        diario.registrar(f"user{i}", {"idade": i})
+    diario.aguardar_compactacao()
+    assert not os.path.exists(DIARIO) and not os.path.exists(DIARIO + ".compactando")
+    with open(SNAPSHOT, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"admin", "user0", "user1", "user2"}
+
+    diario.registrar("user0", {"idade": 99})  # Depois da compactação, volta ao diário
+    assert diario.entradas == 1
+    assert abrir().carregar()["user0"] == {"idade": 99}
+
+def test_compactacao_interrompida_vem_antes_do_diario(pasta):
+    # Queda no meio da compactação: o diário separado ainda não foi dobrado no snapshot
+    anexar_linhas(DIARIO + ".compactando", {"op": "set", "nome": "ana", "dados": {"idade": 1}},
+                  {"op": "set", "nome": "bia", "dados": {"idade": 1}})
+    anexar_linhas(DIARIO, {"op": "set", "nome": "ana", "dados": {"idade": 2}},
+                  {"op": "del", "nome": "bia"})
+    diario = abrir(limite=3)
+    assert diario.carregar() == {**padrao(), "ana": {"idade": 2}}
+    assert diario.entradas == 2  # Só o diário atual conta para o limite
+
+    diario.registrar("caio", {"idade": 3})  # Atinge o limite: termina a compactação pendente
+    diario.aguardar_compactacao()
+    assert not os.path.exists(DIARIO + ".compactando")
+    assert abrir().carregar() == {**padrao(), "ana": {"idade": 2}, "caio": {"idade": 3}}
@@ -0,0 +1,109 @@
+# tests/test_fragmentos.py
+import json
+import os
+
+import pytest
+
+from usuarios.fragmentos import (
+    ARQUIVO_MANIFESTO, UsuariosFragmentados, caminho_emails, fragmentar, fragmento_de,
+    fragmentos_sugeridos, ler_manifesto, _ler_fragmentos
+)
+
+PASTA = "dados_usuarios"
+
+
+def usuario(email):
+    return {"email": email, "senha": "Senha@123", "idade": 20, "is_admin": False,
+            "data_cadastro": "2026-01-01T00:00:00", "cursos": []}
+
+@pytest.fixture
+def layout(pasta):
+    """500 usuários em 8 fragmentos"""
+    fragmentar(((f"user{i}", usuario(f"u{i}@escola.com")) for i in range(500)), PASTA, 8)
+    return pasta
+
+
+def test_fragmentar_distribui_pelo_hash_do_nome(layout):
+    assert ler_manifesto(PASTA) == {"formato": 1, "fragmentos": 8, "hash": "blake2b-32", "emails": True}
+    usuarios = dict(_ler_fragmentos(PASTA))
+    assert len(usuarios) == 500
+    with open(os.path.join(PASTA, "usuarios_003.json"), encoding="utf-8") as f:
+        assert all(fragmento_de(nome, 8) == 3 for nome in json.load(f))
+    assert not os.path.exists(PASTA + ".novo") and not os.path.exists(PASTA + ".antigo")
+
+def test_acesso_por_nome_abre_um_fragmento(layout):
+    mapa = UsuariosFragmentados(PASTA, dict)
+    assert mapa["user7"]["email"] == "u7@escola.com"
+    assert mapa.metricas()["fragmentos_abertos"] == 1
+    assert len(mapa) == 500  # Percorrer abre todos
+    assert mapa.metricas()["fragmentos_abertos"] == 8
+
+def test_refragmentar_preserva_usuarios_e_emails(layout):
+    antes = dict(_ler_fragmentos(PASTA))
+    contagem = fragmentar(list(_ler_fragmentos(PASTA)), PASTA, 32)
+    assert sum(contagem.values()) == 500 and len(contagem) == 32
+    assert dict(_ler_fragmentos(PASTA)) == antes
+    assert UsuariosFragmentados(PASTA, dict).emails.dono("U499@Escola.com") == "user499"
+
+def test_fragmentos_sugeridos_cresce_em_potencias_de_2():
+    assert fragmentos_sugeridos(0) == 16
+    assert fragmentos_sugeridos(16_001) == 32
+    assert fragmentos_sugeridos(100_000) == 128
+
+def test_migra_o_arquivo_unico_na_primeira_abertura(pasta):
+    with open("dados_usuarios.json", "w", encoding="utf-8") as f:
+        json.dump({"ana_1": usuario("ana@escola.com")}, f)
+    mapa = UsuariosFragmentados(PASTA, dict)
+    assert mapa["ana_1"]["email"] == "ana@escola.com"
+    assert mapa.emails.dono("ana@escola.com") == "ana_1"
+
+
+# ========== ÍNDICE DE EMAILS ==========
+def test_consulta_de_email_nao_abre_fragmentos_de_usuarios(layout):
+    mapa = UsuariosFragmentados(PASTA, dict)
+    assert mapa.emails.dono("U42@ESCOLA.COM") == "user42"
+    assert mapa.emails.dono("novo@escola.com") is None
+    assert mapa.metricas()["fragmentos_abertos"] == 0
+
+def test_layout_antigo_ganha_indice_de_emails(layout):
+    for indice in range(8):
+        os.remove(caminho_emails(PASTA, indice))
+    manifesto = ler_manifesto(PASTA)
+    del manifesto["emails"]
+    with open(os.path.join(PASTA, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f)
+
+    mapa = UsuariosFragmentados(PASTA, dict)
+    assert ler_manifesto(PASTA)["emails"] is True
+    assert mapa.emails.dono("u1@escola.com") == "user1"
+
+def test_dois_processos_reservando_o_mesmo_email(layout):
+    terminal_a = UsuariosFragmentados(PASTA, dict)
+    terminal_b = UsuariosFragmentados(PASTA, dict)
+    assert terminal_a.emails.dono("novo@escola.com") is None
+    assert terminal_b.emails.dono("novo@escola.com") is None  # Os dois conferiram antes de reservar
+    assert terminal_a.emails.reservar({"novo@escola.com": "ana_1"}) == []
+    assert terminal_b.emails.reservar({"Novo@Escola.com": "bia_2"}) == ["novo@escola.com"]
+    assert terminal_b.emails.dono("novo@escola.com") == "ana_1"
+
+def test_liberar_so_solta_o_email_do_proprio_dono(layout):
+    mapa = UsuariosFragmentados(PASTA, dict)
+    mapa.emails.liberar({"u1@escola.com": "outro"})
+    assert mapa.emails.dono("u1@escola.com") == "user1"
+    mapa.emails.liberar({"u1@escola.com": "user1"})
+    assert UsuariosFragmentados(PASTA, dict).emails.dono("u1@escola.com") is None
+
+
+# ========== CADASTRO NO MODO "fragmentos" ==========
+def test_cadastro_le_um_fragmento_e_recusa_email_repetido(sistema):
+    fragmentar(((f"user{i}", usuario(f"u{i}@escola.com")) for i in range(2000)), PASTA, 16)
+    usuarios = sistema("fragmentos")
+    with pytest.raises(ValueError, match="Email já cadastrado"):
+        usuarios.cadastrar_usuario("novo_1", "U5@escola.com", 20, "Senha@123")
+    usuarios.cadastrar_usuario("novo_1", "novo@escola.com", 20, "Senha@123")
+    assert usuarios.get_fragmentos().metricas()["fragmentos_abertos"] == 1
+    assert usuarios.dono_do_email("NOVO@escola.com") == "novo_1"
+
+    usuarios.remover_usuario("novo_1")
+    assert usuarios.dono_do_email("novo@escola.com") is None
+    usuarios.cadastrar_usuario("novo_2", "novo@escola.com", 20, "Senha@123")  # Email livre de novo
@@ -0,0 +1,89 @@
+# tests/test_importacao.py
+import csv
+import importlib
+
+import pytest
+
+CABECALHO = "nome,email,idade,senha,is_admin\n"
+
+
+def escrever(caminho, *linhas):
+    caminho.write_text(CABECALHO + "".join(l + "\n" for l in linhas), encoding="utf-8")
+    return str(caminho)
+
+def ler_csv(caminho):
+    with open(caminho, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_aceita_validos_e_relata_rejeitados(sistema, pasta):
+    usuarios = sistema("json")
+    importacao = importlib.import_module("usuarios.importacao")
+    lista = escrever(pasta / "lista.csv",
+                     "ana_1,ana@escola.com,20,Senha@123,",
+                     "bia_2,BIA@escola.com,30,Senha@123,sim",
+                     "bia_3,bia@escola.com,30,Senha@123,",      # email repetido no arquivo
+                     "admin,outro@escola.com,30,Senha@123,",    # nome já cadastrado
+                     "x,x@escola.com,30,Senha@123,",            # nome curto
+                     "dani_4,dani@escola.com,3,Senha@123,")     # idade
+    resultado = importacao.importar_usuarios(lista, str(pasta / "rejeitados.csv"))
+    assert resultado == {"aceitos": 2, "rejeitados": 4, "gravado": True}
+    motivos = {r["nome"]: r["motivo"] for r in ler_csv(pasta / "rejeitados.csv")}
+    assert motivos["bia_3"] == "Email já cadastrado"
+    assert motivos["admin"] == "Usuário já existe"
+    assert motivos["x"].startswith("nome:") and motivos["dani_4"].startswith("idade:")
+
+    # Gravados no arquivo (outro processo os veria) e com perfil certo
+    from repositorio.armazem_json import ArmazemJSON
+    disco = ArmazemJSON("dados_usuarios.json", dict).carregar()
+    assert {"ana_1", "bia_2"} <= disco.keys() and disco["bia_2"]["is_admin"] is True
+    assert usuarios.get_indices().buscar_por_email("ana@ESCOLA.com") == "ana_1"
+
+@pytest.mark.parametrize("modo", ["json", "fragmentos"])
+def test_conflito_ao_gravar_nao_deixa_aceitos_so_na_memoria(sistema, pasta, monkeypatch, modo):
+    usuarios = sistema(modo)
+    importacao = importlib.import_module("usuarios.importacao")
+    from repositorio.armazem_json import ArmazemJSON
+    from usuarios.fragmentos import caminho_fragmento, fragmento_de
+
+    def arquivo_de(nome):
+        if modo == "json":
+            return usuarios.ARQUIVO_JSON
+        return caminho_fragmento(usuarios.PASTA_FRAGMENTOS, fragmento_de(nome, usuarios.get_fragmentos().total))
+
+    original = importacao.salvar_usuarios_lote
+    def outro_terminal_cadastra_antes(nomes):
+        # Entre a validação e a gravação, outro processo grava "bia_2" no mesmo arquivo
+        outro = ArmazemJSON(arquivo_de("bia_2"), dict)
+        outro.carregar()
+        outro.dados["bia_2"] = {"email": "bia@outro.com", "senha": "x", "idade": 40, "is_admin": False,
+                                "data_cadastro": "2026-01-01T00:00:00", "cursos": []}
+        outro.salvar(["bia_2"])
+        return original(nomes)
+    monkeypatch.setattr(importacao, "salvar_usuarios_lote", outro_terminal_cadastra_antes)
+
+    lista = escrever(pasta / "lista.csv",
+                     "bia_2,bia@escola.com,20,Senha@123,",
+                     "caio_3,caio@escola.com,20,Senha@123,")
+    resultado = importacao.importar_usuarios(lista, str(pasta / "rejeitados.csv"))
+
+    mesmo_arquivo = arquivo_de("caio_3") == arquivo_de("bia_2")
+    nao_gravados = {"bia_2", "caio_3"} if mesmo_arquivo else {"bia_2"}
+    assert resultado["gravado"] is False
+    assert resultado["nao_gravados"] == len(nao_gravados)
+    assert resultado["aceitos"] == 2 - len(nao_gravados)
+    assert {r["nome"] for r in ler_csv(resultado["arquivo_nao_gravados"])} == nao_gravados
+    assert ler_csv(resultado["arquivo_nao_gravados"])[0]["senha"] == "Senha@123"  # Pronto para reimportar
+
+    memoria = usuarios.get_usuarios_cadastrados()
+    assert memoria["bia_2"]["email"] == "bia@outro.com"  # A versão do outro terminal
+    assert ("caio_3" in memoria) == (not mesmo_arquivo)
+    assert usuarios.get_indices().buscar_por_email("bia@escola.com") is None
+    assert (usuarios.get_indices().buscar_por_email("caio@escola.com") is None) == mesmo_arquivo
+
+    # Reimportar o arquivo de pendentes grava o que sobrou (bia_2 agora é repetido)
+    monkeypatch.setattr(importacao, "salvar_usuarios_lote", original)
+    retry = importacao.importar_usuarios(resultado["arquivo_nao_gravados"], str(pasta / "rej2.csv"))
+    assert retry["gravado"] is True
+    assert retry["aceitos"] == len(nao_gravados - {"bia_2"})
+    assert "caio_3" in usuarios.get_usuarios_cadastrados()
@@ -0,0 +1,61 @@
+# tests/test_indices.py
+from datetime import datetime, timedelta
+
+from usuarios.indices import IndicesUsuarios, chave_data, chave_email
+
+
+def registro(email, admin=False, data="2026-03-01T10:00:00", cursos=()):
+    return {"email": email, "is_admin": admin, "data_cadastro": data, "cursos": list(cursos)}
+
+def montar():
+    usuarios = {
+        "ana": registro("Ana@Escola.com", data="2026-03-01T10:00:00", cursos=["1"]),
+        "bia": registro("bia@escola.com", admin=True, data="2026-03-05T10:00:00"),
+        "caio": registro("caio@escola.com", data="2026-03-09T10:00:00", cursos=["1", "2"]),
+    }
+    return usuarios, IndicesUsuarios(usuarios)
+
+
+def test_chaves():
+    assert chave_email("  Ana@Escola.COM ") == "ana@escola.com"
+    assert chave_data("não é data") == 0
+    assert chave_data(datetime(1970, 1, 1, 0, 0, 1)) == 1_000_000
+
+def test_consultas():
+    _, indices = montar()
+    assert indices.buscar_por_email("ANA@escola.com") == "ana"
+    assert indices.nomes_por_perfil(True) == ["bia"]
+    assert indices.contar_por_perfil() == {"admin": 1, "aluno": 2}
+    assert indices.cadastrados_entre("2026-03-02", "2026-03-09T10:00:00") == ["bia"]
+    assert indices.cadastrados_entre(inicio="2026-03-05") == ["bia", "caio"]
+    assert indices.alunos_do_curso("1") == ["ana", "caio"]
+    assert indices.contar_alunos_por_curso() == {"1": 2, "2": 1}
+
+def test_atualizar_cadastro_matricula_e_remocao():
+    usuarios, indices = montar()
+    usuarios["dani"] = registro("dani@escola.com", data="2026-03-03T00:00:00")
+    usuarios["ana"]["cursos"].append("2")
+    del usuarios["caio"]
+    indices.atualizar(["dani", "ana", "caio"])
+    assert indices.buscar_por_email("caio@escola.com") is None
+    assert indices.cadastrados_entre() == ["ana", "dani", "bia"]
+    assert indices.alunos_do_curso("2") == ["ana"]
+    assert indices.contar_por_perfil() == {"admin": 1, "aluno": 2}
+
+def test_atualizacao_em_lote_igual_a_reconstrucao():
+    usuarios, indices = montar()
+    inicio = datetime(2026, 1, 1)
+    for i in range(1500):  # Acima de LOTE_INCREMENTAL: reordena de uma vez
+        usuarios[f"u{i}"] = registro(f"u{i}@x.com", data=(inicio + timedelta(minutes=7 * i)).isoformat())
+    indices.atualizar([f"u{i}" for i in range(1500)])
+    do_zero = IndicesUsuarios(usuarios)
+    assert indices.cadastrados_entre() == do_zero.cadastrados_entre()
+    assert indices.contar_por_perfil() == do_zero.contar_por_perfil()
+
+def test_observar_registros_de_outro_processo():
+    _, indices = montar()
+    disco = {"eva": registro("eva@escola.com", cursos=["3"])}
+    indices.observar(["eva"], disco)
+    assert indices.alunos_do_curso("3") == ["eva"]
+    indices.observar(["eva"], {})  # Removida no outro processo
+    assert indices.alunos_do_curso("3") == []
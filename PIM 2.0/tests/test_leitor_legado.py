@@ -0,0 +1,55 @@
+# tests/test_leitor_legado.py
+import pytest
+
+import registros.leitor_legado as leitor_legado
+from registros.leitor_legado import SEPARADOR, LeitorLogLegado
+
+
+def escrever_log(caminho, quantidade, fim_de_linha="\n"):
+    """Log no formato antigo de registrar_log; a entrada 3 tem detalhes em duas linhas"""
+    blocos = []
+    for i in range(quantidade):
+        detalhes = f"linha um {i}\nlinha dois {i}" if i == 3 else f"detalhe {i}"
+        blocos.append(f"[2025-05-22 10:{i // 60:02d}:{i % 60:02d}] Usuário: user{i % 3}\n"
+                      f"Ação: Acao{i}\nDetalhes: {detalhes}\n{SEPARADOR}\n")
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        f.write("".join(blocos).replace("\n", fim_de_linha))
+
+
+@pytest.fixture(params=[7, 64 * 1024], ids=["blocos_pequenos", "bloco_padrao"])
+def bloco(request, monkeypatch):
+    """Blocos menores que uma linha exercitam as linhas partidas entre leituras"""
+    monkeypatch.setattr(leitor_legado, "TAMANHO_BLOCO", request.param)
+
+
+@pytest.mark.parametrize("fim_de_linha", ["\n", "\r\n"])
+def test_paginas_cobrem_o_arquivo_em_ordem(pasta, bloco, fim_de_linha):
+    escrever_log("log.txt", 25, fim_de_linha)
+    leitor = LeitorLogLegado("log.txt")
+    paginas, cursor = [], None
+    while True:
+        entradas, cursor = leitor.pagina(cursor, quantidade=10)
+        paginas.append([e["acao"] for e in entradas])
+        if cursor is None:
+            break
+    assert [len(p) for p in paginas] == [10, 10, 5]
+    assert sum(reversed(paginas), []) == [f"Acao{i}" for i in range(25)]
+
+def test_detalhes_em_varias_linhas(pasta, bloco):
+    escrever_log("log.txt", 5)
+    entrada = LeitorLogLegado("log.txt").ultimas(5)[3]
+    assert entrada["ts"] == "2025-05-22 10:00:03" and entrada["usuario"] == "user0"
+    assert entrada["detalhes"] == "linha um 3\nlinha dois 3"
+
+def test_filtro_e_pagina_exata(pasta, bloco):
+    escrever_log("log.txt", 9)
+    leitor = LeitorLogLegado("log.txt")
+    entradas, cursor = leitor.pagina(quantidade=3, filtro="USUÁRIO: user1")
+    assert [e["acao"] for e in entradas] == ["Acao1", "Acao4", "Acao7"]
+    assert cursor is not None  # Ainda pode haver (não se sabe sem ler o resto)
+    assert leitor.pagina(cursor, quantidade=3, filtro="user1") == ([], None)
+    # A página termina exatamente na primeira entrada: não há página anterior
+    assert leitor.pagina(quantidade=9)[1] is None
+
+def test_arquivo_inexistente(pasta):
+    assert LeitorLogLegado("nao_existe.log").pagina() == ([], None)
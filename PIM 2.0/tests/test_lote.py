@@ -0,0 +1,64 @@
+# tests/test_lote.py
+import importlib
+import os
+
+import pytest
+
+
+@pytest.fixture
+def turma(sistema, monkeypatch):
+    """Curso com um módulo concluído por três alunos; PDFs falsos (sem fpdf)"""
+    usuarios = sistema("json")
+    cursos = importlib.import_module("cursos.cursos")
+    modulos = importlib.import_module("modulos.modulos")
+    progresso = importlib.import_module("modulos.progresso")
+    certificados = importlib.import_module("certificados.certificados")
+    lote = importlib.import_module("certificados.lote")
+
+    def gerar(self, nome_aluno, nome_curso, carga_horaria, codigo=None):
+        self.codigo = codigo
+        return f"{certificados.PASTA_CERTIFICADOS}/{codigo}.pdf"
+    monkeypatch.setattr(certificados.Certificado, "gerar", gerar)
+
+    id_curso = cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    modulo = modulos.incluir_modulo(id_curso, "Camadas", autor="admin")
+    for nome in ("ana_1", "bia_2", "caio_3"):
+        usuarios.cadastrar_usuario(nome, f"{nome}@escola.com", 20, "Senha@123")
+        cursos.matricular_usuario(nome, id_curso)
+        progresso.marcar_modulo(nome, id_curso, modulo["id"])
+    return usuarios, lote, id_curso
+
+def codigos(usuarios, nome):
+    return [c["codigo"] for c in usuarios.get_usuarios_cadastrados()[nome].get("certificados", [])]
+
+
+def test_emite_grava_e_registra(turma):
+    usuarios, lote, id_curso = turma
+    resultado = lote.emitir_lote(id_curso, processos=1, mostrar_progresso=False)
+    assert resultado == {"emitidos": 3, "falhas": [], "gravado": True, "pendentes": 0}
+    assert not os.path.exists(lote.caminho_checkpoint(id_curso))
+    from certificados.validacao import validar_codigo
+    codigo, = codigos(usuarios, "bia_2")
+    assert validar_codigo(codigo)["aluno"] == "bia_2"
+    assert lote.selecionar_aptos(id_curso) == []
+
+def test_conflito_ao_gravar_mantem_checkpoint_e_nao_registra(turma, monkeypatch):
+    usuarios, lote, id_curso = turma
+    from certificados.validacao import get_registro, validar_codigo
+    with monkeypatch.context() as m:
+        m.setattr(usuarios, "salvar_usuarios_lote", lambda nomes: False)  # ConflitoVersao no armazém
+        resultado = lote.emitir_lote(id_curso, processos=1, mostrar_progresso=False)
+    assert resultado["gravado"] is False and resultado["pendentes"] == 3
+    assert os.path.exists(lote.caminho_checkpoint(id_curso))
+    prontos = lote.ler_checkpoint(id_curso)
+    assert all(validar_codigo(r["codigo"]) is None for r in prontos.values())
+    assert get_registro().contar_certificados() == 0
+    assert all(codigos(usuarios, nome) == [] for nome in prontos)  # Nada fica só na memória
+
+    # A próxima execução grava os mesmos códigos, sem emitir de novo
+    resultado = lote.emitir_lote(id_curso, processos=1, mostrar_progresso=False)
+    assert resultado["gravado"] is True and resultado["emitidos"] == 3
+    for nome, registro in prontos.items():
+        assert codigos(usuarios, nome) == [registro["codigo"]]
+        assert validar_codigo(registro["codigo"])["aluno"] == nome
+    assert not os.path.exists(lote.caminho_checkpoint(id_curso))
@@ -0,0 +1,83 @@
+# tests/test_progresso.py
+import importlib
+import json
+
+import pytest
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def escola(request, sistema):
+    """Curso com os módulos "Camadas" (duas aulas) e "Roteamento" (sem aulas), "davi" matriculado"""
+    usuarios = sistema(request.param)
+    cursos = importlib.import_module("cursos.cursos")
+    modulos = importlib.import_module("modulos.modulos")
+    progresso = importlib.import_module("modulos.progresso")
+    usuarios.cadastrar_usuario("davi", "davi@escola.com", 20, "Senha@123")
+    id_curso = cursos.cadastrar_curso("Redes", "20h", autor="admin")
+    camadas = modulos.incluir_modulo(id_curso, "Camadas", autor="admin")
+    roteamento = modulos.incluir_modulo(id_curso, "Roteamento", autor="admin")
+    cursos.cursos_disponiveis[id_curso]["modulos"][0]["aulas"] = ["Física", "Enlace"]
+    cursos.salvar_cursos(imediato=True)
+    cursos.matricular_usuario("davi", id_curso)
+    return cursos, modulos, progresso, id_curso, camadas["id"], roteamento["id"]
+
+
+def test_marcar_modulo_e_percentual(escola):
+    _, _, progresso, id_curso, camadas, roteamento = escola
+    progresso.marcar_modulo("davi", id_curso, roteamento)
+    assert progresso.percentual("davi", id_curso) == 50.0
+    assert not progresso.curso_concluido("davi", id_curso)
+    progresso.marcar_modulo("davi", id_curso, camadas)
+    assert progresso.curso_concluido("davi", id_curso)
+    progresso.marcar_modulo("davi", id_curso, camadas, concluido=False)
+    assert progresso.percentual("davi", id_curso) == 50.0
+
+def test_aulas_concluem_o_modulo_e_desmarcar_desfaz(escola):
+    _, _, progresso, id_curso, camadas, _ = escola
+    assert progresso.marcar_aula("davi", id_curso, camadas, 0) is False
+    assert progresso.marcar_aula("davi", id_curso, camadas, 1) is True
+    assert progresso.percentual("davi", id_curso) == 50.0
+    assert progresso.marcar_aula("davi", id_curso, camadas, 0, concluida=False) is False
+    assert progresso.percentual("davi", id_curso) == 0.0
+
+@pytest.mark.parametrize("aula", [-1, 2, 10**12])
+def test_aula_inexistente(escola, aula):
+    _, _, progresso, id_curso, camadas, _ = escola
+    with pytest.raises(ValueError, match="Aula não encontrada"):
+        progresso.marcar_aula("davi", id_curso, camadas, aula)
+
+def test_modulo_sem_aulas_nao_conclui_por_aula(escola):
+    _, _, progresso, id_curso, _, roteamento = escola
+    with pytest.raises(ValueError, match="Aula não encontrada"):
+        progresso.marcar_aula("davi", id_curso, roteamento, 0)
+    assert progresso.percentual("davi", id_curso) == 0.0
+
+def test_mascara_acompanha_modulos_sem_invalidar(escola):
+    """O cache não depende de `_versao` (sempre 0 no SQLite) nem de invalidar_curso"""
+    cursos, _, progresso, id_curso, camadas, roteamento = escola
+    progresso.marcar_modulo("davi", id_curso, camadas)
+    progresso.marcar_modulo("davi", id_curso, roteamento)
+    assert progresso.curso_concluido("davi", id_curso)
+    curso = cursos.cursos_disponiveis[id_curso]
+    curso["modulos"].append({"id": progresso.novo_id_modulo(curso), "nome": "Extra", "aulas": []})
+    assert progresso.mascara_curso(id_curso)[1] == 3
+    assert not progresso.curso_concluido("davi", id_curso)
+    curso["modulos"].pop()  # Remove e inclui outro: mesma quantidade, outro ID
+    curso["modulos"].append({"id": progresso.novo_id_modulo(curso), "nome": "Outro", "aulas": []})
+    novo = curso["modulos"][-1]["id"]
+    assert progresso.mascara_curso(id_curso)[0] >> novo & 1
+    curso["modulos"].pop()
+    assert progresso.curso_concluido("davi", id_curso)
+
+def test_cli_marca_aula(escola, capsys):
+    _, _, progresso, id_curso, _, _ = escola
+    cli = importlib.import_module("cli")
+    for aula in ("1", "2"):
+        assert cli.main(["progresso", "--usuario", "davi", "--curso", id_curso,
+                         "--modulo", "1", "--aula", aula]) == 0
+    saida = [json.loads(linha) for linha in capsys.readouterr().out.splitlines()]
+    assert [s["modulo_concluido"] for s in saida] == [False, True]
+    assert saida[-1]["percentual"] == 50.0
+    assert cli.main(["progresso", "--usuario", "davi", "--curso", id_curso,
+                     "--modulo", "2", "--aula", "1"]) == 1
+    assert json.loads(capsys.readouterr().out)["erro"] == "Aula não encontrada!"
@@ -0,0 +1,101 @@
+# tests/test_registros.py
+import threading
+import time
+from datetime import datetime
+
+import registros.registros as registros
+from registros.registros import EscritorLogAssincrono, get_escritor, _escritores
+
+
+def entrada(acao="Ação", detalhes=""):
+    return {"timestamp": datetime(2026, 1, 2, 3, 4, 5), "usuario": "ana", "acao": acao, "detalhes": detalhes}
+
+def descarregar_com_prazo(escritor, prazo=3.0) -> bool:
+    """True se o descarregar() terminou dentro do prazo"""
+    t = threading.Thread(target=escritor.descarregar, daemon=True)
+    t.start()
+    t.join(prazo)
+    return not t.is_alive()
+
+
+def test_grava_em_lotes_no_formato_texto(pasta):
+    escritor = EscritorLogAssincrono("log.txt", tamanho_lote=3, intervalo=10)
+    for i in range(7):
+        escritor.registrar(entrada(f"Ação {i}"))
+    escritor.encerrar()
+    texto = (pasta / "log.txt").read_text(encoding="utf-8")
+    assert texto.count("-" * 50) == 7
+    assert "[2026-01-02 03:04:05] Usuário: ana\nAção: Ação 6\n" in texto
+    assert escritor.metricas()["gravadas"] == 7
+    assert escritor.lotes == 3  # 3 + 3 + o resto no encerramento
+
+def test_descarregar_espera_a_fila(pasta):
+    escritor = EscritorLogAssincrono("log.txt", intervalo=10)
+    escritor.registrar(entrada())
+    escritor.descarregar()
+    assert "Ação: Ação" in (pasta / "log.txt").read_text(encoding="utf-8")
+    escritor.encerrar()
+
+def test_erro_no_destino_nao_trava_descarregar(pasta):
+    chamadas = []
+    def destino(lote, fsync):
+        chamadas.append(len(lote))
+        if len(chamadas) == 1:
+            raise OSError(28, "No space left on device")
+
+    escritor = EscritorLogAssincrono("auditoria", destino=destino, intervalo=0.05)
+    escritor.registrar(entrada("Perdida?"))
+    time.sleep(0.3)  # Primeiro lote falha
+    escritor.registrar(entrada("Depois"))
+    assert descarregar_com_prazo(escritor)
+    assert escritor._thread.is_alive()  # A mesma thread continua atendendo
+
+    metricas = escritor.metricas()
+    assert metricas["falhas"] == 1
+    assert metricas["desviadas_erros_log"] == 1
+    assert metricas["gravadas"] == 1
+    assert "No space left" in metricas["ultimo_erro"]
+    erros = (pasta / "erros.log").read_text(encoding="utf-8")
+    assert "Falha ao gravar 1 registro(s) em auditoria" in erros
+    assert "Ação: Perdida?" in erros
+    escritor.encerrar()
+
+def test_erro_no_arquivo_de_texto_vai_para_erros_log(pasta):
+    (pasta / "pasta_no_lugar_do_log").mkdir()  # open(..., 'a') falha com IsADirectoryError
+    escritor = EscritorLogAssincrono("pasta_no_lugar_do_log", intervalo=10)
+    escritor.registrar(entrada("Login"))
+    assert descarregar_com_prazo(escritor)
+    assert escritor.falhas == 1
+    assert "Ação: Login" in (pasta / "erros.log").read_text(encoding="utf-8")
+    escritor.encerrar()
+
+def test_sem_erros_log_as_entradas_sao_contadas_como_perdidas(pasta):
+    def destino(lote, fsync):
+        raise PermissionError("somente leitura")
+    (pasta / "erros").mkdir()
+    escritor = EscritorLogAssincrono("x", destino=destino, intervalo=10, arquivo_erros="erros")
+    escritor.registrar(entrada())
+    escritor.registrar(entrada())
+    assert descarregar_com_prazo(escritor)
+    assert escritor.metricas()["perdidas"] == 2
+    escritor.encerrar()
+
+def test_durabilidade_por_escritor(pasta, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(registros.os, "fsync", lambda fd: fsyncs.append(fd))
+    monkeypatch.setattr(registros, "DURABILIDADE", "nenhuma")
+    comum = EscritorLogAssincrono("comum.log", intervalo=10)
+    seguro = EscritorLogAssincrono("seguro.log", intervalo=10, durabilidade="fsync")
+    for escritor in (comum, seguro):
+        escritor.registrar(entrada())
+        escritor.encerrar()
+    assert comum.durabilidade == "nenhuma" and seguro.durabilidade == "fsync"
+    assert len(fsyncs) == 1
+
+def test_get_escritor_compartilha_e_aceita_durabilidade(pasta):
+    try:
+        escritor = get_escritor("compartilhado.log")
+        assert get_escritor("compartilhado.log") is escritor
+        assert get_escritor("compartilhado.log", durabilidade="fsync").durabilidade == "fsync"
+    finally:
+        _escritores.pop("compartilhado.log", None)
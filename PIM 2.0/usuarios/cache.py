@@ -0,0 +1,62 @@
+# usuarios/cache.py
+import os
+import threading
+from typing import Callable, Dict, Sequence, Tuple
+
+
+class CacheArquivo:
+    """Guarda o resultado de um carregador e só relê quando o arquivo muda.
+
+    A validade é conferida pelo carimbo (mtime em ns + tamanho) de cada
+    arquivo de origem: um `os.stat` por consulta no lugar de um parse inteiro.
+    """
+
+    def __init__(self, caminhos: Callable[[], Sequence[str]], carregar: Callable[[], Dict]):
+        self.caminhos = caminhos
+        self.carregar = carregar
+        self.dados = None
+        self.carimbo = None
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+
+    def carimbo_atual(self) -> Tuple:
+        carimbo = []
+        for caminho in self.caminhos():
+            try:
+                info = os.stat(caminho)
+                carimbo.append((info.st_mtime_ns, info.st_size))
+            except FileNotFoundError:
+                carimbo.append(None)
+        return tuple(carimbo)
+
+    def obter(self) -> Dict:
+        """Devolve os dados em cache, recarregando só se a origem mudou"""
+        with self._trava:
+            carimbo = self.carimbo_atual()
+            if self.dados is not None and carimbo == self.carimbo:
+                self.acertos += 1
+                return self.dados
+            self.falhas += 1
+            self.dados = self.carregar()
+            self.carimbo = carimbo
+            return self.dados
+
+    def atualizar(self, dados: Dict):
+        """Após uma gravação própria: guarda o novo carimbo sem reler o arquivo"""
+        with self._trava:
+            self.dados = dados
+            self.carimbo = self.carimbo_atual()
+
+    def invalidar(self):
+        with self._trava:
+            self.dados = None
+            self.carimbo = None
+
+    def estatisticas(self) -> Dict:
+        total = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.acertos / total if total else 0.0,
+        }
@@ -0,0 +1,156 @@
+# usuarios/diario.py
+import json
+import os
+import threading
+from typing import Callable, Dict, Tuple
+
+
+# ========== CONFIGURAÇÕES ==========
+LIMITE_COMPACTACAO = 500  # Entradas no diário antes de compactar em segundo plano
+
+
+class DiarioUsuarios:
+    """Armazenamento em diário: cada alteração vira uma linha no fim do arquivo.
+
+    O estado completo é o snapshot (JSON normal) com o diário reaplicado por
+    cima. Gravar um usuário custa O(1), independente do total de usuários; a
+    compactação periódica dobra o diário de volta no snapshot.
+    """
+
+    def __init__(self, arquivo_snapshot: str, arquivo_diario: str,
+                 padrao: Callable[[], Dict], limite_compactacao: int = LIMITE_COMPACTACAO):
+        self.arquivo_snapshot = arquivo_snapshot
+        self.arquivo_diario = arquivo_diario
+        self.arquivo_compactando = arquivo_diario + ".compactando"
+        self.padrao = padrao
+        self.limite_compactacao = limite_compactacao
+        self.entradas = 0
+        self.descartadas = 0  # Linhas ilegíveis puladas no último carregar()
+        self._trava = threading.Lock()
+        self._compactacao = None
+
+    # ========== LEITURA ==========
+    def carregar(self) -> Dict:
+        """Lê o snapshot e reaplica o diário (inclusive de compactação interrompida)"""
+        dados = self._ler_snapshot()
+        _, descartadas, _ = self._reaplicar(dados, self.arquivo_compactando)
+        self.entradas, descartadas_diario, integro = self._reaplicar(dados, self.arquivo_diario)
+        self.descartadas = descartadas + descartadas_diario
+        self._reparar_cauda(integro)
+        return dados
+
+    def _ler_snapshot(self) -> Dict:
+        if os.path.exists(self.arquivo_snapshot):
+            with open(self.arquivo_snapshot, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return self.padrao()
+
+    @staticmethod
+    def _reaplicar(dados: Dict, caminho: str) -> Tuple[int, int, int]:
+        """Aplica as entradas de um diário sobre os dados.
+
+        Retorna (entradas lidas, linhas ilegíveis puladas, bytes até o fim da
+        última linha inteira); o que vem depois é cauda rasgada por queda no
+        meio da escrita.
+        """
+        if not os.path.exists(caminho):
+            return 0, 0, 0
+        total = descartadas = integro = 0
+        with open(caminho, 'rb') as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:  # JSON ou UTF-8 inválido
+                    descartadas += 1
+                    if linha.endswith(b"\n"):  # Só esta linha se perdeu: as seguintes valem
+                        integro += len(linha)
+                    continue
+                if entrada["op"] == "set":
+                    dados[entrada["nome"]] = entrada["dados"]
+                elif entrada["op"] == "del":
+                    dados.pop(entrada["nome"], None)
+                total += 1
+                integro += len(linha)
+        return total, descartadas, integro
+
+    def _reparar_cauda(self, integro: int):
+        """Corta a cauda rasgada do diário (e termina com quebra de linha a última
+        entrada inteira) antes de anexar; senão a próxima gravação colaria nela
+        e se perderia na releitura"""
+        if not os.path.exists(self.arquivo_diario):
+            return
+        with open(self.arquivo_diario, 'rb+') as f:
+            if os.fstat(f.fileno()).st_size > integro:
+                f.truncate(integro)
+            if integro:
+                f.seek(integro - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    # ========== ESCRITA ==========
+    def registrar(self, nome: str, dados: Dict):
+        """Anexa a criação/atualização de um usuário"""
+        self._anexar({"op": "set", "nome": nome, "dados": dados})
+
+    def remover(self, nome: str):
+        """Anexa a remoção de um usuário"""
+        self._anexar({"op": "del", "nome": nome})
+
+    def registrar_lote(self, usuarios: Dict[str, Dict]):
+        """Anexa vários usuários com uma única escrita no diário"""
+        self._anexar(*({"op": "set", "nome": nome, "dados": dados}
+                       for nome, dados in usuarios.items()))
+
+    def _anexar(self, *entradas: Dict):
+        linhas = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entradas)
+        with self._trava:
+            with open(self.arquivo_diario, 'a', encoding='utf-8') as f:
+                f.write(linhas)
+            self.entradas += len(entradas)
+            if self.entradas >= self.limite_compactacao:
+                self._iniciar_compactacao()
+
+    def salvar_snapshot(self, dados: Dict):
+        """Grava o estado completo como novo snapshot e zera o diário"""
+        self.aguardar_compactacao()
+        with self._trava:
+            self._gravar_snapshot(dados)
+            for caminho in (self.arquivo_diario, self.arquivo_compactando):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+            self.entradas = 0
+
+    def _gravar_snapshot(self, dados: Dict):
+        """Escreve em arquivo temporário e troca de uma vez (nunca deixa snapshot pela metade)"""
+        temporario = self.arquivo_snapshot + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.arquivo_snapshot)
+
+    # ========== COMPACTAÇÃO ==========
+    def _iniciar_compactacao(self):
+        """Separa o diário atual e compacta em segundo plano (chamar com a trava)"""
+        if self._compactacao and self._compactacao.is_alive():
+            return
+        if not os.path.exists(self.arquivo_compactando):
+            os.replace(self.arquivo_diario, self.arquivo_compactando)
+            self.entradas = 0
+        # Se já existe (queda durante a compactação anterior), só termina ela
+        self._compactacao = threading.Thread(target=self._compactar, daemon=True)
+        self._compactacao.start()
+
+    def _compactar(self):
+        """Dobra o diário separado no snapshot lendo só dos arquivos"""
+        dados = self._ler_snapshot()
+        self._reaplicar(dados, self.arquivo_compactando)
+        with self._trava:
+            self._gravar_snapshot(dados)
+            if os.path.exists(self.arquivo_compactando):
+                os.remove(self.arquivo_compactando)
+
+    def aguardar_compactacao(self):
+        """Espera a compactação em andamento terminar"""
+        if self._compactacao:
+            self._compactacao.join()
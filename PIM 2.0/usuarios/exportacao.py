@@ -0,0 +1,198 @@
+# usuarios/exportacao.py
+"""Exportação de usuários, matrículas, progresso e certificados em CSV/JSONL.
+
+Uso (na pasta do projeto):
+    python -m usuarios.exportacao usuarios saida.csv --perfil aluno --desde 2025-01-01
+    python -m usuarios.exportacao certificados saida.jsonl --campos codigo,usuario,data
+"""
+import argparse
+import csv
+import json
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from usuarios.usuarios import (
+    obter_usuarios_atualizados, registrar_log,
+    COR_ADM, COR_ERRO, COR_SUCESSO, RESET_COR
+)
+
+
+# ========== FILTROS ==========
+def _data_cadastro(dados: Dict) -> Optional[date]:
+    try:
+        return datetime.fromisoformat(dados.get("data_cadastro", "")).date()
+    except (TypeError, ValueError):
+        return None
+
+def filtrar_usuarios(perfil: Optional[str] = None, desde: Optional[date] = None,
+                     ate: Optional[date] = None) -> Iterator[Tuple[str, Dict]]:
+    """(nome, dados) dos usuários que passam nos filtros, um de cada vez.
+
+    `perfil` é "admin" ou "aluno"; `desde`/`ate` limitam a data de cadastro
+    (inclusive). No modo SQLite os usuários vêm do banco em lotes.
+    """
+    for nome, dados in obter_usuarios_atualizados().items():
+        if perfil == "admin" and not dados.get("is_admin"):
+            continue
+        if perfil == "aluno" and dados.get("is_admin"):
+            continue
+        if desde or ate:
+            cadastro = _data_cadastro(dados)
+            if cadastro is None or (desde and cadastro < desde) or (ate and cadastro > ate):
+                continue
+        yield nome, dados
+
+
+# ========== CONJUNTOS ==========
+def linhas_usuarios(usuarios: Iterable[Tuple[str, Dict]]) -> Iterator[Dict]:
+    for nome, dados in usuarios:
+        yield {
+            "nome": nome,
+            "email": dados.get("email"),
+            "idade": dados.get("idade"),
+            "is_admin": bool(dados.get("is_admin")),
+            "data_cadastro": dados.get("data_cadastro"),
+            "cursos": len(dados.get("cursos", [])),
+            "certificados": len(dados.get("certificados", [])),
+        }
+
+def linhas_matriculas(usuarios: Iterable[Tuple[str, Dict]]) -> Iterator[Dict]:
+    from cursos.cursos import cursos_disponiveis
+    for nome, dados in usuarios:
+        for id_curso in dados.get("cursos", []):
+            curso = cursos_disponiveis.get(id_curso)
+            yield {
+                "usuario": nome,
+                "id_curso": id_curso,
+                "curso": curso["nome"] if curso else "Curso Removido",
+            }
+
+def linhas_progresso(usuarios: Iterable[Tuple[str, Dict]]) -> Iterator[Dict]:
+    from cursos.cursos import cursos_disponiveis
+    from modulos.progresso import mascara_curso, bits_concluidos
+    for nome, dados in usuarios:
+        for id_curso in dados.get("cursos", []):
+            if id_curso not in cursos_disponiveis:
+                continue
+            mascara, total = mascara_curso(id_curso)
+            bits = bits_concluidos(dados, id_curso)
+            if bits is None:  # Formato antigo: lista de módulos concluídos
+                concluidos = len(dados.get("modulos_concluidos", {}).get(id_curso, []))
+            else:
+                concluidos = (bits & mascara).bit_count()
+            yield {
+                "usuario": nome,
+                "id_curso": id_curso,
+                "modulos_concluidos": concluidos,
+                "total_modulos": total,
+                "percentual": round(concluidos * 100 / total, 1) if total else 100.0,
+            }
+
+def linhas_certificados(usuarios: Iterable[Tuple[str, Dict]]) -> Iterator[Dict]:
+    for nome, dados in usuarios:
+        for cert in dados.get("certificados", []):
+            yield {
+                "codigo": cert.get("codigo"),
+                "usuario": nome,
+                "id_curso": cert.get("curso"),
+                "data": cert.get("data"),
+                "caminho": cert.get("caminho"),
+            }
+
+# Conjunto -> (gerador de linhas, campos na ordem padrão)
+CONJUNTOS: Dict[str, Tuple[Callable, List[str]]] = {
+    "usuarios": (linhas_usuarios,
+                 ["nome", "email", "idade", "is_admin", "data_cadastro", "cursos", "certificados"]),
+    "matriculas": (linhas_matriculas, ["usuario", "id_curso", "curso"]),
+    "progresso": (linhas_progresso,
+                  ["usuario", "id_curso", "modulos_concluidos", "total_modulos", "percentual"]),
+    "certificados": (linhas_certificados, ["codigo", "usuario", "id_curso", "data", "caminho"]),
+}
+
+
+# ========== ESCRITA ==========
+def exportar(conjunto: str, destino: str, campos: Optional[List[str]] = None,
+             perfil: Optional[str] = None, desde: Optional[date] = None,
+             ate: Optional[date] = None) -> int:
+    """Grava o conjunto em CSV ou JSONL (pela extensão) e retorna o nº de linhas.
+
+    As linhas são geradas e escritas uma a uma, então a memória usada não
+    depende do tamanho da base.
+    """
+    gerar, campos_padrao = CONJUNTOS[conjunto]
+    campos = campos or campos_padrao
+    desconhecidos = [c for c in campos if c not in campos_padrao]
+    if desconhecidos:
+        raise ValueError(f"Campos inválidos para {conjunto}: {', '.join(desconhecidos)}")
+
+    linhas = gerar(filtrar_usuarios(perfil, desde, ate))
+    total = 0
+    with open(destino, 'w', encoding='utf-8', newline='') as f:
+        if destino.lower().endswith(".jsonl"):
+            for linha in linhas:
+                f.write(json.dumps({c: linha[c] for c in campos}, ensure_ascii=False) + "\n")
+                total += 1
+        else:
+            escritor = csv.DictWriter(f, fieldnames=campos, extrasaction="ignore")
+            escritor.writeheader()
+            for linha in linhas:
+                escritor.writerow(linha)
+                total += 1
+    return total
+
+
+# ========== INTERFACE ==========
+def _ler_data(texto: str) -> Optional[date]:
+    return date.fromisoformat(texto) if texto else None
+
+def tela_exportacao():
+    """Exportação para relatórios (ADM)"""
+    print(f"\n{COR_ADM}=== EXPORTAR DADOS ===")
+    nomes = list(CONJUNTOS)
+    for idx, nome in enumerate(nomes, 1):
+        print(f"{idx}. {nome}")
+    print("="*25 + RESET_COR)
+
+    try:
+        conjunto = nomes[int(input("Conjunto: ")) - 1]
+    except (ValueError, IndexError):
+        print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
+        return
+    campos_padrao = CONJUNTOS[conjunto][1]
+    print(f"Campos disponíveis: {','.join(campos_padrao)}")
+    campos = [c.strip() for c in input("Campos (Enter = todos): ").split(",") if c.strip()]
+    perfil = input("Perfil [admin/aluno, Enter = todos]: ").strip().lower() or None
+    try:
+        desde = _ler_data(input("Cadastrados desde (AAAA-MM-DD, Enter = sem limite): ").strip())
+        ate = _ler_data(input("Cadastrados até (AAAA-MM-DD, Enter = sem limite): ").strip())
+    except ValueError:
+        print(f"{COR_ERRO}❌ Data inválida!{RESET_COR}")
+        return
+    destino = input(f"Arquivo .csv ou .jsonl [{conjunto}.csv]: ").strip() or f"{conjunto}.csv"
+
+    try:
+        total = exportar(conjunto, destino, campos, perfil, desde, ate)
+    except (ValueError, OSError) as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        return
+    registrar_log("Exportação de dados", f"Conjunto: {conjunto} | Linhas: {total} | Arquivo: {destino}")
+    print(f"{COR_SUCESSO}✅ {total} linha(s) exportada(s) para {destino}{RESET_COR}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta dados da plataforma em CSV/JSONL")
+    parser.add_argument("conjunto", choices=list(CONJUNTOS))
+    parser.add_argument("destino", help="arquivo .csv ou .jsonl")
+    parser.add_argument("--campos", help="lista separada por vírgulas")
+    parser.add_argument("--perfil", choices=["admin", "aluno"])
+    parser.add_argument("--desde", type=date.fromisoformat, help="AAAA-MM-DD")
+    parser.add_argument("--ate", type=date.fromisoformat, help="AAAA-MM-DD")
+    args = parser.parse_args()
+
+    campos = args.campos.split(",") if args.campos else None
+    total = exportar(args.conjunto, args.destino, campos, args.perfil, args.desde, args.ate)
+    print(f"✅ {total} linha(s) exportada(s) para {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+# usuarios/fragmentos.py
+"""Usuários repartidos em N arquivos pelo hash do nome (modo "fragmentos").
+
+Layout em disco:
+    dados_usuarios/manifesto.json        {"formato": 1, "fragmentos": N, "hash": "blake2b-32", "emails": true}
+    dados_usuarios/usuarios_000.json ... usuarios_<N-1>.json
+    dados_usuarios/emails_000.json ... emails_<N-1>.json      email -> nome, pelo hash do email
+
+Login e cadastro leem e gravam só o fragmento do nome (e o cadastro, o
+arquivo de emails do hash do email), então o custo depende do tamanho de um
+fragmento, não do total de contas. Para manter isso ao crescer, aumente N
+com a ferramenta (com o sistema parado); ela também remonta os emails:
+    python -m usuarios.fragmentos migrar [--origem dados_usuarios.json] [--fragmentos N]
+    python -m usuarios.fragmentos refragmentar [--fragmentos N]
+    python -m usuarios.fragmentos info
+Sem --fragmentos, N é escolhido para ~USUARIOS_POR_FRAGMENTO contas em cada um.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from repositorio.armazem_json import ArmazemJSON, ConflitoVersao, trava_arquivo
+from usuarios.indices import chave_email
+
+
+# ========== CONFIGURAÇÕES ==========
+PASTA_FRAGMENTOS = "dados_usuarios"
+ARQUIVO_MANIFESTO = "manifesto.json"
+ARQUIVO_ORIGEM = "dados_usuarios.json"  # Arquivo único migrado na primeira abertura
+USUARIOS_POR_FRAGMENTO = 1000  # Alvo: gravar um fragmento leva poucos ms
+FRAGMENTOS_MINIMO = 16
+FORMATO = 1
+
+
+def fragmento_de(nome: str, total: int) -> int:
+    """Fragmento do usuário; estável entre processos (hash() do Python muda a cada execução)"""
+    return int.from_bytes(hashlib.blake2b(nome.encode(), digest_size=4).digest(), 'big') % total
+
+def fragmentos_sugeridos(total_usuarios: int) -> int:
+    """Potência de 2 que deixa ~USUARIOS_POR_FRAGMENTO usuários por fragmento"""
+    fragmentos = FRAGMENTOS_MINIMO
+    while total_usuarios > fragmentos * USUARIOS_POR_FRAGMENTO:
+        fragmentos *= 2
+    return fragmentos
+
+def caminho_fragmento(pasta: str, indice: int) -> str:
+    return os.path.join(pasta, f"usuarios_{indice:03d}.json")
+
+def caminho_emails(pasta: str, indice: int) -> str:
+    return os.path.join(pasta, f"emails_{indice:03d}.json")
+
+def ler_manifesto(pasta: str) -> Optional[Dict]:
+    caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ========== MAPA FRAGMENTADO ==========
+class UsuariosFragmentados(MutableMapping):
+    """Dicionário de usuários que abre cada fragmento só quando precisa dele.
+
+    Cada fragmento é um `ArmazemJSON` (trava, versão por registro, gravação
+    atômica e adiada), então gravar reescreve apenas os fragmentos com
+    registros alterados. Percorrer todos os usuários (listagens, exportação)
+    abre todos os fragmentos. `observadores` vale para todos os fragmentos
+    (ver ArmazemJSON), inclusive os abertos depois.
+    """
+
+    def __init__(self, pasta: str, padrao: Callable[[], Dict], fragmentos: Optional[int] = None,
+                 origem: Optional[str] = ARQUIVO_ORIGEM, modelo: Optional[type] = None):
+        self.pasta = pasta
+        self.modelo = modelo
+        self._armazens: Dict[int, ArmazemJSON] = {}
+        self.observadores: List[Callable[[List[str], Dict], None]] = []  # Compartilhada pelos fragmentos
+        self._conferidos: Set[int] = set()  # Fragmentos já conferidos desde o último sincronizar()
+        self._trava = threading.RLock()
+
+        manifesto = ler_manifesto(pasta)
+        if manifesto is None:
+            if origem and os.path.exists(origem):
+                with open(origem, 'r', encoding='utf-8') as f:
+                    fragmentar(json.load(f).items(), pasta, fragmentos)
+            else:
+                fragmentar(padrao().items(), pasta, fragmentos)
+            manifesto = ler_manifesto(pasta)
+        if manifesto.get("formato") != FORMATO:
+            raise ValueError(f"Formato de fragmentos não suportado: {manifesto.get('formato')}")
+        self.total = manifesto["fragmentos"]
+        if not manifesto.get("emails"):  # Layout anterior ao índice de emails: monta uma vez
+            indexar_emails(pasta)
+        self.emails = EmailsFragmentados(pasta, self.total)
+
+    # ========== FRAGMENTOS ==========
+    def armazem(self, indice: int) -> ArmazemJSON:
+        """Fragmento `indice`, lido no primeiro uso e conferido (os.stat) uma vez por sincronização"""
+        with self._trava:
+            armazem = self._armazens.get(indice)
+            if armazem is None:
+                armazem = ArmazemJSON(caminho_fragmento(self.pasta, indice), dict, modelo=self.modelo)
+                armazem.observadores = self.observadores
+                armazem.carregar()
+                self._armazens[indice] = armazem
+            elif indice not in self._conferidos:
+                armazem.sincronizar()
+            self._conferidos.add(indice)
+            return armazem
+
+    def _dados(self, nome: str) -> Dict:
+        return self.armazem(fragmento_de(nome, self.total)).dados
+
+    def _agrupar(self, nomes: Iterable[str]) -> Dict[int, List[str]]:
+        grupos: Dict[int, List[str]] = {}
+        for nome in nomes:
+            grupos.setdefault(fragmento_de(nome, self.total), []).append(nome)
+        return grupos
+
+    def sincronizar(self) -> "UsuariosFragmentados":
+        """Faz cada fragmento aberto conferir o disco no próximo acesso (custo O(1) aqui)"""
+        self._conferidos.clear()
+        return self
+
+    def conferir_abertos(self):
+        """Confere já todos os fragmentos abertos (um os.stat cada), para os observadores
+        verem o que outros processos gravaram em qualquer um deles"""
+        for indice in list(self._armazens):
+            self.armazem(indice)
+
+    # ========== DICIONÁRIO ==========
+    def __getitem__(self, nome):
+        return self._dados(nome)[nome]
+
+    def __setitem__(self, nome, dados):
+        self._dados(nome)[nome] = dados
+
+    def __delitem__(self, nome):
+        del self._dados(nome)[nome]
+
+    def __contains__(self, nome):
+        return nome in self._dados(nome)
+
+    def __iter__(self) -> Iterator[str]:
+        for indice in range(self.total):
+            yield from list(self.armazem(indice).dados)
+
+    def __len__(self):
+        return sum(len(self.armazem(indice).dados) for indice in range(self.total))
+
+    def items(self):
+        """Fragmento por fragmento, sem a busca do nome a cada registro"""
+        for indice in range(self.total):
+            yield from list(self.armazem(indice).dados.items())
+
+    # ========== GRAVAÇÃO (mesma interface do ArmazemJSON) ==========
+    def gravado(self, nome: str) -> bool:
+        return self.armazem(fragmento_de(nome, self.total)).gravado(nome)
+
+    def _em_cada(self, nomes: Optional[Iterable[str]], acao: Callable[[ArmazemJSON, Optional[List[str]]], None]):
+        """Aplica `acao` aos fragmentos envolvidos; junta os conflitos de todos"""
+        if nomes is None:
+            alvos = [(armazem, None) for armazem in list(self._armazens.values())]
+        else:
+            alvos = [(self.armazem(indice), grupo) for indice, grupo in self._agrupar(nomes).items()]
+        conflitos: List[str] = []
+        for armazem, grupo in alvos:
+            try:
+                acao(armazem, grupo)
+            except ConflitoVersao as e:
+                conflitos.extend(e.chaves)
+        if conflitos:
+            raise ConflitoVersao(conflitos)
+
+    def salvar(self, nomes: Optional[Iterable[str]] = None):
+        """Grava os nomes indicados (ou tudo que mudou nos fragmentos abertos)"""
+        def salvar_fragmento(armazem, grupo):
+            if grupo is not None or armazem.alterados():
+                armazem.salvar(grupo)
+        self._em_cada(nomes, salvar_fragmento)
+
+    def marcar(self, nomes: Optional[Iterable[str]] = None):
+        self._em_cada(nomes, lambda armazem, grupo: armazem.marcar(grupo))
+
+    def flush(self) -> bool:
+        gravou = []
+        self._em_cada(None, lambda armazem, _: gravou.append(armazem.flush()))
+        return any(gravou)
+
+    def conflitos_pendentes(self) -> List[str]:
+        return [c for armazem in list(self._armazens.values()) for c in armazem.conflitos_pendentes()]
+
+    def metricas(self) -> Dict:
+        total: Dict = {"fragmentos": self.total, "fragmentos_abertos": len(self._armazens)}
+        for armazem in list(self._armazens.values()):
+            for chave, valor in armazem.metricas().items():
+                total[chave] = total.get(chave, 0) + valor
+        return total
+
+
+# ========== ÍNDICE DE EMAILS ==========
+class EmailsFragmentados:
+    """Dono de cada email (sem diferenciar maiúsculas), nos arquivos emails_NNN.json.
+
+    O arquivo de um email é escolhido pelo hash do próprio email, então
+    conferir se ele já está em uso abre um arquivo pequeno em vez de todos
+    os fragmentos de usuários. Cada arquivo é um `ArmazemJSON`: dois
+    terminais reservando o mesmo email ao mesmo tempo dão conflito de
+    versão, e só um fica com ele.
+    """
+
+    def __init__(self, pasta: str, total: int):
+        self.pasta = pasta
+        self.total = total
+        self._armazens: Dict[int, ArmazemJSON] = {}
+        self._trava = threading.RLock()  # Conferir e reservar sem outra thread no meio
+
+    def _armazem(self, indice: int) -> ArmazemJSON:
+        armazem = self._armazens.get(indice)
+        if armazem is None:
+            armazem = ArmazemJSON(caminho_emails(self.pasta, indice), dict)
+            armazem.carregar()
+            self._armazens[indice] = armazem
+        else:
+            armazem.sincronizar()
+        return armazem
+
+    def _agrupar(self, pares: Dict[str, str]) -> Dict[int, Dict[str, str]]:
+        grupos: Dict[int, Dict[str, str]] = {}
+        for email, nome in pares.items():
+            chave = chave_email(email)
+            grupos.setdefault(fragmento_de(chave, self.total), {})[chave] = nome
+        return grupos
+
+    def dono(self, email: str) -> Optional[str]:
+        chave = chave_email(email)
+        with self._trava:
+            registro = self._armazem(fragmento_de(chave, self.total)).dados.get(chave)
+        return registro["nome"] if registro else None
+
+    def reservar(self, pares: Dict[str, str]) -> List[str]:
+        """Grava já cada email -> nome; devolve os emails que ficaram com outro dono"""
+        recusados = []
+        with self._trava:
+            for indice, grupo in self._agrupar(pares).items():
+                armazem = self._armazem(indice)
+                livres = []
+                for chave, nome in grupo.items():
+                    atual = armazem.dados.get(chave)
+                    if atual is not None and atual["nome"] != nome:
+                        recusados.append(chave)
+                    elif atual is None:
+                        armazem.dados[chave] = {"nome": nome}
+                        livres.append(chave)
+                while livres:
+                    try:
+                        armazem.salvar(livres)
+                        break
+                    except ConflitoVersao as e:  # Reservados agora por outro terminal
+                        recusados.extend(e.chaves)
+                        livres = [c for c in livres if c not in e.chaves]
+        return recusados
+
+    def liberar(self, pares: Dict[str, str]):
+        """Solta os emails (conta removida ou cadastro que não foi gravado)"""
+        with self._trava:
+            for indice, grupo in self._agrupar(pares).items():
+                armazem = self._armazem(indice)
+                chaves = [c for c, nome in grupo.items()
+                          if (armazem.dados.get(c) or {}).get("nome") == nome]
+                if not chaves:
+                    continue
+                for chave in chaves:
+                    del armazem.dados[chave]
+                try:
+                    armazem.salvar(chaves)
+                except ConflitoVersao:
+                    pass  # Já mudou de dono em outro terminal
+
+
+def indexar_emails(pasta: str, usuarios: Optional[Iterable[Tuple[str, Dict]]] = None,
+                   fragmentos: Optional[int] = None):
+    """Escreve emails_NNN.json a partir dos usuários (padrão: os fragmentos de `pasta`)
+    e marca o índice no manifesto"""
+    with trava_arquivo(os.path.join(pasta, ARQUIVO_MANIFESTO)):
+        manifesto = ler_manifesto(pasta)
+        if usuarios is None and manifesto.get("emails"):
+            return  # Outro processo montou enquanto esperávamos a trava
+        fragmentos = fragmentos or manifesto["fragmentos"]
+        grupos: List[Dict] = [{} for _ in range(fragmentos)]
+        for nome, dados in (_ler_fragmentos(pasta) if usuarios is None else usuarios):
+            chave = chave_email(dados.get("email") or "")
+            if chave:
+                grupos[fragmento_de(chave, fragmentos)].setdefault(chave, {"nome": nome})
+        for indice, grupo in enumerate(grupos):
+            caminho = caminho_emails(pasta, indice)
+            with open(caminho + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(grupo, f, ensure_ascii=False)
+            os.replace(caminho + ".tmp", caminho)
+        manifesto["emails"] = True
+        with open(os.path.join(pasta, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f)
+
+
+# ========== (RE)FRAGMENTAÇÃO ==========
+def fragmentar(usuarios: Iterable[Tuple[str, Dict]], pasta: str,
+               fragmentos: Optional[int] = None) -> Dict[int, int]:
+    """Escreve um layout novo em `pasta` e devolve quantos usuários ficaram em cada fragmento.
+
+    Monta tudo em `<pasta>.novo` e só então troca as pastas, então uma
+    interrupção no meio deixa o layout antigo intacto.
+    """
+    if fragmentos is None:
+        usuarios = list(usuarios)
+        fragmentos = fragmentos_sugeridos(len(usuarios))
+    if fragmentos < 1:
+        raise ValueError("É preciso pelo menos 1 fragmento")
+    grupos: List[Dict] = [{} for _ in range(fragmentos)]
+    for nome, dados in usuarios:
+        grupos[fragmento_de(nome, fragmentos)][nome] = dados
+
+    nova = pasta.rstrip(os.sep) + ".novo"
+    shutil.rmtree(nova, ignore_errors=True)
+    os.makedirs(nova)
+    for indice, grupo in enumerate(grupos):
+        with open(caminho_fragmento(nova, indice), 'w', encoding='utf-8') as f:
+            json.dump(grupo, f, ensure_ascii=False, default=ArmazemJSON._para_disco)
+    with open(os.path.join(nova, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as f:
+        json.dump({"formato": FORMATO, "fragmentos": fragmentos, "hash": "blake2b-32"}, f)
+    indexar_emails(nova, (par for grupo in grupos for par in grupo.items()), fragmentos)
+
+    antiga = pasta.rstrip(os.sep) + ".antigo"
+    with trava_arquivo(pasta.rstrip(os.sep)):  # <pasta>.lock: impede duas trocas ao mesmo tempo
+        if os.path.exists(pasta):
+            shutil.rmtree(antiga, ignore_errors=True)
+            os.replace(pasta, antiga)
+        os.replace(nova, pasta)
+        shutil.rmtree(antiga, ignore_errors=True)
+    return {indice: len(grupo) for indice, grupo in enumerate(grupos)}
+
+def _ler_fragmentos(pasta: str) -> Iterator[Tuple[str, Dict]]:
+    manifesto = ler_manifesto(pasta)
+    if manifesto is None:
+        raise FileNotFoundError(f"{pasta}/{ARQUIVO_MANIFESTO} não existe (use 'migrar')")
+    for indice in range(manifesto["fragmentos"]):
+        with open(caminho_fragmento(pasta, indice), 'r', encoding='utf-8') as f:
+            yield from json.load(f).items()
+
+def _resumo(contagem: Dict[int, int]) -> str:
+    tamanhos = list(contagem.values())
+    resumo = (f"{sum(tamanhos)} usuários em {len(tamanhos)} fragmentos "
+              f"(mín {min(tamanhos)}, máx {max(tamanhos)} por fragmento)")
+    if sum(tamanhos) > 2 * len(tamanhos) * USUARIOS_POR_FRAGMENTO:
+        resumo += (f"\n⚠️ Fragmentos grandes: use 'refragmentar' "
+                   f"(sugerido: {fragmentos_sugeridos(sum(tamanhos))})")
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layout fragmentado dos usuários")
+    parser.add_argument("--pasta", default=PASTA_FRAGMENTOS)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    cmd_migrar = comandos.add_parser("migrar", help="arquivo único -> fragmentos")
+    cmd_migrar.add_argument("--origem", default=ARQUIVO_ORIGEM)
+    cmd_migrar.add_argument("--fragmentos", type=int, help="padrão: conforme o total de usuários")
+    cmd_refragmentar = comandos.add_parser("refragmentar", help="muda o número de fragmentos")
+    cmd_refragmentar.add_argument("--fragmentos", type=int, help="padrão: conforme o total de usuários")
+    comandos.add_parser("info", help="mostra a distribuição atual")
+    args = parser.parse_args()
+
+    if args.comando == "migrar":
+        with open(args.origem, 'r', encoding='utf-8') as f:
+            contagem = fragmentar(json.load(f).items(), args.pasta, args.fragmentos)
+        print(f"✅ {args.origem} -> {args.pasta}: {_resumo(contagem)}")
+    elif args.comando == "refragmentar":
+        contagem = fragmentar(list(_ler_fragmentos(args.pasta)), args.pasta, args.fragmentos)
+        print(f"✅ {args.pasta}: {_resumo(contagem)}")
+    else:
+        nomes = [nome for nome, _ in _ler_fragmentos(args.pasta)]
+        total = ler_manifesto(args.pasta)["fragmentos"]
+        contagem = {indice: 0 for indice in range(total)}
+        for nome in nomes:
+            contagem[fragmento_de(nome, total)] += 1
+        print(_resumo(contagem))
+
+
+if __name__ == "__main__":
+    main()
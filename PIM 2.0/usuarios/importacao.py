@@ -0,0 +1,170 @@
+# usuarios/importacao.py
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from usuarios.indices import chave_email
+
+from usuarios.usuarios import (
+    validar_nome_usuario, validar_email, validar_idade, validar_senha,
+    get_usuarios_cadastrados, salvar_usuarios_lote, registrar_log, novo_registro,
+    atualizar_indices, usuario_gravado, dono_do_email, reservar_emails, liberar_emails,
+    COR_ADM, COR_ERRO, COR_SUCESSO, RESET_COR
+)
+
+
+# ========== LEITURA ==========
+def ler_lista(caminho: str) -> Iterator[Tuple[int, Dict]]:
+    """(número da linha, registro) de um CSV com cabeçalho ou de um JSONL"""
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+        if caminho.lower().endswith((".jsonl", ".json")):
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    yield numero, json.loads(linha)
+                except json.JSONDecodeError as e:
+                    yield numero, {"_erro": f"JSON inválido: {e.msg}"}
+        else:
+            for numero, registro in enumerate(csv.DictReader(f), 2):  # Linha 1 é o cabeçalho
+                yield numero, registro
+
+
+def _texto(registro: Dict, campo: str) -> str:
+    valor = registro.get(campo)
+    return "" if valor is None else str(valor).strip()
+
+
+def _eh_admin(registro: Dict) -> bool:
+    return _texto(registro, "is_admin").lower() in ("1", "true", "sim", "s", "admin")
+
+
+CAMPOS = ["nome", "email", "idade", "senha", "is_admin"]
+
+
+def caminho_pendentes(caminho: str) -> str:
+    return f"{os.path.splitext(caminho)[0]}.pendentes.csv"
+
+
+# ========== IMPORTAÇÃO ==========
+def importar_usuarios(caminho: str, caminho_rejeitados: str,
+                      caminho_nao_gravados: Optional[str] = None) -> Dict:
+    """Valida a lista inteira e grava todos os aceitos de uma vez.
+
+    Cada linha passa pelas mesmas validações do cadastro interativo, e
+    nomes e emails repetidos (já cadastrados ou repetidos no próprio
+    arquivo) são recusados. As linhas recusadas vão para um CSV com o motivo. No final há
+    uma única gravação no armazenamento e uma única entrada de log.
+
+    Se essa gravação falhar (conflito com outro terminal), nenhum aceito
+    fica só na memória: os que não chegaram ao armazenamento saem dos
+    usuários e suas linhas vão para `caminho_nao_gravados` (CSV no formato
+    de entrada, para importar de novo). No modo "fragmentos" os fragmentos
+    sem conflito são gravados mesmo assim.
+    """
+    usuarios = get_usuarios_cadastrados()
+    aceitos: Dict[str, Dict] = {}
+    linhas: Dict[str, Dict] = {}  # Linha original de cada aceito (para repetir se a gravação falhar)
+    numeros: Dict[str, int] = {}
+    emails_aceitos: Set[str] = set()
+    rejeitados = 0
+    agora = datetime.now().isoformat()
+
+    with open(caminho_rejeitados, 'w', encoding='utf-8', newline='') as saida:
+        relatorio = csv.writer(saida)
+        relatorio.writerow(["linha", "nome", "motivo"])
+
+        for numero, registro in ler_lista(caminho):
+            nome = _texto(registro, "nome")
+            erro = registro.get("_erro")
+            if not erro:
+                for campo, validar in (("nome", validar_nome_usuario), ("email", validar_email),
+                                       ("idade", validar_idade), ("senha", validar_senha)):
+                    if erro := validar(_texto(registro, campo)):
+                        erro = f"{campo}: {erro}"
+                        break
+            if not erro and (nome in usuarios or nome in aceitos):
+                erro = "Usuário já existe"
+            email = chave_email(_texto(registro, "email"))
+            if not erro and (email in emails_aceitos or dono_do_email(email)):
+                erro = "Email já cadastrado"
+            if erro:
+                relatorio.writerow([numero, nome, erro])
+                rejeitados += 1
+                continue
+
+            emails_aceitos.add(email)
+            linhas[nome], numeros[nome] = registro, numero
+            aceitos[nome] = novo_registro({
+                "senha": _texto(registro, "senha"),
+                "email": _texto(registro, "email"),
+                "idade": int(_texto(registro, "idade")),
+                "is_admin": _eh_admin(registro),
+                "data_cadastro": agora,
+                "cursos": []
+            })
+
+        # Modo "fragmentos": email reservado por outro terminal durante a leitura
+        emails = {_texto(linhas[nome], "email"): nome for nome in aceitos}
+        donos = {chave_email(email): nome for email, nome in emails.items()}
+        for email in reservar_emails(emails):
+            nome = donos[email]
+            relatorio.writerow([numeros[nome], nome, "Email já cadastrado"])
+            rejeitados += 1
+            del aceitos[nome]
+
+    if not aceitos:
+        return {"aceitos": 0, "rejeitados": rejeitados, "gravado": True}
+
+    usuarios.update(aceitos)
+    atualizar_indices(list(aceitos))
+    if salvar_usuarios_lote(list(aceitos)):
+        registrar_log("Importação de usuários",
+                      f"Arquivo: {os.path.basename(caminho)} | Aceitos: {len(aceitos)} | Rejeitados: {rejeitados}")
+        return {"aceitos": len(aceitos), "rejeitados": rejeitados, "gravado": True}
+
+    # Conflito: desfaz na memória o que não foi gravado (nomes criados em outro
+    # terminal já voltaram à versão do disco e ficam como estão)
+    nao_gravados = [nome for nome, registro in aceitos.items()
+                    if usuarios.get(nome) is not registro or not usuario_gravado(nome)]
+    for nome in nao_gravados:
+        if usuarios.get(nome) is aceitos[nome]:
+            usuarios.pop(nome)
+    atualizar_indices(nao_gravados)
+    liberar_emails({_texto(linhas[nome], "email"): nome for nome in nao_gravados})
+    caminho_nao_gravados = caminho_nao_gravados or caminho_pendentes(caminho)
+    with open(caminho_nao_gravados, 'w', encoding='utf-8', newline='') as saida:
+        pendentes = csv.DictWriter(saida, fieldnames=CAMPOS)
+        pendentes.writeheader()
+        for nome in nao_gravados:
+            pendentes.writerow({campo: _texto(linhas[nome], campo) for campo in CAMPOS})
+    gravados = len(aceitos) - len(nao_gravados)
+    registrar_log("Falha na importação de usuários",
+                  f"Arquivo: {os.path.basename(caminho)} | Aceitos: {gravados} | "
+                  f"Não gravados: {len(nao_gravados)} (dados alterados em outro terminal) | "
+                  f"Rejeitados: {rejeitados}")
+    return {"aceitos": gravados, "rejeitados": rejeitados, "gravado": False,
+            "nao_gravados": len(nao_gravados), "arquivo_nao_gravados": caminho_nao_gravados}
+
+
+# ========== INTERFACE ==========
+def tela_importacao():
+    """Importação em massa de usuários (ADM)"""
+    print(f"\n{COR_ADM}=== IMPORTAR USUÁRIOS ===")
+    print("Arquivo CSV (cabeçalho: nome,email,idade,senha[,is_admin]) ou JSONL")
+    caminho = input("Caminho do arquivo: ").strip()
+    if not os.path.exists(caminho):
+        print(f"{COR_ERRO}⚠️ Arquivo não encontrado!{RESET_COR}")
+        return
+
+    caminho_rejeitados = f"{os.path.splitext(caminho)[0]}.rejeitados.csv"
+    resultado = importar_usuarios(caminho, caminho_rejeitados)
+    print(f"{COR_SUCESSO}✅ {resultado['aceitos']} usuário(s) importado(s){RESET_COR}")
+    if not resultado["gravado"]:
+        print(f"{COR_ERRO}❌ {resultado['nao_gravados']} usuário(s) não gravado(s): dados alterados "
+              f"em outro terminal. Importe {resultado['arquivo_nao_gravados']} de novo.{RESET_COR}")
+    if resultado["rejeitados"]:
+        print(f"{COR_ERRO}⚠️ {resultado['rejeitados']} linha(s) recusada(s): veja {caminho_rejeitados}{RESET_COR}")
+    print("="*25 + RESET_COR)
@@ -0,0 +1,176 @@
+# usuarios/indices.py
+"""Índices secundários dos usuários em memória: email, perfil, data de cadastro e matrículas.
+
+    email (sem diferenciar maiúsculas) -> nome     cadastro com email repetido em O(1)
+    perfil ("admin"/"aluno") -> nomes              listagens por perfil sem percorrer todos
+    data de cadastro (ordenada) -> nomes           "cadastrados esta semana" por busca binária
+    curso -> alunos matriculados                   turma de um curso sem percorrer todos
+
+Montados no primeiro uso percorrendo os usuários e depois mantidos nome a
+nome com `atualizar()`: nos cadastros/remoções/matrículas deste processo e
+nos registros que o armazenamento trouxe de outros processos (ArmazemJSON
+avisa seus `observadores`). No modo SQLite quem responde são os índices do
+banco (repositorio.RepositorioSQLite), com os mesmos métodos.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from modelos.modelos import EPOCA, Usuario
+
+PERFIS = ("admin", "aluno")
+LOTE_INCREMENTAL = 1000  # Acima disso, reordenar tudo sai mais barato que inserir um a um
+Data = Union[datetime, str]
+Entrada = Tuple[str, str, int, Tuple[str, ...]]  # (email, perfil, data, cursos) indexados
+
+
+def chave_email(email: str) -> str:
+    """Email normalizado; reaproveita o texto original quando ele já está em minúsculas"""
+    minusculo = email.strip().lower()
+    return email if minusculo == email else minusculo
+
+def chave_data(data: Optional[Union[Data, int]]) -> int:
+    """Microssegundos desde 1970 (datas fora do padrão ISO vão para o início)"""
+    if type(data) is int:  # Já convertida por modelos._instante
+        return data
+    if isinstance(data, str):
+        try:
+            data = datetime.fromisoformat(data)
+        except ValueError:
+            return 0
+    if not isinstance(data, datetime):
+        return 0
+    if data.tzinfo is not None:
+        data = data.astimezone().replace(tzinfo=None)  # Hora local, como datetime.now()
+    return (data - EPOCA) // timedelta(microseconds=1)
+
+def entrada_de(dados: Dict) -> Entrada:
+    """O que os índices guardam de um registro; em modelos.Usuario lê os slots
+    direto (a data já está em microssegundos), sem as conversões do acesso por chave"""
+    if type(dados) is Usuario:
+        email, is_admin = getattr(dados, "email", None), getattr(dados, "is_admin", False)
+        data, cursos = getattr(dados, "data_cadastro", None), getattr(dados, "cursos", ())
+    else:
+        email, is_admin = dados.get("email"), dados.get("is_admin")
+        data, cursos = dados.get("data_cadastro"), dados.get("cursos") or ()
+    return chave_email(email or ""), "admin" if is_admin else "aluno", chave_data(data), tuple(cursos)
+
+
+class IndicesUsuarios:
+    """Índices sobre um dicionário {nome: dados}; ver o docstring do módulo"""
+
+    def __init__(self, usuarios: Dict[str, Dict]):
+        self.usuarios = usuarios
+        self.por_email: Dict[str, str] = {}
+        self.por_perfil: Dict[str, Set[str]] = {perfil: set() for perfil in PERFIS}
+        self.por_curso: Dict[str, Set[str]] = {}
+        self._datas: List[int] = []  # Ordenada; _nomes[i] é o dono de _datas[i]
+        self._nomes: List[str] = []
+        self._entradas: Dict[str, Entrada] = {}
+        self._trava = threading.Lock()
+        self.reconstruir()
+
+    # ========== MANUTENÇÃO ==========
+    def reconstruir(self):
+        """Refaz tudo a partir dos usuários (O(n log n))"""
+        registros = list(self.usuarios.items())  # Lidos fora da trava (fragmentos têm travas próprias)
+        with self._trava:
+            self.por_email.clear()
+            for nomes in self.por_perfil.values():
+                nomes.clear()
+            self.por_curso.clear()
+            self._entradas.clear()
+            for nome, dados in registros:
+                self._incluir(nome, entrada_de(dados), ordenar=False)
+            self._reordenar()
+
+    def atualizar(self, nomes: Iterable[str], origem: Optional[Dict] = None):
+        """Reindexa os nomes criados, alterados ou removidos conferindo o registro atual.
+
+        `origem` é onde ler os registros (padrão: os próprios usuários); os
+        observadores do ArmazemJSON passam o dicionário do arquivo que mudou.
+        """
+        origem = self.usuarios if origem is None else origem
+        registros = [(nome, origem.get(nome)) for nome in nomes]
+        entradas = [(nome, entrada_de(dados) if dados is not None else None) for nome, dados in registros]
+        with self._trava:
+            em_lote = len(entradas) > LOTE_INCREMENTAL
+            for nome, entrada in entradas:
+                anterior = self._entradas.get(nome)
+                # Matrícula/alteração sem mudar a data não mexe na lista ordenada
+                ordenar = not em_lote and not (anterior and entrada and anterior[2] == entrada[2])
+                self._retirar(nome, ordenar)
+                if entrada is not None:
+                    self._incluir(nome, entrada, ordenar)
+            if em_lote:
+                self._reordenar()
+
+    def observar(self, chaves: List[str], dados: Dict):
+        """Observador de ArmazemJSON: registros trazidos de outros processos"""
+        self.atualizar(chaves, dados)
+
+    def _incluir(self, nome: str, entrada: Entrada, ordenar: bool = True):
+        email, perfil, data, cursos = entrada
+        self.por_email.setdefault(email, nome)
+        self.por_perfil[perfil].add(nome)
+        for id_curso in cursos:
+            self.por_curso.setdefault(id_curso, set()).add(nome)
+        self._entradas[nome] = entrada
+        if ordenar:
+            posicao = bisect_right(self._datas, data)
+            self._datas.insert(posicao, data)
+            self._nomes.insert(posicao, nome)
+
+    def _retirar(self, nome: str, ordenar: bool = True):
+        entrada = self._entradas.pop(nome, None)
+        if entrada is None:
+            return
+        email, perfil, data, cursos = entrada
+        if self.por_email.get(email) == nome:
+            del self.por_email[email]
+        self.por_perfil[perfil].discard(nome)
+        for id_curso in cursos:
+            alunos = self.por_curso.get(id_curso)
+            if alunos is not None:
+                alunos.discard(nome)
+                if not alunos:
+                    del self.por_curso[id_curso]
+        if ordenar:
+            inicio, fim = bisect_left(self._datas, data), bisect_right(self._datas, data)
+            posicao = self._nomes.index(nome, inicio, fim)
+            del self._datas[posicao], self._nomes[posicao]
+
+    def _reordenar(self):
+        """Refaz o índice de datas de uma vez (mais barato que muitas inserções no meio)"""
+        ordenados = sorted((entrada[2], nome) for nome, entrada in self._entradas.items())
+        self._datas = [data for data, _ in ordenados]
+        self._nomes = [nome for _, nome in ordenados]
+
+    # ========== CONSULTAS ==========
+    def buscar_por_email(self, email: str) -> Optional[str]:
+        """Dono do email, sem diferenciar maiúsculas"""
+        return self.por_email.get(chave_email(email))
+
+    def nomes_por_perfil(self, is_admin: bool) -> List[str]:
+        with self._trava:
+            return sorted(self.por_perfil["admin" if is_admin else "aluno"])
+
+    def contar_por_perfil(self) -> Dict[str, int]:
+        return {perfil: len(nomes) for perfil, nomes in self.por_perfil.items()}
+
+    def cadastrados_entre(self, inicio: Optional[Data] = None, fim: Optional[Data] = None) -> List[str]:
+        """Nomes cadastrados em [inicio, fim), do mais antigo ao mais novo"""
+        with self._trava:
+            de = bisect_left(self._datas, chave_data(inicio)) if inicio else 0
+            ate = bisect_left(self._datas, chave_data(fim)) if fim else len(self._datas)
+            return self._nomes[de:ate]
+
+    def alunos_do_curso(self, id_curso: str) -> List[str]:
+        """Matriculados no curso, em ordem alfabética (custo proporcional à turma)"""
+        with self._trava:
+            return sorted(self.por_curso.get(id_curso, ()))
+
+    def contar_alunos_por_curso(self) -> Dict[str, int]:
+        with self._trava:
+            return {id_curso: len(alunos) for id_curso, alunos in self.por_curso.items()}
@@ -1,47 +1,64 @@
 import re
 import json
 import os
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from usuarios.diario import DiarioUsuarios
+from usuarios.cache import CacheArquivo
+from usuarios.fragmentos import UsuariosFragmentados, PASTA_FRAGMENTOS, ARQUIVO_MANIFESTO
+from modelos.modelos import Usuario, para_json
+from repositorio.armazem_json import ArmazemJSON, ConflitoVersao
+from registros.registros import get_escritor
+from metricas.metricas import cronometrar, medir, contar, registrar_fonte
+# SQLite (repositorio.repositorio) e as telas de log são importados só quando usados
 
 
 
 # ========== CONFIGURAÇÕES ==========
 ARQUIVO_JSON = "dados_usuarios.json"
+ARQUIVO_DIARIO = "dados_usuarios.diario"
+MODO_ARMAZENAMENTO = os.environ.get("PIM_ARMAZENAMENTO", "json")  # "json", "diario", "fragmentos" ou "sqlite"
 ARQUIVO_LOG = "registro_logs.log"
+FORMATO_LOG = os.environ.get("PIM_FORMATO_LOG", "texto")  # "texto" ou "jsonl" (auditoria)
 COR_ADM = "\033[1;31m"  # Vermelho
 COR_USUARIO = "\033[1;34m"  # Azul
 COR_ERRO = "\033[1;33m"  # Amarelo
 COR_SUCESSO = "\033[1;32m"  # Verde
 COR_LOG = "\033[0;36m"  # Ciano
 RESET_COR = "\033[0m"
+ERRO_CONFLITO = "Dados alterados em outro terminal; refaça a operação"
 
 
 def get_usuario_logado():
     return usuario_logado
 
 def get_usuarios_cadastrados():
+    """Usuários em memória; o arquivo só é lido no primeiro uso"""
+    if usuarios_cadastrados is None:
+        return obter_usuarios_atualizados()
     return usuarios_cadastrados
 
+def get_escritor_log():
+    """Escritor do log no formato configurado"""
+    if FORMATO_LOG == "jsonl":
+        from registros.auditoria import PASTA_AUDITORIA, get_auditoria
+        return get_escritor(PASTA_AUDITORIA, destino=get_auditoria().gravar_lote)
+    return get_escritor(ARQUIVO_LOG)
+
+@cronometrar("log.registrar")
 def registrar_log(acao: str, detalhes: str = ""):
-    """Registra ações importantes no arquivo de log"""
+    """Registra ações importantes no arquivo de log (gravação em segundo plano)"""
     usuario = usuario_logado['nome'] if usuario_logado else 'SISTEMA'
-    with open(ARQUIVO_LOG, 'a', encoding='utf-8') as f:
-        log_entry = (
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-            f"Usuário: {usuario}\n"
-            f"Ação: {acao}\n"
-            f"Detalhes: {detalhes}\n"
-            f"{'-'*50}\n"
-        )
-        f.write(log_entry)
+    get_escritor_log().registrar({
+        "timestamp": datetime.now(),
+        "usuario": usuario,
+        "acao": acao,
+        "detalhes": detalhes,
+    })
 
 # ========== BANCO DE DADOS ==========
-def carregar_usuarios() -> Dict:
-    """Carrega usuários do JSON ou cria estrutura inicial"""
-    if os.path.exists(ARQUIVO_JSON):
-        with open(ARQUIVO_JSON, 'r') as f:
-            return json.load(f)
+def usuarios_padrao() -> Dict:
+    """Estrutura inicial quando ainda não há dados salvos"""
     return {
         "admin": {
             "senha": "Admin@123",
@@ -53,14 +70,259 @@ def carregar_usuarios() -> Dict:
         }
     }
 
-def salvar_usuarios():
-    """Salva os dados no JSON"""
-    with open(ARQUIVO_JSON, 'w') as f:
-        json.dump(usuarios_cadastrados, f, indent=4, ensure_ascii=False)
+def novo_registro(dados: Dict) -> Dict:
+    """Registro compacto (modelos.Usuario) nos modos JSON; diário e SQLite guardam dict comum"""
+    return Usuario.de_json(dados) if MODO_ARMAZENAMENTO in ("json", "fragmentos") else dados
+
+@cronometrar("usuarios.carregar")
+def carregar_usuarios() -> Dict:
+    """Carrega usuários do JSON ou cria estrutura inicial"""
+    if MODO_ARMAZENAMENTO == "diario":
+        diario = get_diario()
+        dados = diario.carregar()
+        if diario.descartadas:
+            print(f"{COR_ERRO}⚠️ {diario.descartadas} linha(s) ilegível(is) no diário de usuários "
+                  f"foram ignoradas.{RESET_COR}")
+        return dados
+    if MODO_ARMAZENAMENTO == "sqlite":
+        from repositorio.repositorio import mapa_usuarios
+        return mapa_usuarios(usuarios_padrao)
+    if MODO_ARMAZENAMENTO == "fragmentos":
+        return get_fragmentos().sincronizar()
+    armazem = get_armazem()
+    if armazem.dados:
+        armazem.sincronizar()  # Só aplica os registros que outro processo mudou
+        return armazem.dados
+    return armazem.carregar()
+
+def _avisar_conflito(nomes: List[str]):
+    print(f"{COR_ERRO}⚠️ Dados alterados em outro terminal ({', '.join(nomes)}). "
+          f"Os dados foram recarregados; refaça a operação.{RESET_COR}")
+
+def _gravar_json(nomes: Optional[List[str]] = None, imediato: bool = True) -> bool:
+    """Mescla no arquivo só os usuários alterados; False se houve conflito.
+
+    Com `imediato=False` a gravação é adiada e agrupada com as próximas
+    alterações (ver `ArmazemJSON.marcar`); conflitos dessas gravações são
+    avisados na operação seguinte.
+    """
+    armazem = _armazem_atual()
+    if conflitos := armazem.conflitos_pendentes():
+        _avisar_conflito(conflitos)
+    if not imediato:
+        armazem.marcar(nomes)
+        return True
+    try:
+        armazem.salvar(nomes)
+    except ConflitoVersao as e:
+        _avisar_conflito(e.chaves)
+        return False
+    finally:
+        cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+def gravar_pendentes() -> bool:
+    """Grava já as alterações adiadas (para quando a durabilidade importa)"""
+    if MODO_ARMAZENAMENTO not in ("diario", "sqlite"):
+        try:
+            _armazem_atual().flush()
+        except ConflitoVersao as e:
+            _avisar_conflito(e.chaves)
+            return False
+        finally:
+            cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+@cronometrar("usuarios.salvar_todos")
+def salvar_usuarios() -> bool:
+    """Salva os dados no JSON (nos modos JSON, os usuários criados/removidos e os
+    já marcados; alterações por dentro de um registro vão com `salvar_usuario`)"""
+    if MODO_ARMAZENAMENTO == "diario":
+        get_diario().salvar_snapshot(usuarios_cadastrados)
+    elif MODO_ARMAZENAMENTO == "sqlite":
+        usuarios_cadastrados.salvar()
+    else:
+        return _gravar_json()
+    cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+@cronometrar("usuarios.salvar")
+def salvar_usuario(nome: str, imediato: bool = False) -> bool:
+    """Persiste a criação/alteração de um único usuário.
+
+    No modo "json" a gravação é adiada e agrupada, a menos que `imediato`
+    seja True (ex.: cadastro, que precisa detectar nome repetido em outro
+    terminal na hora).
+    """
+    if MODO_ARMAZENAMENTO == "diario":
+        get_diario().registrar(nome, usuarios_cadastrados[nome])
+    elif MODO_ARMAZENAMENTO == "sqlite":
+        usuarios_cadastrados.salvar_registro(nome)
+    else:
+        return _gravar_json([nome], imediato)
+    cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+@cronometrar("usuarios.salvar_lote")
+def salvar_usuarios_lote(nomes: List[str]) -> bool:
+    """Persiste vários usuários novos/alterados com uma única gravação"""
+    if MODO_ARMAZENAMENTO == "diario":
+        get_diario().registrar_lote({nome: usuarios_cadastrados[nome] for nome in nomes})
+    elif MODO_ARMAZENAMENTO == "sqlite":
+        from repositorio.repositorio import get_repositorio
+        get_repositorio().salvar_usuarios_lote({nome: usuarios_cadastrados[nome] for nome in nomes})
+    else:
+        return _gravar_json(nomes)
+    cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+def usuario_gravado(nome: str) -> bool:
+    """O usuário já chegou ao armazenamento (nos modos JSON uma gravação com
+    conflito deixa registros novos só na memória; diário e SQLite gravam na hora)"""
+    if MODO_ARMAZENAMENTO in ("diario", "sqlite"):
+        return nome in usuarios_cadastrados
+    return _armazem_atual().gravado(nome)
+
+@cronometrar("usuarios.remover")
+def remover_usuario(nome: str) -> bool:
+    """Remove um usuário da memória e do armazenamento"""
+    from certificados.validacao import revogar_certificados
+    dados = usuarios_cadastrados.pop(nome)
+    atualizar_indices([nome])
+    if MODO_ARMAZENAMENTO == "diario":
+        get_diario().remover(nome)
+        revogar_certificados(nome)
+    elif MODO_ARMAZENAMENTO != "sqlite":  # No SQLite o pop() já apagou do banco (e os certificados)
+        if not _gravar_json([nome]):
+            return False
+        liberar_emails({dados.get("email") or "": nome})
+        revogar_certificados(nome)
+        return True
+    cache_usuarios.atualizar(usuarios_cadastrados)
+    return True
+
+_armazem = None
+
+def get_armazem() -> ArmazemJSON:
+    """Arquivo JSON com trava e versão por usuário (modo "json")"""
+    global _armazem
+    if _armazem is None:
+        _armazem = ArmazemJSON(ARQUIVO_JSON, usuarios_padrao, modelo=Usuario)
+    return _armazem
+
+_fragmentos = None
+
+def get_fragmentos() -> UsuariosFragmentados:
+    """Usuários repartidos por hash do nome (modo "fragmentos"); migra o JSON único na 1ª vez"""
+    global _fragmentos
+    if _fragmentos is None:
+        _fragmentos = UsuariosFragmentados(PASTA_FRAGMENTOS, usuarios_padrao, origem=ARQUIVO_JSON,
+                                           modelo=Usuario)
+    return _fragmentos
+
+def _armazem_atual():
+    """ArmazemJSON do arquivo único ou o conjunto de fragmentos (mesma interface de gravação)"""
+    return get_fragmentos() if MODO_ARMAZENAMENTO == "fragmentos" else get_armazem()
+
+_diario = None
+
+def get_diario() -> DiarioUsuarios:
+    """Diário de alterações (modo "diario"), criado no primeiro uso"""
+    global _diario
+    if _diario is None:
+        _diario = DiarioUsuarios(ARQUIVO_JSON, ARQUIVO_DIARIO, usuarios_padrao)
+    return _diario
+
+def arquivos_usuarios() -> list:
+    """Arquivos cujo carimbo (mtime/tamanho) indica mudança nos usuários"""
+    if MODO_ARMAZENAMENTO == "diario":
+        return [ARQUIVO_JSON, ARQUIVO_DIARIO, ARQUIVO_DIARIO + ".compactando"]
+    if MODO_ARMAZENAMENTO == "sqlite":
+        from repositorio.repositorio import ARQUIVO_BANCO
+        return [ARQUIVO_BANCO, ARQUIVO_BANCO + "-wal"]
+    if MODO_ARMAZENAMENTO == "fragmentos":  # Muda só na refragmentação
+        return [os.path.join(PASTA_FRAGMENTOS, ARQUIVO_MANIFESTO)]
+    return [ARQUIVO_JSON]
+
+def obter_usuarios_atualizados() -> Dict:
+    """Usuários em memória, relendo o armazenamento só se outro processo o alterou"""
+    global usuarios_cadastrados
+    if MODO_ARMAZENAMENTO == "fragmentos":  # Cada fragmento aberto confere o próprio arquivo
+        usuarios_cadastrados = get_fragmentos().sincronizar()
+        return usuarios_cadastrados
+    usuarios_cadastrados = cache_usuarios.obter()
+    return usuarios_cadastrados
+
+_indices = None
+
+def get_indices():
+    """Índices de email, perfil e data de cadastro (usuarios.indices), montados no 1º uso.
+
+    No SQLite são os índices do próprio banco (RepositorioSQLite tem as
+    mesmas consultas). Nos modos JSON o índice observa o armazém, que o
+    avisa dos registros trazidos de outros processos; no diário, uma
+    releitura devolve outro dicionário e o índice é remontado.
+    """
+    global _indices
+    if MODO_ARMAZENAMENTO == "sqlite":
+        from repositorio.repositorio import get_repositorio
+        return get_repositorio()
+    usuarios = obter_usuarios_atualizados()
+    if MODO_ARMAZENAMENTO == "fragmentos":
+        usuarios.conferir_abertos()
+    if _indices is None or _indices.usuarios is not usuarios:
+        from usuarios.indices import IndicesUsuarios
+        _indices = IndicesUsuarios(usuarios)
+        if MODO_ARMAZENAMENTO != "diario":
+            _armazem_atual().observadores.append(_indices.observar)
+    return _indices
+
+def dono_do_email(email: str) -> Optional[str]:
+    """Nome de quem já usa o email (sem diferenciar maiúsculas).
+
+    No modo "fragmentos" consulta só o arquivo de emails do hash do email
+    (usuarios.fragmentos), sem abrir os fragmentos de usuários.
+    """
+    if MODO_ARMAZENAMENTO == "fragmentos":
+        return get_fragmentos().emails.dono(email)
+    return get_indices().buscar_por_email(email)
+
+def reservar_emails(pares: Dict[str, str]) -> List[str]:
+    """Reserva email -> nome antes de gravar os usuários; devolve os emails que já têm dono.
+
+    Só o modo "fragmentos" grava a reserva (é ela que impede dois terminais
+    de cadastrarem o mesmo email); nos outros modos o índice em memória
+    passa a conhecer o email no cadastro.
+    """
+    if MODO_ARMAZENAMENTO == "fragmentos":
+        return get_fragmentos().emails.reservar(pares)
+    return []
+
+def liberar_emails(pares: Dict[str, str]):
+    """Desfaz `reservar_emails` (conta removida ou cadastro não gravado)"""
+    if MODO_ARMAZENAMENTO == "fragmentos":
+        get_fragmentos().emails.liberar(pares)
+
+def atualizar_indices(nomes: List[str]):
+    """Reindexa usuários criados/removidos por este processo (se o índice já existe)"""
+    if _indices is not None and MODO_ARMAZENAMENTO != "sqlite":
+        _indices.atualizar(nomes)
+
+def estatisticas_cache() -> Dict:
+    return cache_usuarios.estatisticas()
+
+def metricas_gravacao() -> Dict:
+    """Gravações adiadas/agrupadas do arquivo JSON (ou dos fragmentos) de usuários"""
+    armazem = _fragmentos if MODO_ARMAZENAMENTO == "fragmentos" else _armazem
+    return armazem.metricas() if armazem else {}
 
 
 # ========== DADOS GLOBAIS ==========
-usuarios_cadastrados = carregar_usuarios()
+cache_usuarios = CacheArquivo(arquivos_usuarios, carregar_usuarios)
+registrar_fonte("cache de usuários", estatisticas_cache)
+registrar_fonte("gravação de usuários", metricas_gravacao)
+registrar_fonte("escritor de log", lambda: get_escritor_log().metricas())
+usuarios_cadastrados = None  # Carregado no primeiro uso (login, cadastro...)
 usuario_logado = None
 
 # ========== VALIDAÇÕES ==========
@@ -94,9 +356,48 @@ def validar_nome_usuario(nome: str) -> Optional[str]:
     return None
 
 # ========== OPERAÇÕES DE USUÁRIO ==========
+def cadastrar_usuario(nome: str, email: str, idade, senha: str, is_admin: bool = False,
+                      imediato: bool = True) -> Dict:
+    """Valida e grava um usuário novo (sem input); levanta ValueError com o motivo"""
+    global usuarios_cadastrados
+    usuarios_cadastrados = obter_usuarios_atualizados()
+    for erro in (validar_nome_usuario(nome), validar_email(email),
+                 validar_idade(str(idade)), validar_senha(senha)):
+        if erro:
+            raise ValueError(erro)
+    if nome in usuarios_cadastrados:
+        raise ValueError("Usuário já existe!")
+    if dono_do_email(email) or reservar_emails({email: nome}):
+        raise ValueError("Email já cadastrado!")
+
+    usuarios_cadastrados[nome] = novo_registro({
+        "senha": senha,
+        "email": email,
+        "idade": int(idade),
+        "is_admin": is_admin,
+        "data_cadastro": datetime.now().isoformat(),
+        "cursos": []
+    })
+    atualizar_indices([nome])
+    if not salvar_usuario(nome, imediato=imediato):
+        liberar_emails({email: nome})
+        raise ValueError(ERRO_CONFLITO)
+    registrar_log(f"Cadastro de {'ADMIN' if is_admin else 'ALUNO'}", f"Usuário: {nome}")
+    return usuarios_cadastrados[nome]
+
+def excluir_usuario(nome: str):
+    """Remove a conta `nome` (sem input); levanta ValueError se não for possível"""
+    if nome not in get_usuarios_cadastrados():
+        raise ValueError("Usuário não encontrado!")
+    if not remover_usuario(nome):
+        raise ValueError(ERRO_CONFLITO)
+    por = usuario_logado['nome'] if usuario_logado else 'SISTEMA'
+    registrar_log("Usuário deletado por ADM", f"Usuário: {nome} | Por: {por}")
+
 def criar_usuario(is_admin: bool = False):
     """Cadastro completo com validação"""
     global usuarios_cadastrados
+    usuarios_cadastrados = obter_usuarios_atualizados()
     
     tipo = "ADMIN" if is_admin else "ALUNO"
     print(f"\n{COR_ADM if is_admin else COR_USUARIO}=== CADASTRO {tipo} ===")
@@ -138,27 +439,26 @@ def criar_usuario(is_admin: bool = False):
             break
 
     # Salva dados
-    usuarios_cadastrados[nome] = {
-        "senha": senha,
-        "email": email,
-        "idade": idade_int,
-        "is_admin": is_admin,
-        "data_cadastro": datetime.now().isoformat(),
-        "cursos": []
-    }
-    salvar_usuarios()
-    registrar_log(f"Cadastro de {tipo}", f"Usuário: {nome}")
+    try:
+        cadastrar_usuario(nome, email, idade_int, senha, is_admin)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        return
     print(f"{COR_SUCESSO}✅ {tipo} registrado!{RESET_COR}")
 
 def fazer_login() -> bool:
     global usuario_logado, usuarios_cadastrados  # Adiciona a variável global
-    usuarios_cadastrados = carregar_usuarios()  # Recarrega antes de validar
     
     print(f"\n{COR_ADM}=== LOGIN ===")
     nome = input("Usuário: ").strip()
     senha = input("Senha: ")
 
-    if nome in usuarios_cadastrados and usuarios_cadastrados[nome]["senha"] == senha:
+    with medir("usuarios.login"):  # Só a verificação, sem o tempo de digitação
+        usuarios_cadastrados = obter_usuarios_atualizados()  # Traz só o que outro terminal mudou
+        valido = nome in usuarios_cadastrados and usuarios_cadastrados[nome]["senha"] == senha
+
+    if valido:
+        contar("login.sucesso")
         usuario_logado = {
             "nome": nome,
             "is_admin": usuarios_cadastrados[nome]["is_admin"]
@@ -167,6 +467,7 @@ def fazer_login() -> bool:
         print(f"\n{COR_SUCESSO}✅ Login bem-sucedido!{RESET_COR}")
         return True
     
+    contar("login.falha")
     print(f"{COR_ERRO}⚠️ Credenciais inválidas!{RESET_COR}")
     return False
 
@@ -191,9 +492,9 @@ def deletar_conta():
     
     confirmacao = input("\nDigite 'DELETAR' para confirmar: ")
     if confirmacao == 'DELETAR':
-        usuarios_cadastrados.pop(nome)
-        salvar_usuarios()
-        registrar_log("Usuário: {nome}")
+        if not remover_usuario(nome):
+            return
+        registrar_log("Conta deletada", f"Usuário: {nome}")
         logout()
         print(f"{COR_SUCESSO}✅ Conta removida!{RESET_COR}")
     else:
@@ -210,7 +511,10 @@ def menu_admin():
         print("4. 🔍 VER DADOS COMPLETOS")
         print("5. 🗑️ DELETAR USUÁRIO")
         print("6. 📜 VER REGISTROS DE LOG")
-        print("7. ↩ VOLTAR")
+        print("7. 📥 IMPORTAR USUÁRIOS")
+        print("8. 📤 EXPORTAR DADOS")
+        print("9. 📊 MÉTRICAS")
+        print("0. ↩ VOLTAR")
         print("="*25 + RESET_COR)
         
         escolha = input("Escolha: ")
@@ -228,6 +532,15 @@ def menu_admin():
         elif escolha == '6':
             visualizar_logs()
         elif escolha == '7':
+            from usuarios.importacao import tela_importacao
+            tela_importacao()
+        elif escolha == '8':
+            from usuarios.exportacao import tela_exportacao
+            tela_exportacao()
+        elif escolha == '9':
+            from metricas.metricas import tela_metricas
+            tela_metricas()
+        elif escolha == '0':
             break
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
@@ -253,9 +566,11 @@ def deletar_usuario_admin():
     
     confirmacao = input("\nConfirmar deleção? (S/N): ").upper()
     if confirmacao == 'S':
-        usuarios_cadastrados.pop(nome)
-        salvar_usuarios()
-        ("Usuário deletado por ADM", f"Usuário: {nome} | Por: {usuario_logado['nome']}")
+        try:
+            excluir_usuario(nome)
+        except ValueError as e:
+            print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+            return
         print(f"{COR_SUCESSO}✅ Usuário removido!{RESET_COR}")
 
 def visualizar_logs():
@@ -264,13 +579,13 @@ def visualizar_logs():
         print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         return
     
-    print(f"\n{COR_LOG}=== ÚLTIMOS REGISTROS ===")
-    try:
-        with open(ARQUIVO_LOG, 'r') as f:
-            print(f.read())
-    except FileNotFoundError:
-        print("Nenhum registro encontrado")
-    print("="*50 + RESET_COR)
+    get_escritor_log().descarregar()  # Mostra também o que ainda está na fila
+    if FORMATO_LOG == "jsonl":
+        from registros.auditoria import tela_auditoria
+        tela_auditoria(caminho_legado=ARQUIVO_LOG)
+    else:
+        from registros.leitor_legado import tela_log_legado
+        tela_log_legado(ARQUIVO_LOG)
 
 # ========== FUNÇÕES AUXILIARES ==========
 def listar_usuarios():
@@ -280,9 +595,15 @@ def listar_usuarios():
         return
     
     print(f"\n{COR_ADM}=== USUÁRIOS ===")
-    for usuario, dados in usuarios_cadastrados.items():
-        tipo = f"{COR_ADM}ADMIN{RESET_COR}" if dados["is_admin"] else f"{COR_USUARIO}ALUNO{RESET_COR}"
-        print(f"- {usuario} ({tipo}) | Email: {dados['email']}")
+    indices = get_indices()
+    for is_admin in (True, False):  # Admins primeiro; cada perfil vem direto do índice
+        tipo = f"{COR_ADM}ADMIN{RESET_COR}" if is_admin else f"{COR_USUARIO}ALUNO{RESET_COR}"
+        for usuario in indices.nomes_por_perfil(is_admin):
+            dados = usuarios_cadastrados.get(usuario)
+            if dados is not None:
+                print(f"- {usuario} ({tipo}) | Email: {dados['email']}")
+    print(f"Cadastrados nos últimos 7 dias: "
+          f"{len(indices.cadastrados_entre(datetime.now() - timedelta(days=7)))}")
     print("="*25 + RESET_COR)
 
 def visualizar_dados_completos():
@@ -292,7 +613,8 @@ def visualizar_dados_completos():
         return
     
     print(f"\n{COR_ADM}=== DADOS COMPLETOS ===")
-    print(json.dumps(usuarios_cadastrados, indent=4, ensure_ascii=False))
+    for nome, dados in usuarios_cadastrados.items():  # Um usuário por vez, sem montar o texto inteiro
+        print(json.dumps({nome: dados}, indent=4, ensure_ascii=False, default=para_json))
     print("="*50 + RESET_COR)
 
 def eh_admin() -> bool:
@@ -303,6 +625,8 @@ def logout():
     global usuario_logado
     if usuario_logado:
         registrar_log("Logout", f"Usuário: {usuario_logado['nome']}")
+        gravar_pendentes()
+        get_escritor_log().descarregar()
         print(f"\n{COR_ADM}👋 Até logo, {usuario_logado['nome']}!{RESET_COR}")
         usuario_logado = None
 